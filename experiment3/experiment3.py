@@ -13,9 +13,8 @@ __status__ = "Development"
 import argparse
 import os
 
-from icua.environment import ICUEnvironment
-from icua.agent import FuelMonitor, TrackMonitor, SystemMonitor, Evaluator
-from icua.agent.users import User, PerfectUser, DelayedUser, FixatedUser
+from icua.runner import Grid, run, BACKENDS
+from icua.results import ResultStore
 
 class PathAction(argparse.Action):
 
@@ -25,6 +24,8 @@ class PathAction(argparse.Action):
 parser = argparse.ArgumentParser(description='ICU')
 
 parser.add_argument('--config', '-c', metavar='C', action=PathAction, type=str, help='path of the ICU config file to use.')
+parser.add_argument('--backend', '-b', choices=BACKENDS, default='icu', help='run sessions with the ICU GUI or the ICU simulator.')
+parser.add_argument('--processes', '-p', type=int, default=None, help='number of sessions to run in parallel (defaults to the number of CPUs, 1 with the ICU GUI).')
 
 args = parser.parse_args()
 
@@ -32,27 +33,19 @@ NUM_EXPERIMENTS = 10
 
 file = "experiment3/results.txt"
 
-with open(file, "w") as f:
-    f.write("# AVERAGED OVER {0} RUNS".format(NUM_EXPERIMENTS))
-
-for delay in [0, 0.1, 0.5, 1., 2., 4.]:
-
-    with open(file, "a") as f:
-        f.write("\n# DELAY {0}".format(delay))
-
-    for i in range(NUM_EXPERIMENTS):
-        
-        agents = [FuelMonitor, SystemMonitor, TrackMonitor, lambda *args, delay=delay: FixatedUser(*args, delay=delay), Evaluator]
+grid = Grid(['FuelMonitor', 'SystemMonitor', 'TrackMonitor'], user='FixatedUser', 
+            user_params=dict(delay=[0, 0.1, 0.5, 1., 2., 4.]), configs=[args.config] if args.config else None,
+            repetitions=NUM_EXPERIMENTS, experiment='experiment3', backend=args.backend)
 
-        env = ICUEnvironment(*agents, **args.__dict__)
-        env.simulate()
+with ResultStore("experiment3/results") as store:
+    results = run(grid, processes=args.processes, callback=store.append)
 
-        evaluator = [a for a in env.ambient.agents.values() if hasattr(a.mind, "result")][0].mind
-
-        with open(file, "a") as f:
-            f.write("\n# RUN {0}".format(i))
-            f.write(evaluator.result)
-
-        
-
-    
\ No newline at end of file
+with open(file, "w") as f:
+    f.write("# AVERAGED OVER {0} RUNS".format(NUM_EXPERIMENTS))
+    delay = None
+    for result in results:
+        if result['delay'] != delay:
+            delay = result['delay']
+            f.write("\n# DELAY {0}".format(delay))
+        f.write("\n# RUN {0}".format(result['run']))
+        f.write(result['result'])
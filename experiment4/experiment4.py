@@ -13,9 +13,8 @@ __status__ = "Development"
 import argparse
 import os
 
-from icua.environment import ICUEnvironment
-from icua.agent import FuelMonitor, TrackMonitor, SystemMonitor, Evaluator
-from icua.agent.users import User, PerfectUser, DelayedUser, FixatedUser, FixedUser
+from icua.runner import Grid, run, BACKENDS
+from icua.results import ResultStore
 
 class PathAction(argparse.Action):
 
@@ -24,40 +23,35 @@ class PathAction(argparse.Action):
             
 parser = argparse.ArgumentParser(description='ICU')
 
-parser.add_argument('--config', '-c', metavar='C', action=PathAction, type=str, help='path of the ICU config file to use.')
+parser.add_argument('--config', '-c', metavar='C', action=PathAction, type=str, help='path of the ICU config file to use (instead of the med and hard configs).')
+parser.add_argument('--backend', '-b', choices=BACKENDS, default='icu', help='run sessions with the ICU GUI or the ICU simulator.')
+parser.add_argument('--processes', '-p', type=int, default=None, help='number of sessions to run in parallel (defaults to the number of CPUs, 1 with the ICU GUI).')
 
 args = parser.parse_args()
 
 NUM_EXPERIMENTS = 10
 
 for fix in ['fuel']:
-    
-    for dif in ['med', 'hard']:
-        config = os.path.abspath("config/{0}-config.json".format(dif))
 
+    configs = {dif:"config/{0}-config.json".format(dif) for dif in ['med', 'hard']}
+    if args.config:
+        configs = {os.path.splitext(os.path.basename(args.config))[0]:args.config}
+    grid = Grid(['FuelMonitor', 'SystemMonitor', 'TrackMonitor'], user='FixedUser', 
+                user_params=dict(fix=[fix], delay=[0, 0.1, 0.5, 1., 2., 4.]), configs=configs,
+                repetitions=NUM_EXPERIMENTS, experiment='experiment4', backend=args.backend)
+
+    with ResultStore("experiment4/results") as store:
+        results = run(grid, processes=args.processes, callback=store.append)
+    
+    for dif in configs:
         file = "experiment4/results-{0}-{1}.txt".format(fix, dif)
 
         with open(file, "w") as f:
             f.write("# AVERAGED OVER {0} RUNS".format(NUM_EXPERIMENTS))
-
-        for delay in [0, 0.1, 0.5, 1., 2., 4.]:
-
-            with open(file, "a") as f:
-                f.write("\n# DELAY {0}".format(delay))
-
-            for i in range(NUM_EXPERIMENTS):
-                
-                agents = [FuelMonitor, SystemMonitor, TrackMonitor, lambda *args, delay=delay: FixedUser(*args, fix, delay=delay), Evaluator]
-
-                env = ICUEnvironment(*agents, config=config)
-                env.simulate()
-
-                evaluator = [a for a in env.ambient.agents.values() if hasattr(a.mind, "result")][0].mind
-
-                with open(file, "a") as f:
-                    f.write("\n# RUN {0}".format(i))
-                    f.write(evaluator.result)
-
-            
-
-    
\ No newline at end of file
+            delay = None
+            for result in [r for r in results if r['config'] == dif]:
+                if result['delay'] != delay:
+                    delay = result['delay']
+                    f.write("\n# DELAY {0}".format(delay))
+                f.write("\n# RUN {0}".format(result['run']))
+                f.write(result['result'])
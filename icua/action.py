@@ -10,7 +10,6 @@ __email__ = "benrjw@gmail.com"
 __status__ = "Development"
 
 from types import SimpleNamespace
-import time
 
 from pystarworlds.event import Action, Executor
 from .perception import ICUPerception, EyeTrackerPerception
@@ -34,8 +33,7 @@ class InputExecutor(ICUExecutor): # used for fake input that originates from age
 
     def __call__(self, env, action):
         super().__call__(env, action) # send event to icu...
-        event = SimpleNamespace(timestamp=time.time(), src=action.source, dst=action.destination, name='0', data=SimpleNamespace(**action.data)) #fake event... a bit hacky... hopefully the name doesnt cause any problems
-        return (EyeTrackerPerception(event),)
+        return (EyeTrackerPerception.new(env.clock.time(), '0', action.source, action.destination, SimpleNamespace(**action.data)),) # not an ICU event, hopefully the name doesnt cause any problems
 
 class InputAction(ICUAction):
     executor = InputExecutor
@@ -16,26 +16,84 @@ from abc import abstractmethod
 from pystarworlds.agent import Body, Mind, new_actuator, new_sensor
 
 from ..action import ICUAction, InputAction
+from ..perception import ICU_PERCEPTION_GROUPS
+from ..clock import get_clock
+from ..scheduler import get_scheduler
+from ..routing import topics
+
+DEFAULT_PERIOD = 0.1 # seconds, the cycle period that periodic minds (e.g. the user models) were tuned for
 
 ICUActuator = new_actuator('ICUActuator', ICUAction, InputAction) #common across all agents
 
+def new_icu_sensor(name, *topics):
+    """ Create a new sensor type that subscribes to the given topics (see icua.perception.Topic). 
+        The sensor only receives ICU events that match one of its topics (see icua.routing).
+
+    Args:
+        name (str): name of the sensor type.
+        topics (Topic): topics to subscribe to, each must specify a group.
+
+    Returns:
+        type: sensor type.
+    """
+    perceptions = []
+    for topic in topics:
+        if ICU_PERCEPTION_GROUPS[topic.group] not in perceptions:
+            perceptions.append(ICU_PERCEPTION_GROUPS[topic.group])
+    sensor = new_sensor(name, *perceptions)
+    sensor.topics = tuple(topics)
+    return sensor
+
 class ICUMind(Mind):
 
     LABELS = SimpleNamespace(switch='switch', slide='slide', click='click', highlight='highlight',
                              gaze='gaze', saccade='saccade', move='move', rotate='rotate', show='show',
                              hide='hide')
 
-    def __init__(self):
+    INCREMENTAL = False # minds that mark self.dirty in revise and give their grace periods (see grace_times) only decide when something changed
+
+    def __init__(self, period=None, clock=None, scheduler=None):
+        """ 
+        Args:
+            period (float, optional): if given, the mind cycles at most once every period seconds (regardless of how often the 
+                environment cycles), otherwise the mind cycles whenever the environment does. Defaults to None.
+            clock (Clock, optional): clock used for all time dependent decisions. Defaults to the current default clock (see icua.clock).
+            scheduler (Scheduler, optional): where grace period deadlines are registered. Defaults to the current default scheduler (see icua.scheduler).
+        """
         super(ICUMind, self).__init__()
+        self.clock = get_clock() if clock is None else clock
+        self.scheduler = get_scheduler() if scheduler is None else scheduler
+        self.period = period
+        self.last_cycle = 0
+        self.cycle_percepts = 0 # number of perceptions handled in the last cycle
+        self.cycle_time = self.clock.time() # time of the current cycle, read once per cycle
+
+        self.dirty = True # have beliefs changed (or a grace period expired) since the last decision? (INCREMENTAL minds only)
 
     def cycle(self):
+        self.cycle_time = self.clock.time()
+        self.scheduler.run(self.cycle_time) # call back the minds whose grace periods have expired
+        if self.period is not None:
+            if self.cycle_time - self.last_cycle < self.period:
+                self.cycle_percepts = 0
+                return # not due yet, perceptions will be waiting in the sensor next time
+            self.last_cycle = self.cycle_time
+
         perceptions = self.body.perceive()
         perceptions = next(iter(perceptions.values())) #only 1 sensor
+        self.cycle_percepts = len(perceptions)
         self.revise(*perceptions) # process perceptions and update beliefs
 
+        if self.INCREMENTAL and not self.dirty:
+            return # nothing changed and no grace period has expired, decide would not do anything
+
         actuator = next(iter(self.body.actuators.keys()))
         actions = self.decide() # decide on actions based on beliefs
 
+        if self.INCREMENTAL: # if there was nothing to do, wait until beliefs change or a grace period expires
+            self.dirty = not (actions is None or (isinstance(actions, (list, tuple)) and all(action is None for action in actions)))
+            self.scheduler.schedule(self, self.quiet_deadline(), self.wake)
+
         # execute with an actuator
         if isinstance(actions, (list, tuple)):
             for action in actions:
@@ -51,6 +109,125 @@ class ICUMind(Mind):
     def decide(self):
         pass
 
+    def terminate(self):
+        """ Called by the environment once the simulation has ended. """
+        pass
+
+    def next_deadline(self):
+        """ The time at which this mind next needs to cycle even if no new perceptions arrive (e.g. when a grace period expires). 
+            The environment uses this to decide how long it may wait for new events.
+
+        Returns:
+            float: deadline (seconds since epoch), None if the mind only needs to cycle when it receives perceptions.
+        """
+        if self.INCREMENTAL:
+            return self.grace_deadline(*self.grace_times())
+        if self.period is not None:
+            return self.last_cycle + self.period
+
+    def wake(self):
+        """ Called by the scheduler when a grace period has expired, the mind decides in its next cycle. """
+        self.dirty = True
+
+    def edges(self):
+        """ Edges attached to the topics of this mind's sensors (see icua.edges), events of these topics only reach the
+            mind when the value of the edge changes.
+
+        Returns:
+            dict: {Topic:Edge}.
+        """
+        return {}
+
+    def revise_world(self, perceptions):
+        """ Update the world state of this mind from its perceptions if it has its own (see icua.world.world_state), a
+            shared world state has already been updated by the environment.
+
+        Args:
+            perceptions (list(ICUPerception)): perceptions.
+        """
+        if self.own_world:
+            self.world.update(perceptions)
+
+    def revise_gaze(self, percept):
+        """ Revise the eye position (and when the task was last viewed) from a gaze percept. Beliefs change when the user
+            looks at the task or looks away from it (see is_looking), gaze that stays on (or off) the task changes nothing.
+
+        Args:
+            percept (Perception): gaze percept.
+        """
+        looking = self.is_looking()
+        self.eye_position = (percept.data.x, percept.data.y)
+        if self.is_looking():
+            self.last_viewed = percept.timestamp
+            self.dirty = True
+        elif looking: # the user looked away
+            self.dirty = True
+
+    def is_looking(self):
+        """ Is the user looking at the task of this mind?
+
+        Returns:
+            bool: False, minds that monitor a task override this.
+        """
+        return False
+
+    def failed_times(self):
+        """ The times at which the components of the task that are currently failing failed (INCREMENTAL minds only).
+
+        Returns:
+            list(float): failure times, empty if nothing is failing.
+        """
+        return []
+
+    def grace_times(self):
+        """ The times at which the grace periods that decide currently depends on started (INCREMENTAL minds only). While 
+            something is failing and the user is not looking, the grace periods since the user last viewed the task 
+            (last_viewed) and since each failure (see failed_times) may expire.
+
+        Returns:
+            list(float): start times (e.g. last viewed, last failed), empty if decide does not depend on the time.
+        """
+        failed = self.failed_times()
+        if len(failed) > 0 and not self.is_looking():
+            return [self.last_viewed, *failed]
+        return []
+
+    def quiet_deadline(self):
+        """ With unchanged beliefs, the time after which a grace period expires and decide may have something to do.
+
+        Returns:
+            float: deadline (seconds since epoch), None if decide will not have anything to do until beliefs change.
+        """
+        deadlines = [t + self.grace_period for t in self.grace_times() if t + self.grace_period > self.cycle_time] # others expired in this cycle
+        if len(deadlines) > 0:
+            return min(deadlines)
+
+    def expired(self, t):
+        """ Has a grace period expired in the current cycle? A grace period that started at t expires at t + grace_period, 
+            which is also its deadline (see quiet_deadline, grace_deadline), so that a mind woken at its deadline acts on it.
+
+        Args:
+            t (float): time at which the grace period started (e.g. last viewed, last failed).
+
+        Returns:
+            bool: True if the grace period has expired.
+        """
+        return self.cycle_time >= t + self.grace_period
+
+    def grace_deadline(self, *times):
+        """ Deadline helper for minds that use a grace period, the earliest time t + grace_period (over the given times t) that is still in the future.
+
+        Args:
+            times (float): times at which grace periods started (e.g. last viewed, last failed).
+
+        Returns:
+            float: deadline (seconds since epoch), None if all grace periods have expired.
+        """
+        _time = self.clock.time()
+        deadlines = [t + self.grace_period for t in times if t + self.grace_period > _time]
+        if len(deadlines) > 0:
+            return min(deadlines)
+
     def highlight_action(self, dst, value=True):
         """ Create a new highlight action.
 
@@ -82,6 +259,9 @@ class ICUBody(Body):
 
     def __init__(self, mind, sensors):
         super(ICUBody, self).__init__(mind, [ICUActuator()], sensors)
+        _edges = mind.edges()
+        for sensor in sensors:
+            sensor.edges = {t:e for t,e in _edges.items() if t in topics(sensor)}
 
 
 
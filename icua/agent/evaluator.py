@@ -12,21 +12,20 @@ __status__ = "Development"
 from types import SimpleNamespace
 from collections import defaultdict
 import copy
-import time
 import random
 import numpy as np
 from pprint import pprint
 
 
-from pystarworlds.agent import new_sensor
+from ..evaluate import EvalTracking, EvalTime, EvalScale, Score
 
-from ..evaluate import EvalTracking, EvalTime, EvalScale
-
-from .agent import ICUMind, ICUBody
-from ..perception import WarningLightPerception, ScalePerception, TrackPerception, FuelTankPerception, PumpPerception, EyeTrackerPerception, HighlightPerception
+from .agent import ICUMind, ICUBody, new_icu_sensor
+from ..perception import Topic
 from ..action import ICUAction, InputAction
+from ..spatial import spatial_index
 
-ICUEvalSensor = new_sensor('ICUEvalSensor', WarningLightPerception, ScalePerception, TrackPerception, FuelTankPerception, PumpPerception, EyeTrackerPerception, HighlightPerception)
+ICUEvalSensor = new_icu_sensor('ICUEvalSensor', Topic('WarningLight', label='change'), Topic('Scale', label='change'), Topic('Target', label='move'),
+                                                Topic('FuelTank', label='fuel'), Topic('Highlight', label='highlight'))
 
 LABELS = SimpleNamespace(switch='switch', slide='slide', click='click', highlight='highlight',
                              gaze='gaze', saccade='saccade', key='key', move='move', change='change',
@@ -35,6 +34,13 @@ LABELS = SimpleNamespace(switch='switch', slide='slide', click='click', highligh
 KEY_CODES = {"Up":98, "Down":104, "Left":100, "Right":102}
 
 class Evaluator(ICUMind):
+    """ 
+        Evaluates the performance of the user (and agents) on each task. Scores are accumulated incrementally as percepts arrive, 
+        the full score report is only produced on demand (see scores, result) when the run ends or, if a snapshot interval 
+        is given (config['agent']['evaluator']['snapshot'] seconds), periodically during the run (see snapshots). Nothing is printed, 
+        the caller decides what to do with the scores. Scores are timed by event timestamps,
+        so that they do not depend on when the agent cycles (and match offline scores, see icua.offline).
+    """
 
     def __init__(self, config, window_properties):
         super(Evaluator, self).__init__()
@@ -47,10 +53,8 @@ class Evaluator(ICUMind):
         self.components.add('Target:0')
 
         #pprint(window_properties)
-        self.task_positions = {k:(v['position'][0] + v['size'][0]/2, v['position'][1] + v['size'][1]/2) for k,v in self.window_properties.items()}
-        self.task_positions.update({k:(v['position'][0] + v['size'][0]/2, v['position'][1] + v['size'][1]/2) for k,v in self.window_properties['system'].items() if k in self.components})
-        self.task_positions.update({k:(v['position'][0] + v['size'][0]/2, v['position'][1] + v['size'][1]/2) for k,v in self.window_properties['fuel'].items() if k in self.components})
-        self.task_positions['Target:0'] = self.task_positions['track']
+        self.spatial = spatial_index(window_properties)
+        self.task_positions = {k:self.spatial.center(k) for k in self.spatial.names}
 
         #pprint(self.task_positions)
         self.eye_position = list(self.task_positions['window'])
@@ -72,18 +76,25 @@ class Evaluator(ICUMind):
         self.tracking_acceptable_prop = np.array([1/4, 1/4]) #TODO update if made configurable in ICU 
         w,h = self.tracking_acceptable_prop * self.tracking_size
         self.eval_tracking = EvalTracking(w=w,h=h)
-        self.eval_tracking_time = EvalTime() # time spent outside of the acceptable range
+        self.eval_tracking_time = EvalTime(clock=self.clock) # time spent outside of the acceptable range
 
-        self.eval_warning_light0 = EvalTime()
-        self.eval_warning_light1 = EvalTime()
+        self.eval_warning_light0 = EvalTime(clock=self.clock)
+        self.eval_warning_light1 = EvalTime(clock=self.clock)
 
-        self.eval_scales = [EvalScale(config[c]['position'], c=config[c]['size'] // 2) for c in self.components if "Scale" in c]
-        self.eval_tanks = {"FuelTank:A":EvalTime(), "FuelTank:B":EvalTime()} #two main tanks...?
+        self.eval_scales = [EvalScale(config[c]['position'], c=config[c]['size'] // 2, clock=self.clock) for c in sorted(self.components) if "Scale" in c] # ordered by index (see evaluate_scales)
+        self.eval_tanks = {"FuelTank:A":EvalTime(clock=self.clock), "FuelTank:B":EvalTime(clock=self.clock)} #two main tanks...?
 
         self.highlighted = {} # all false initially
-        self.eval_highlighted = EvalTime()
+        self.eval_highlighted = EvalTime(clock=self.clock)
+
+        self.final_scores = None # scores at the end of the run
+        self.snapshots = [] # (time, scores) taken periodically during the run
 
-        self.result = {}
+        try:
+            self.snapshot_interval = config['agent']['evaluator']['snapshot']
+        except:
+            self.snapshot_interval = None
+        self.last_snapshot = self.clock.time()
 
     def revise(self, *perceptions):
         for percept in sorted(perceptions, key=lambda p: p.name):
@@ -93,9 +104,9 @@ class Evaluator(ICUMind):
                 src = percept.src.split(':', 1)[1]
                 self.highlighted[src] = percept.data.value
                 if any(self.highlighted.values()): # anything is highlighted after the event, start the timer
-                    self.eval_highlighted.start() # has no effect if already started
+                    self.eval_highlighted.start(percept.timestamp) # has no effect if already started
                 else: # nothing is highlighted, stop the timer
-                    self.eval_highlighted.stop()
+                    self.eval_highlighted.stop(percept.timestamp)
 
             # TRACKING PERFORMANCE
             elif percept.data.label == LABELS.move and 'x' in percept.data.__dict__:
@@ -106,15 +117,15 @@ class Evaluator(ICUMind):
                 #print(2 * d / denom)
                 
                 if d > 0:
-                    self.eval_tracking_time.start() # target is now out of range, start the clock
+                    self.eval_tracking_time.start(percept.timestamp) # target is now out of range, start the clock
                 else:
-                    self.eval_tracking_time.stop() # target is back in range, stop the clock
+                    self.eval_tracking_time.stop(percept.timestamp) # target is back in range, stop the clock
                 
             # WARNING LIGHT PERFORMANCE
             elif percept.data.label == LABELS.change: # warning light changed its state
-                if "WarningLight" in percept.src:
+                if percept.group == 'WarningLight':
                     self.evaluate_warning_light(percept)
-                elif "Scale" in percept.src:
+                elif percept.group == 'Scale':
                     self.evaluate_scales(percept)
             
             # TANK PERFORMANCE
@@ -125,13 +136,13 @@ class Evaluator(ICUMind):
     def evaluate_tanks(self, percept):
         e = self.eval_tanks[percept.src]
         if not percept.data.acceptable: # start clock, fuel tank not acceptable
-            e.start()
+            e.start(percept.timestamp)
         else:
-            e.stop()
+            e.stop(percept.timestamp)
 
     def evaluate_scales(self, percept):
         e = self.eval_scales[int(percept.src.split(":")[1])]
-        e(percept.data.value)
+        e(percept.data.value, percept.timestamp)
 
     def evaluate_warning_light(self, percept):
         """ 
@@ -139,30 +150,51 @@ class Evaluator(ICUMind):
         """
         if percept.src == "WarningLight:0":
             if not percept.data.value:
-                self.eval_warning_light0.start()
+                self.eval_warning_light0.start(percept.timestamp)
             else:
-                self.eval_warning_light0.stop()
+                self.eval_warning_light0.stop(percept.timestamp)
                 #print(percept.src, self.eval_warning_light0.score)
 
         elif percept.src == "WarningLight:1":
             if percept.data.value:
-                self.eval_warning_light1.start()
+                self.eval_warning_light1.start(percept.timestamp)
             else:
-                self.eval_warning_light1.stop()
+                self.eval_warning_light1.stop(percept.timestamp)
                 #print(percept.src, self.eval_warning_light1.score)
 
     def decide(self):
-        def print_score():
-            scores = "\nWarningLight:   {0:0.3f} {1:0.5f} {2:0.5f}".format(self.warning_light_score, self.eval_warning_light0.score, self.eval_warning_light1.score) + \
-                "\nScales:         {0:0.3f} ".format(self.scale_score) + " ".join(["{0:0.3f}".format(e.score) for e in self.eval_scales]) + \
-                "\nTracking:       {0:0.3f}".format(self.tracking_score) + \
-                "\nFuel:           {0:0.3f}".format(self.fuel_score) + \
-                "\nHighlight:      {0:0.3f}".format(self.highlight_score)
-            print(scores)
-            self.result = scores
+        if self.snapshot_interval is not None and self.clock.time() - self.last_snapshot >= self.snapshot_interval:
+            self.last_snapshot = self.clock.time()
+            self.snapshots.append((self.last_snapshot, self.scores()))
+
+    def next_deadline(self):
+        if self.snapshot_interval is not None:
+            return self.last_snapshot + self.snapshot_interval
 
-        print_score()
+    def terminate(self):
+        self.final_scores = self.scores()
 
+    @property
+    def result(self):
+        """ The formatted score report, final once the run has ended. 
+
+        Returns:
+            str: score report.
+        """
+        if self.final_scores is not None:
+            return str(self.final_scores)
+        return str(self.scores())
+
+    def scores(self):
+        """ The current value of all scores.
+
+        Returns:
+            Score: scores.
+        """
+        return Score(warning_light=float(self.warning_light_score), warning_light0=float(self.eval_warning_light0.score), 
+                     warning_light1=float(self.eval_warning_light1.score), scale=float(self.scale_score), 
+                     scales=tuple(float(e.score) for e in self.eval_scales), tracking=float(self.tracking_score), 
+                     fuel=float(self.fuel_score), highlight=float(self.highlight_score))
         
     @property
     def warning_light_score(self):
@@ -174,8 +206,8 @@ class Evaluator(ICUMind):
             float [0-1]: score
         """
 
-        l0 = self.eval_warning_light0.score / (time.time() - self.eval_warning_light0.start_time)
-        l1 = self.eval_warning_light1.score / (time.time() - self.eval_warning_light1.start_time)
+        l0 = self.eval_warning_light0.proportion
+        l1 = self.eval_warning_light1.proportion
         return ((l0 + l1) / 2)
 
     @property
@@ -211,7 +243,7 @@ class Evaluator(ICUMind):
         Returns:
             float: [0-1] score
         """
-        return (sum([t.score / (time.time() - t.start_time) for t in self.eval_tanks.values()]) / len(self.eval_tanks))
+        return (sum([t.proportion for t in self.eval_tanks.values()]) / len(self.eval_tanks))
 
     @property
     def highlight_score(self):
@@ -220,7 +252,7 @@ class Evaluator(ICUMind):
         Returns:
             float: [0-1] score
         """
-        return self.eval_highlighted.score / (time.time() - self.eval_highlighted.start_time)
+        return self.eval_highlighted.proportion
     
 
 
@@ -11,17 +11,17 @@ __status__ = "Development"
 
 from types import SimpleNamespace
 from collections import defaultdict
-import copy
-import time
 import pprint
 
-from pystarworlds.agent import new_sensor
-
-from .agent import ICUMind, ICUBody
-from ..perception import FuelTankPerception, PumpPerception, EyeTrackerPerception, HighlightPerception
+from .agent import ICUMind, ICUBody, new_icu_sensor
+from ..perception import Topic
 from ..action import ICUAction
+from ..spatial import spatial_index
+from ..edges import Changes
+from ..world import world_state
 
-ICUFuelSensor = new_sensor('ICUFuelSensor', FuelTankPerception, PumpPerception, EyeTrackerPerception, HighlightPerception)
+ICUFuelSensor = new_icu_sensor('ICUFuelSensor', Topic('FuelTank', label='fuel'), 
+                                                Topic('Overlay', label='gaze'), Topic('Highlight', label='highlight'))
 
 class ICUFuelMind(ICUMind):
 
@@ -29,13 +29,14 @@ class ICUFuelMind(ICUMind):
                                 burn='burn', transfer='transfer', change="change", fuel='fuel', 
                                 repair='repair', fail='fail', rotate='rotate')
 
+    INCREMENTAL = True
+
     def __init__(self, config, window_properties):
         super(ICUFuelMind, self).__init__()
 
         self.config = config
         # agents beliefs
-        (x,y), (w,h) = window_properties['fuel']['position'], window_properties['fuel']['size']
-        self.bounding_box = (x,y,x+w,y+h) # location of the system monitoring task (in window coordinates)
+        self.spatial = spatial_index(window_properties) # gaze hit-testing (shared by all agents), the location of the task is self.spatial.boxes['fuel']
 
         self.eye_position = (0,0) #gaze position of the users eyes
 
@@ -45,8 +46,12 @@ class ICUFuelMind(ICUMind):
 
         self.fuel_panel = "FuelMonitor" # TODO get this from somewhere in case it changes in future versions!
 
-        self.pump_status = {pump:1 for pump in self.components if "Pump" in pump} # "ready" by default
-        self.tank_status = {tank:SimpleNamespace(acceptable = self.config[tank]["fuel"], last_failed=0) for tank in self.components if "Tank" in tank}
+        self.pumps = {pump for pump in self.components if "Pump" in pump}
+        self.tanks = {tank for tank in self.components if "Tank" in tank}
+        # the state of each tank is read from the world state (see icua.world), revise only keeps when each tank failed
+        self.world, self.own_world = world_state(config)
+        self.tank_acceptable = self.world.view('FuelTank', 'acceptable') # nan until ICU reports it (acceptable)
+        self.last_failed = {} # tank -> when it became unacceptable
         
         self.highlighted = defaultdict(lambda: False) # is the component highlighted?
         self.viewed = defaultdict(lambda : 0)  # when was the component last viewed?
@@ -66,13 +71,14 @@ class ICUFuelMind(ICUMind):
 
 
     def __str__(self):
-        return pprint.pformat([self.__class__.__name__ + ":" + self.ID, self.eye_position, self.bounding_box, 
-                               self.tank_status, self.tank_status, self.highlighted, self.viewed, self.last_viewed, self.grace_period], indent=2)
+        return pprint.pformat([self.__class__.__name__ + ":" + self.ID, self.eye_position, self.spatial.boxes['fuel'], 
+                               self.tank_acceptable, self.last_failed, self.highlighted, self.viewed, self.last_viewed, self.grace_period], indent=2)
 
     def __repr__(self):
         return self.__class__.__name__ + ":" + self.ID
 
     def revise(self, *perceptions):
+        self.revise_world(perceptions)
         #pprint.pprint(["{0}:{1}:{2}".format(p.ID, p.name, p.timestamp) for p in sorted(perceptions, key=lambda p: p.timestamp)])
 
         for percept in sorted(perceptions, key=lambda p: p.name):
@@ -81,33 +87,28 @@ class ICUFuelMind(ICUMind):
                 raise ValueError("Unknown event label: {0}".format(percept.data.label))
 
             if percept.data.label == ICUFuelMind.LABELS.gaze: #gaze position
-                self.eye_position = (percept.data.x, percept.data.y)
-                if self.is_looking():
-                    self.last_viewed = percept.timestamp
-            
-            elif percept.data.label == ICUFuelMind.LABELS.change:
-                # PUMP ATTENTION
-                if "Pump" in percept.src: #update the pumps for use in action decision making...
-                    #print(percept)
-                    self.pump_status[percept.src] = percept.data.value # off, on, fail
-                    
+                self.revise_gaze(percept)
+
             # TANK ATTENTION
             elif percept.data.label == ICUFuelMind.LABELS.fuel:
                 if not percept.data.acceptable: 
-                    self.tank_status[percept.src].last_failed = percept.timestamp
-                self.tank_status[percept.src].acceptable = percept.data.acceptable
+                    self.last_failed.setdefault(percept.src, percept.timestamp)
+                    self.dirty = True
+                elif self.last_failed.pop(percept.src, None) is not None: # the tank is acceptable again
+                    self.dirty = True
                 
             elif percept.data.label == ICUFuelMind.LABELS.highlight: #revise highlights
                 src = percept.src.split(':', 1)[1]
+                self.dirty = self.dirty or self.highlighted[src] != percept.data.value
                 self.highlighted[src] = percept.data.value
 
 
     def highlight_any(self):
         actions = []
         # if the main tanks are not at an acceptable level, highlight them!
-        if not self.tank_status['FuelTank:A'].acceptable and time.time() - self.tank_status['FuelTank:A'].last_failed > self.grace_period:
+        if not self.acceptable('FuelTank:A') and self.expired(self.last_failed.get('FuelTank:A', 0)):
             actions.append(self.highlight_action('FuelTank:A'))
-        if not self.tank_status['FuelTank:B'].acceptable and time.time() - self.tank_status['FuelTank:B'].last_failed > self.grace_period:
+        if not self.acceptable('FuelTank:B') and self.expired(self.last_failed.get('FuelTank:B', 0)):
             actions.append(self.highlight_action('FuelTank:B'))
         actions = [a for a in actions if a is not None] # remove all None actions
         
@@ -122,27 +123,37 @@ class ICUFuelMind(ICUMind):
         actions = []
         if not self.is_looking(): # if the user is looking, dont highlight anything
             if not any(self.highlighted.values()): # if any other highlights are shown, dont highlight
-                if time.time() - self.last_viewed > self.grace_period: # if the user has not looked within the grace period
-                    #print("LAST LOOKED: ", time.time() - self.last_viewed)
+                if self.expired(self.last_viewed): # if the user has not looked within the grace period
+                    #print("LAST LOOKED: ", self.cycle_time - self.last_viewed)
                     actions.extend(self.highlight_any())
                    
 
             #remove the highlight if its not needed
-            if self.is_highlighted('FuelTank:A') and self.tank_status['FuelTank:A'].acceptable:
+            if self.is_highlighted('FuelTank:A') and self.acceptable('FuelTank:A'):
                 actions.append(self.highlight_action('FuelTank:A', value=False))
             
-            if self.is_highlighted('FuelTank:B') and self.tank_status['FuelTank:B'].acceptable:
+            if self.is_highlighted('FuelTank:B') and self.acceptable('FuelTank:B'):
                 actions.append(self.highlight_action('FuelTank:B', value=False))
 
             if self.is_highlighted(self.fuel_panel) and \
-                 self.tank_status['FuelTank:A'].acceptable and \
-                 self.tank_status['FuelTank:B'].acceptable:
+                 self.acceptable('FuelTank:A') and \
+                 self.acceptable('FuelTank:B'):
                  actions.append(self.highlight_action(self.fuel_panel, value=False))
 
             return actions
         else:   
             return self.clear_highlights() # the user is looking, clear highlights
 
+    def edges(self):
+        # only changes in acceptability are needed (last_failed is when a tank became unacceptable)
+        return {Topic('FuelTank', label='fuel'):Changes('acceptable')}
+
+    def failed_times(self):
+        return [self.last_failed.get(tank, 0) for tank in ('FuelTank:A', 'FuelTank:B') if not self.acceptable(tank)]
+
+    def acceptable(self, tank): # is the fuel of a tank at an acceptable level? (until ICU reports it, it is)
+        return self.tank_acceptable[tank] != 0
+
     def others_highlighted(self): # are there currently any highlights?
         return any(self.highlighted.values())
     
@@ -154,7 +165,7 @@ class ICUFuelMind(ICUMind):
         """
         actions = []
         for component, highlighted in self.highlighted.items():
-            if highlighted and (component in self.pump_status or component in self.tank_status or component == self.fuel_panel): #only unhighlight components that belong to this task
+            if highlighted and (component in self.pumps or component in self.tanks or component == self.fuel_panel): #only unhighlight components that belong to this task
                 actions.append(self.highlight_action(component, value=False)) #add an action to turn off the highlight
         return actions
 
@@ -163,10 +174,7 @@ class ICUFuelMind(ICUMind):
         return self.highlighted[component]
 
     def is_looking(self): #is the user looking at the system monitoring task?
-        ex, ey = self.eye_position
-        x1, y1, x2, y2 = self.bounding_box
-        #print(self.eye_position, self.bounding_box)
-        return not (ex < x1 or ey < y1 or ex > x2 or ey > y2)
+        return self.spatial.contains('fuel', *self.eye_position)
 
 class ICUFuelBody(ICUBody):
 
@@ -11,43 +11,44 @@ __status__ = "Development"
 
 from types import SimpleNamespace
 from collections import defaultdict
-import copy
-import time
 
-from pystarworlds.agent import new_sensor
-
-from .agent import ICUMind, ICUBody
-from ..perception import WarningLightPerception, ScalePerception, EyeTrackerPerception, HighlightPerception
+from .agent import ICUMind, ICUBody, new_icu_sensor
+from ..perception import Topic
 from ..action import ICUAction
+from ..spatial import spatial_index
+from ..edges import Equals
+from ..world import world_state
 
-ICUSystemSensor = new_sensor('ICUSystemSensor', WarningLightPerception, ScalePerception, EyeTrackerPerception, HighlightPerception)
+ICUSystemSensor = new_icu_sensor('ICUSystemSensor', Topic('WarningLight', label='change'), Topic('Scale', label='change'), 
+                                                    Topic('Overlay', label='gaze'), Topic('Highlight', label='highlight'))
 
 class ICUSystemMind(ICUMind):
 
     LABELS = SimpleNamespace(switch='switch', slide='slide', click='click', highlight='highlight',
                              gaze='gaze', saccade='saccade', change='change', rotate='rotate')
 
+    INCREMENTAL = True
+
     def __init__(self, config, window_properties):
         super(ICUSystemMind, self).__init__()
 
         # agents beliefs
-        (x,y), (w,h) = window_properties['system']['position'], window_properties['system']['size']
-        self.bounding_box = (x,y,x+w,y+h) # location of the system monitoring task (in window coordinates)
+        self.spatial = spatial_index(window_properties) # gaze hit-testing (shared by all agents), the location of the task is self.spatial.boxes['system']
         
         self.eye_position = (0,0) #gaze position of the users eyes
         
-        # mirrored state of each component of the system monitoring task (updated in revise)
-        self.scale_state = copy.deepcopy({k:SimpleNamespace(**v, last_failed=0) for k,v in config.items() if 'Scale' in k})
-        self.warning_light_state = copy.deepcopy({k:SimpleNamespace(**v, last_failed=0) for k,v in config.items() if 'WarningLight' in k})
-       
+        # the state of each component is read from the world state (see icua.world), revise only keeps when each component failed
+        self.world, self.own_world = world_state(config)
+        self.scale_position = self.world.view('Scale', 'position')
+        self.warning_light_status = self.world.view('WarningLight', 'state')
+        self.scale_center = {k:config[k]['size'] // 2 for k in self.scale_position}
+        self.last_failed = {k:0 for k in self.components() if not self.acceptable(k)} # component -> when it became unacceptable (failed before the session started at 0)
+
         self.system_panel = "SystemMonitor" # TODO get this info from somewhere -- the name might change!
 
         self.highlighted = defaultdict(lambda: False) # is the component highlighted?
         self.last_viewed = 0 # when was this task last viewed? (never)
 
-        self.time = time.time()
-        self.num_percepts = 0
-
         # control variables from config TODO streamline using defaults
         try:
             self.grace_period = config['agent']['system']['grace_period']
@@ -60,48 +61,45 @@ class ICUSystemMind(ICUMind):
             self.highlight_all = False
 
     def revise(self, *perceptions):
-        self.num_percepts += len(perceptions)
-        _time = time.time()
-        if _time - self.time >= 1: #after 1 second
-            #print("{0:4f}-{1:4f}: {2}".format(self.time, _time, self.num_percepts))
-            self.time = _time
-            self.num_percepts = 0
-
+        self.revise_world(perceptions)
         for percept in sorted(perceptions, key=lambda p: p.name):
             assert percept.data.label in ICUSystemMind.LABELS.__dict__ #received an unknown event
             
             if percept.data.label == ICUSystemMind.LABELS.gaze: #gaze position
-                self.eye_position = (percept.data.x, percept.data.y)
-                #print("GAZE", self.eye_position)
-                if self.is_looking():
-                    self.last_viewed = percept.timestamp
+                self.revise_gaze(percept)
 
             elif percept.data.label == ICUSystemMind.LABELS.highlight:
                 src = percept.src.split(':', 1)[1]
+                self.dirty = self.dirty or self.highlighted[src] != percept.data.value
                 self.highlighted[src] = percept.data.value
             elif percept.data.label == ICUSystemMind.LABELS.change:
-                if "WarningLight" in percept.src:
-                    self.revise_warning_light(percept)
-                elif "Scale" in percept.src:
-                    self.revise_scale(percept)
-
-    # these rules mirror the icu system logic for updating the component states
-    def revise_warning_light(self, percept):
-        self.warning_light_state[percept.src].state = percept.data.value
-        if percept.data.value == int(percept.src.split(":")[1]): # if the light is in a bad state
-            self.warning_light_state[percept.src].last_failed = percept.timestamp
-
-    def revise_scale(self, percept):
-        state = self.scale_state[percept.src] 
-        was_acceptable = abs(state.position - (state.size // 2)) == 0
-
-        self.scale_state[percept.src].position = percept.data.value
-        state = self.scale_state[percept.src] 
-        
-        if was_acceptable:
-            in_range = abs(state.position - (state.size // 2))
-            if in_range > 0: # scale is in a bad position, it failed
-                self.scale_state[percept.src].last_failed = percept.timestamp
+                self.dirty = True
+                self.revise_failed(percept)
+
+    def revise_failed(self, percept):
+        if self.acceptable(percept.src, percept.data.value):
+            self.last_failed.pop(percept.src, None)
+        elif percept.src not in self.last_failed: # the component failed
+            self.last_failed[percept.src] = percept.timestamp
+
+    def components(self):
+        return list(self.scale_position) + list(self.warning_light_status)
+
+    def acceptable(self, component, value=None):
+        """ Is a component (scale or warning light) in an acceptable state?
+
+        Args:
+            component (str): component id (e.g. Scale:0).
+            value (float, optional): state of the component. Defaults to None (its current state in the world state).
+
+        Returns:
+            bool: True if the state is acceptable.
+        """
+        if component in self.scale_center:
+            value = self.scale_position[component] if value is None else value
+            return value == self.scale_center[component]
+        value = self.warning_light_status[component] if value is None else value
+        return value != int(component.split(":")[1]) # WarningLight:0 should be on, WarningLight:1 off
 
     def others_highlighted(self): # are there currently any highlights?
         return any(self.highlighted.values())
@@ -109,10 +107,8 @@ class ICUSystemMind(ICUMind):
     def highlight_any(self):
         actions = []
         # should anything be highlighted? 
-        for scale, state in self.scale_state.items():
-            actions.append(self.highlight_scale(scale, state))
-        actions.append(self.highlight_warning_light('WarningLight:0', 1))
-        actions.append(self.highlight_warning_light('WarningLight:1', 0))
+        for component in self.components():
+            actions.append(self.highlight_component(component))
         actions = [a for a in actions if a is not None] # remove all None actions
         
         if not self.highlight_all: # only highlight the panel...
@@ -129,69 +125,53 @@ class ICUSystemMind(ICUMind):
 
         if not self.is_looking(): #the user is not looking at the task
             if not any(self.highlighted.values()): # if nothing else is already highlighted
-                if time.time() - self.last_viewed > self.grace_period: # wait until the grace period is up before displaying any warnings
+                if self.expired(self.last_viewed): # wait until the grace period is up before displaying any warnings
                     actions.extend(self.highlight_any())
                    
         else: #if the user is looking, remove all of the warnings that have been displayed
             return self.clear_highlights()
         
         # remove any highlights if needed
-        for scale, state in self.scale_state.items():
-            actions.append(self.unhighlight_scale(scale, state))
-        actions.append(self.unhighlight_warning_light('WarningLight:0', 1))
-        actions.append(self.unhighlight_warning_light('WarningLight:1', 0))
+        for component in self.components():
+            actions.append(self.unhighlight_component(component))
         actions.append(self.unhighlight_panel())
-        #rotate = self.rotate_arrow_action(self.eye_position, self.bounding_box[:2])
+        #rotate = self.rotate_arrow_action(self.eye_position, self.spatial.boxes['system'][:2])
         #actions.append(rotate)
 
         return actions
     
+    def edges(self):
+        # only scales moving into or out of the center are needed
+        return {Topic('Scale', label='change'):Equals('value', self.scale_center)}
+
+    def failed_times(self):
+        return [self.last_failed.get(k, 0) for k in self.components() if not self.acceptable(k)]
+
     def unhighlight_panel(self):
         if self.is_highlighted(self.system_panel):
-            unhighlight = True
-            for scale, state in self.scale_state.items():
-                unhighlight = unhighlight and abs(state.position - (state.size // 2)) == 0
-            unhighlight = unhighlight and self.warning_light_state['WarningLight:0'].state == 1
-            unhighlight = unhighlight and self.warning_light_state['WarningLight:1'].state == 0
-            if unhighlight:
+            if all(self.acceptable(k) for k in self.components()):
                 self.highlight_action(self.system_panel, value=False)
 
-    def highlight_scale(self, scale, state):
-        in_range = abs(state.position - (state.size // 2)) == 0
-        #print(in_range, abs(state.position - (state.size // 2)), self.scale_threshold)
-        if not self.is_highlighted(scale) and not in_range and time.time() - state.last_failed > self.grace_period: # if the scales are more than the threshold number of slots away then highlight
-            #print("HIGHLIGHT ", scale, self.last_viewed, time.time() - state.last_failed, self.grace_period)
-            return self.highlight_action(scale, value=True)
+    def highlight_component(self, component):
+        # the component (scale or warning light) has been in a bad state for too long, highlight it!
+        if not self.is_highlighted(component) and not self.acceptable(component) and self.expired(self.last_failed.get(component, 0)):
+            return self.highlight_action(component, value=True)
 
-    def unhighlight_scale(self, scale, state):
-        in_range = abs(state.position - (state.size // 2)) == 0
-        if self.is_highlighted(scale) and in_range: #unhighlight if highlighted and in the acceptable range
-            return self.highlight_action(scale, value=False)
-
-    def highlight_warning_light(self, warning_light, desired_state):
-        if not self.is_highlighted(warning_light): 
-            state = self.warning_light_state[warning_light].state
-            last_failed = self.warning_light_state[warning_light].last_failed
-
-            if state != desired_state and time.time() - last_failed > self.grace_period: # the light is in a bad state for too long, highlight it!
-                #print("HIGHLIGHT ", warning_light, time.time() - last_failed, self.grace_period)
-                return self.highlight_action(warning_light, value=True)
-
-    def unhighlight_warning_light(self, warning_light, desired_state):
-        if self.is_highlighted(warning_light): 
-            if self.warning_light_state[warning_light].state == desired_state: # the light is highlighted but in a good state, unhighlight it!
-                return self.highlight_action(warning_light, value=False)
+    def unhighlight_component(self, component):
+        if self.is_highlighted(component) and self.acceptable(component): # the component is highlighted but in a good state, unhighlight it!
+            return self.highlight_action(component, value=False)
 
     def is_highlighted(self, component): # is a component currently highlighted?
         return self.highlighted[component]
 
     def is_looking(self): #is the user looking at the system monitoring task?
-        ex, ey = self.eye_position
-        x1,y1,x2,y2= self.bounding_box
-        return not (ex < x1 or ey < y1 or ex > x2 or ey > y2)
+        return self.spatial.contains('system', *self.eye_position)
+
+    def is_looking_at(self, widget): #is the user looking at a specific part of the system monitoring task? (e.g. Scale:0)
+        return self.spatial.contains(widget, *self.eye_position)
 
-    def is_looking_at(self, widget): #is the user looking at a specific part of the system monitoring task?
-        raise NotImplementedError("This may not be used...? it wont be very accurate")
+    def looking_at(self): #which parts of the system monitoring task is the user looking at?
+        return [widget for widget in self.spatial.query(*self.eye_position) if widget in self.scale_position or widget in self.warning_light_status]
 
     # ==== ACTIONS ==== #
 
@@ -203,8 +183,8 @@ class ICUSystemMind(ICUMind):
         """
         actions = []
         for component, highlighted in self.highlighted.items():
-            if highlighted and (component in self.scale_state or 
-                                component in self.warning_light_state or
+            if highlighted and (component in self.scale_position or 
+                                component in self.warning_light_status or
                                 component == self.system_panel): #only unhighlight components that belong to this task
                 actions.append(self.highlight_action(component, value=False)) #add an action to turn off the highlighted
         return actions
@@ -12,38 +12,34 @@ __status__ = "Development"
 
 from types import SimpleNamespace
 from collections import defaultdict
-import copy
-import time
 
-from pystarworlds.agent import new_sensor
-
-from .agent import ICUMind, ICUBody
-from ..perception import TrackPerception, EyeTrackerPerception, HighlightPerception
+from .agent import ICUMind, ICUBody, new_icu_sensor
+from ..perception import Topic
 from ..action import ICUAction
+from ..spatial import spatial_index
+from ..edges import Outside
+from ..world import world_state
 
-ICUTrackSensor = new_sensor('ICUTrackSensor', TrackPerception, EyeTrackerPerception, HighlightPerception)
+ICUTrackSensor = new_icu_sensor('ICUTrackSensor', Topic('Target', label='move'), Topic('Overlay', label='gaze'), Topic('Highlight', label='highlight'))
 
 class ICUTrackMind(ICUMind):
 
     LABELS = SimpleNamespace(move='move',  key='key', highlight='highlight', gaze='gaze', saccade='saccade', rotate='rotate')
 
+    INCREMENTAL = True
+
     def __init__(self, config, window_properties):
         super(ICUTrackMind, self).__init__()
 
         # agents beliefs
-        (x,y), (w,h) = window_properties['track']['position'], window_properties['track']['size']
-        self.bounding_box = (x,y,x+w,y+h) # location of the system monitoring task (in window coordinates)
+        self.spatial = spatial_index(window_properties) # gaze hit-testing (shared by all agents), the location of the task is self.spatial.boxes['track']
 
         self.eye_position = (0,0) #gaze position of the users eyes
-        # mirrored state of each component of the system monitoring task (updated in revise)
-   
-        
-        self.target_state = copy.deepcopy({k:v for k,v in config.items() if 'Target' in k})
-        assert len(self.target_state) == 1 #multiple targets???
-        self.target = next(iter(self.target_state.keys())) #target id
-        self.target_state = self.target_state[self.target]
-        assert 'position' not in self.target_state
-        self.target_state['position'] = (0,0) #TODO update if we add a config option for position!
+        # the position of the target is read from the world state (see icua.world), revise only keeps when it failed
+        self.world, self.own_world = world_state(config)
+        targets = [k for k in config.keys() if 'Target' in k]
+        assert len(targets) == 1 #multiple targets???
+        self.target = targets[0] #target id
         
         self.highlighted = defaultdict(lambda: False) # is the component highlighted?
         self.last_viewed = 0 # when was this task last viewed? (never)
@@ -51,6 +47,7 @@ class ICUTrackMind(ICUMind):
 
         # control variables
         self.distance_threshold = 50 # how far from the center can the target be? (pixels)
+        self.target_region = self.region(self.distance()) # of the last move perceived (see region)
         
         #self.grace_period = 2 # how long should I wait before giving the user some feedback if something is wrong
         #self.grace_period = 2
@@ -62,40 +59,37 @@ class ICUTrackMind(ICUMind):
             self.grace_period = 2
 
     def revise(self, *perceptions):
+        self.revise_world(perceptions)
         for perception in sorted(perceptions, key=lambda p: p.name):
 
             assert perception.data.label in ICUTrackMind.LABELS.__dict__ #received an unknown event
             
             if perception.data.label == ICUTrackMind.LABELS.gaze: #gaze position
-                #print("EYE MOVED", self.eye_position)
-                self.eye_position = (perception.data.x, perception.data.y)
-                if self.is_looking():
-                    self.last_viewed = perception.timestamp
+                self.revise_gaze(perception)
             
             elif perception.data.label == ICUTrackMind.LABELS.move: #the tracking target moved
                 if perception.src == self.target: #otherwise ignore it (TODO is there any nice fix in ICU? or perhaps block unwanted events down stream)
-                    #print(perception.data.x, perception.data.y)
-                    x,y = self.target_state['position']
-                    d_old = (x**2 + y**2)**0.5 
-                    self.target_state['position'] = (perception.data.x, perception.data.y) # TODO last_failed
-                    x,y = self.target_state['position']
-                    d_new = (x**2 + y**2)**0.5 
-                    if d_new > self.distance_threshold and d_old <= self.distance_threshold: # if transition from good to bad 
-                        self.last_failed = time.time()
+                    x,y = perception.data.x, perception.data.y
+                    region = self.region((x**2 + y**2)**0.5)
+                    if region > 0 and self.target_region <= 0: # if transition from good to bad 
+                        self.last_failed = self.cycle_time
+                    # decide only compares the distance with the threshold, moves within the same region change nothing
+                    self.dirty = self.dirty or self.target_region != region
+                    self.target_region = region
 
             elif perception.data.label == ICUTrackMind.LABELS.highlight:
                 src = perception.src.split(':', 1)[1]
+                self.dirty = self.dirty or self.highlighted[src] != perception.data.value
                 self.highlighted[src] = perception.data.value
 
     def decide(self):
 
-        x,y = self.target_state['position']
-        d = (x**2 + y**2)**0.5 
+        d = self.distance()
 
         if not self.is_looking():
             if not any(self.highlighted.values()):
-                if time.time() - self.last_viewed > self.grace_period:
-                    if time.time() - self.last_failed > self.grace_period:
+                if self.expired(self.last_viewed):
+                    if self.expired(self.last_failed):
                         
                         if not self.is_highlighted() and d > self.distance_threshold: #the target is away from the center!
                             return self.highlight_action(self.target, value=True)
@@ -108,6 +102,21 @@ class ICUTrackMind(ICUMind):
         if d <= self.distance_threshold and self.is_highlighted():
             return self.highlight_action(self.target, value=False)
     
+    def edges(self):
+        # only the target crossing the distance threshold is needed
+        return {Topic('Target', label='move'):Outside(self.distance_threshold)}
+
+    def failed_times(self):
+        if self.distance() > self.distance_threshold: # the target left the acceptable region
+            return [self.last_failed]
+        return []
+
+    def distance(self): # distance of the target from the center
+        return (self.world[self.target, 'x']**2 + self.world[self.target, 'y']**2)**0.5
+
+    def region(self, d): # is a distance from the center inside (-1), on (0) or outside (1) the threshold?
+        return int(d > self.distance_threshold) - int(d < self.distance_threshold)
+
     def others_highlighted(self): # are there currently any highlights?
         return any(self.highlighted.values())
 
@@ -115,9 +124,7 @@ class ICUTrackMind(ICUMind):
         return self.highlighted[self.target]
 
     def is_looking(self): #is the user looking at the system monitoring task?
-        ex, ey = self.eye_position
-        x1,y1,x2,y2= self.bounding_box
-        return not (ex < x1 or ey < y1 or ex > x2 or ey > y2)
+        return self.spatial.contains('track', *self.eye_position)
 
 class ICUTrackBody(ICUBody):
 
@@ -17,24 +17,20 @@ import random
 import numpy as np
 from pprint import pprint
 
-from pystarworlds.agent import new_sensor
-
-from ..agent import ICUMind, ICUBody
-from ...perception import WarningLightPerception, ScalePerception, TrackPerception, FuelTankPerception, PumpPerception, EyeTrackerPerception, HighlightPerception
+from .user_base import ICUUserBase, ICUUserBaseBody
 from ...action import ICUAction, InputAction
-
-ICUUserSensor = new_sensor('ICUUserSensor', WarningLightPerception, ScalePerception, TrackPerception, FuelTankPerception, PumpPerception, EyeTrackerPerception, HighlightPerception)
+from ...spatial import spatial_index
 
 LABELS = SimpleNamespace(switch='switch', slide='slide', click='click', highlight='highlight', key='key',
                              gaze='gaze', saccade='saccade', move='move', change='change', fuel='fuel')
 
 KEY_CODES = {"Up":98, "Down":104, "Left":100, "Right":102}
 
-class ICUUser(ICUMind):
+class ICUUser(ICUUserBase):
 
    
     def __init__(self, config, window_properties):
-        super(ICUUser, self).__init__()
+        super(ICUUser, self).__init__(config)
         self.config = config
         self.window_properties = window_properties
 
@@ -51,6 +47,7 @@ class ICUUser(ICUMind):
         self.task_positions.update({k:(v['position'][0] + v['size'][0]/2, v['position'][1] + v['size'][1]/2, *v['size']) for k,v in self.window_properties['system'].items() if k in self.components})
         self.task_positions.update({k:(v['position'][0] + v['size'][0]/2, v['position'][1] + v['size'][1]/2, *v['size']) for k,v in self.window_properties['fuel'].items() if k in self.components})
         self.task_positions['Target:0'] = self.task_positions['track']
+        self.spatial = spatial_index(window_properties) # gaze hit-testing
 
         # EYE
         self.eye_position = list(self.task_positions['window'][:2])
@@ -64,15 +61,8 @@ class ICUUser(ICUMind):
         # TRACKING
         self.tracking_size = np.array(self.window_properties['track']['size'])
         self.tracking_acceptable = self.tracking_size * np.array([1/4, 1/4]) # TODO update if ICU configurable
-        self.target_position = np.array([0,0])
-
-        # FUEL
-        self.pump_status = {pump:1 for pump in self.components if "Pump" in pump} # "ready" by default
-        self.tank_status = {tank:self.config[tank]["fuel"] for tank in self.components if "Tank" in tank}
 
-        # SYSTEM
-        self.scale_status = {k:copy.deepcopy(v) for k,v in self.config.items() if "Scale" in k}
-        self.warning_light_status = {k:copy.deepcopy(v) for k,v in self.config.items() if "WarningLight" in k}
+        # component states are in the shared world state (see ICUUserBase)
         self.attention_needed = []
 
     def tank_acceptable(self, tank):
@@ -80,6 +70,7 @@ class ICUUser(ICUMind):
         return pos - self.tank_status[tank]
 
     def revise(self, *perceptions):
+        super(ICUUser, self).revise(*perceptions) # updates the world state if the user has its own
         self.attention_needed = []
         target_moves = []
 
@@ -96,23 +87,6 @@ class ICUUser(ICUMind):
             # TRACKING ATTENTION
             elif percept.data.label == LABELS.key:
                 pass 
-            elif percept.data.label == LABELS.move and 'x' in percept.data.__dict__:
-                self.target_position = np.array([percept.data.x, percept.data.y])
-
-            elif percept.data.label == LABELS.change:
-                if "WarningLight" in percept.src:
-                    self.warning_light_status[percept.src]['state'] = percept.data.value
-                elif "Scale" in percept.src:
-                    self.scale_status[percept.src]["position"] = percept.data.value
-
-                # PUMP ATTENTION
-                elif "Pump" in percept.src: #update the pumps for use in action decision making...
-                    #print(percept)
-                    self.pump_status[percept.src] = percept.data.value # off, on, fail
-
-                # TANK ATTENTION
-                elif "Tank" in percept.src:
-                    self.tank_status[percept.src] = percept.data.value
 
 
         self.priority = dict(filter(lambda x: x[1][1], self.highlighted.items()))
@@ -149,22 +123,20 @@ class ICUUser(ICUMind):
         return actions
 
     def is_looking_at(self, task):
-        x, y, w, h = self.task_positions[task]
-        x1,x2,y1,y2 = x-w/2,x+w/2,y-h/2,y+h/2
-        return self.eye_position[0] >= x1 and self.eye_position[0] <= x2 and self.eye_position[1] >= y1 and self.eye_position[1] <= y2
+        return self.spatial.contains(task, *self.eye_position)
 
 
         pass #print(self.task_positions)
 
     def handle_system(self, actions):
         # handle scales
-        for scale,data in self.scale_status.items():
-             if data['position'] != self.config[scale]['size'] // 2: # scale has moved from the middle
+        for scale,position in self.scale_status.items():
+             if position != self.config[scale]['size'] // 2: # scale has moved from the middle
                 actions.append(self.click(scale))
 
         # handle warning lights
-        for light,data in self.warning_light_status.items():
-            if int(light.split(":")[1]) == data['state']: # the light is in a bad state
+        for light,state in self.warning_light_status.items():
+            if int(light.split(":")[1]) == state: # the light is in a bad state
                 actions.append(self.click(light))
 
     def handle_tracking(self, actions):
@@ -208,10 +180,10 @@ class ICUUser(ICUMind):
 
 
 
-class ICUUserBody(ICUBody):
+class ICUUserBody(ICUUserBaseBody):
 
     def __init__(self, *args):
-        super(ICUUserBody, self).__init__(ICUUser(*args), [ICUUserSensor()])
+        super(ICUUserBody, self).__init__(ICUUser(*args))
 
 
 
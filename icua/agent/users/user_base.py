@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 14:05:33
+
+    Base class of the user models. Users read the state of the ICU components (pumps, tanks, scales, warning lights and
+    the target) from the shared world state (see icua.world) and only perceive highlights. A user that runs without an
+    environment world state (e.g. in a worker process, see icua.remote) has its own world state, it then perceives the
+    component events and updates the world state itself.
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+import numpy as np
+
+from ..agent import ICUMind, ICUBody, DEFAULT_PERIOD, new_icu_sensor
+from ...perception import Topic
+from ...world import world_state
+
+ICUUserSensor = new_icu_sensor('ICUUserSensor', Topic('WarningLight', label='change'), Topic('Scale', label='change'), Topic('Pump', label='change'),
+                                                Topic('FuelTank', label='change'), Topic('Target', label='move'), Topic('Highlight', label='highlight'))
+ICUUserHighlightSensor = new_icu_sensor('ICUUserHighlightSensor', Topic('Highlight', label='highlight')) # component states are in a shared world state
+
+class ICUUserBase(ICUMind):
+
+    def __init__(self, config, period=DEFAULT_PERIOD):
+        """
+        Args:
+            config (dict): ICU config.
+            period (float, optional): cycle period (see ICUMind). Defaults to DEFAULT_PERIOD.
+        """
+        super(ICUUserBase, self).__init__(period=period)
+
+        # component states are shared with the other agents, the user only updates them if it runs on its own
+        self.world, self.own_world = world_state(config)
+
+        # FUEL
+        self.pump_status = self.world.view('Pump', 'state') # off, on, fail ("ready" by default)
+        self.tank_status = self.world.view('FuelTank', 'fuel')
+
+        # SYSTEM
+        self.scale_status = self.world.view('Scale', 'position')
+        self.warning_light_status = self.world.view('WarningLight', 'state')
+
+    @property
+    def target_position(self):
+        return np.array([self.world['Target:0', 'x'], self.world['Target:0', 'y']])
+
+    def revise(self, *perceptions):
+        self.revise_world(perceptions)
+
+class ICUUserBaseBody(ICUBody):
+
+    def __init__(self, mind):
+        """
+        Args:
+            mind (ICUUserBase): the user, perceives component events only if it has its own world state.
+        """
+        sensor = ICUUserSensor() if mind.own_world else ICUUserHighlightSensor()
+        super(ICUUserBaseBody, self).__init__(mind, [sensor])
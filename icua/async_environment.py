@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 19-10-2026 14:05:51
+
+    An asyncio variant of ICUEnvironment in which ICU event ingestion, each agent's cycle and action dispatch are separate
+    tasks. Agent cycles run in their own worker threads, a slow agent only delays itself, the actions of the other agents
+    (e.g. highlights) are dispatched as soon as their cycle completes.
+
+        ingest   - takes events from ICU and routes them to agent sensors, wakes agents that received events or have a deadline
+        agent    - (one per agent) cycles the agent when it is woken, queues its actions for dispatch
+        dispatch - executes actions (sends them to ICU)
+
+    Back-pressure: ingest stops taking events from ICU while the agents that are keeping up have more than max_pending
+    perceptions waiting (events wait in the ICU sink instead, see ICUEnvironment.backlog), and agents wait to queue
+    actions while max_actions are waiting to be dispatched. An agent whose cycle takes longer than its deadline is late,
+    late agents are not waited on by ingest (their perceptions accumulate until they catch up).
+
+    With a virtual clock (e.g. the simulator, see icua.headless) time only passes when ingest waits, ingest waits for 
+    all agent cycles and actions to complete first (agents still cycle concurrently), so simulated time stays consistent.
+
+    Example:
+        env = AsyncICUEnvironment(FuelMonitor, SystemMonitor, TrackMonitor, Evaluator, deadlines=dict(ICUTrackMind=0.05))
+        env.simulate()
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+
+from .environment import ICUEnvironment
+from .action import InputAction
+from .routing import topics
+
+AGENT_DEADLINE = 0.1 # seconds, default time an agent cycle may take before the agent is late
+MAX_PENDING = 1000 # perceptions waiting for agents that are keeping up before ingest stops taking events
+MAX_ACTIONS = 1000 # action batches waiting to be dispatched before agents stop queuing actions
+
+class _AgentTask:
+
+    def __init__(self, agent, deadline):
+        self.agent = agent
+        self.name = type(agent.mind).__name__
+        self.deadline = deadline
+        self.wake = asyncio.Event()
+        self.idle = asyncio.Event() # not woken or cycling
+        self.idle.set()
+        self.pending = 0 # perceptions routed to this agent since its last cycle started
+        self.late = False
+        self.scheduled = False # are the agent's deadlines in the environment scheduler? (otherwise they are polled)
+
+class AsyncICUEnvironment(ICUEnvironment):
+
+    def __init__(self, *agents, deadlines=None, deadline=AGENT_DEADLINE, max_pending=MAX_PENDING, max_actions=MAX_ACTIONS, **kwargs):
+        """
+        Args:
+            agents (callable): agent factories, each is called with (config, window_properties).
+            deadlines (dict, optional): {mind type name:deadline (seconds)} per agent deadlines. Defaults to None.
+            deadline (float, optional): deadline (seconds) of agents that are not in deadlines. Defaults to AGENT_DEADLINE.
+            max_pending (int, optional): perceptions waiting for (on time) agents before ingest stops taking events. Defaults to MAX_PENDING.
+            max_actions (int, optional): action batches waiting to be dispatched before agents wait. Defaults to MAX_ACTIONS.
+            kwargs: see ICUEnvironment.
+        """
+        super(AsyncICUEnvironment, self).__init__(*agents, **kwargs)
+        self.deadlines = dict() if deadlines is None else dict(deadlines)
+        self.deadline = deadline
+        self.max_pending = max_pending
+        self.max_actions = max_actions
+
+    def simulate(self, *args, **kwargs):
+        asyncio.run(self.run())
+        self.icuprocess.join()
+        for a in self.ambient.agents.values():
+            a.mind.terminate()
+        if self.own_world:
+            self.world.close()
+
+    async def run(self):
+        """ Run the environment until the ICU process ends. """
+        loop = asyncio.get_running_loop()
+        agents = list(self.ambient.agents.values())
+        self.tasks = [_AgentTask(a, self.deadlines.get(type(a.mind).__name__, self.deadline)) for a in agents]
+        for task in self.tasks:
+            task.scheduled = task.agent not in self.polled
+        self.running = True
+        self.actions = asyncio.Queue(maxsize=self.max_actions)
+        self.drained = asyncio.Event() # set when on time agents have taken their perceptions
+        sensors = {sensor:task for task in self.tasks for sensor in task.agent.sensors.values()}
+        # agents that perceive input from other agents (see InputAction), these are notified by physics rather than ingest
+        self.input_tasks = [task for task in self.tasks if any(t.group == 'Overlay' for s in task.agent.sensors.values() for t in topics(s))]
+
+        with ThreadPoolExecutor(max_workers=len(agents) + 1) as executor: # a thread per agent + one to wait for ICU
+            workers = [loop.create_task(self.agent(task, loop, executor)) for task in self.tasks]
+            dispatch = loop.create_task(self.dispatch())
+            try:
+                await self.ingest(sensors, loop, executor)
+            finally:
+                self.running = False
+                for task in self.tasks:
+                    task.wake.set()
+                await asyncio.gather(*workers)
+                await self.actions.put(None)
+                await dispatch
+
+    def pending(self):
+        """
+        Returns:
+            int: number of perceptions waiting for agents that are keeping up (not late).
+        """
+        return sum(task.pending for task in self.tasks if not task.late)
+
+    async def ingest(self, sensors, loop, executor):
+        metrics = self.metrics
+        while self.icuprocess.is_alive():
+            self.cycle_start = self.clock.time()
+
+            while self.pending() > self.max_pending: # back-pressure, leave events in ICU until agents catch up
+                self.drained.clear()
+                await self.drained.wait()
+
+            for i, process in self.ambient.processes.items():
+                _time = time.perf_counter()
+                events = process(self)
+                metrics.time('cycle.drain', time.perf_counter() - _time)
+                metrics.count('events.process.{0}'.format(i), len(events))
+
+                if self.update_world:
+                    _time = time.perf_counter()
+                    self.world.update(events)
+                    metrics.time('cycle.world', time.perf_counter() - _time)
+
+                _time = time.perf_counter()
+                notified = {}
+                self.router.route(events, notified=notified)
+                metrics.time('cycle.route', time.perf_counter() - _time)
+                for sensor, n in notified.items():
+                    task = sensors[sensor]
+                    task.pending += n
+                    self._wake(task)
+
+            _time = self.clock.time()
+            self.scheduler.run(_time) # expired grace periods mark their minds dirty
+            for task in self.tasks: # deadlines that are due (e.g. grace periods)
+                if task.scheduled:
+                    if task.agent.mind.dirty:
+                        self._wake(task)
+                else:
+                    deadline = task.agent.mind.next_deadline()
+                    if deadline is not None and deadline <= _time:
+                        self._wake(task)
+
+            metrics.count('backlog', self.backlog())
+            if self.clock.virtual: # time must not pass while agents are cycling
+                while True:
+                    for task in self.tasks:
+                        await task.idle.wait()
+                    await self.actions.join()
+                    if all(task.idle.is_set() for task in self.tasks): # dispatch may have woken agents
+                        break
+            await loop.run_in_executor(executor, self.wait)
+
+    def _wake(self, task):
+        task.idle.clear()
+        task.wake.set()
+
+    async def agent(self, task, loop, executor):
+        metrics = self.metrics
+        while True:
+            await task.wake.wait()
+            task.wake.clear()
+            if not self.running:
+                return
+            pending, task.pending = task.pending, 0
+
+            _time = time.perf_counter()
+            cycle = loop.run_in_executor(executor, task.agent.cycle)
+            try:
+                await asyncio.wait_for(asyncio.shield(cycle), task.deadline)
+            except asyncio.TimeoutError:
+                task.late = True # ingest no longer waits for this agent
+                self.drained.set()
+                metrics.count('deadline.agent.{0}'.format(task.name), 1)
+                await cycle
+                task.late = False
+            metrics.time('cycle.agent.{0}'.format(task.name), time.perf_counter() - _time)
+            metrics.count('events.agent.{0}'.format(task.name), pending)
+            if self.pending() <= self.max_pending:
+                self.drained.set()
+
+            attempts = [action for actuator in task.agent.actuators.values() for action in actuator]
+            if len(attempts) > 0:
+                await self.actions.put(attempts) # back-pressure, waits if dispatch is behind
+            if not task.wake.is_set():
+                task.idle.set()
+
+    async def dispatch(self):
+        metrics = self.metrics
+        while True:
+            attempts = await self.actions.get()
+            if attempts is None:
+                return
+            _time = time.perf_counter()
+            self.physics.execute(self, attempts)
+            if any(isinstance(action, InputAction) for action in attempts):
+                for task in self.input_tasks:
+                    self._wake(task)
+            metrics.time('cycle.actions', time.perf_counter() - _time)
+            metrics.count('actions', len(attempts))
+            self.actions.task_done()
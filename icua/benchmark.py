@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 18-10-2026 20:31:48
+
+    Throughput benchmarks for ICUA. A deterministic (seeded) stream of ICU events is generated at a configurable rate
+    for each component group, and is used to measure events per second through:
+        perception  - conversion of ICU events to perceptions (see icua.perception.perception)
+        route       - routing of perceptions to agent sensors (see icua.routing)
+        agents      - each mind's revise and decide (perceptions are given to a mind in batches, one per cycle)
+        environment - a full (headless) environment run, agents cycle as they would in a session
+    Results are returned (and optionally written) as JSON, so that they can be compared between versions.
+
+    Example:
+        python -m icua.benchmark --duration 60 --rate Overlay=500 --output benchmark.json
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from types import SimpleNamespace
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import time
+
+from .perception import perception
+from .routing import ICURouter
+from .headless import HeadlessProcess, load_config, WINDOW_PROPERTIES
+from .clock import VirtualClock, using
+
+# events per second for each component group (roughly those of a med-config session with a 100Hz eyetracker)
+DEFAULT_RATES = dict(Overlay=100, Target=20, WarningLight=0.5, Scale=2, Pump=0.5, FuelTank=10, Highlight=0.5)
+
+DEFAULT_AGENTS = ('SystemMonitor', 'FuelMonitor', 'TrackMonitor', 'Evaluator')
+
+PANELS = ['SystemMonitor', 'FuelMonitor', 'TrackMonitor']
+
+def _overlay(rng):
+    return 'EyeTrackerStub', 'Overlay:0', dict(label='gaze', x=rng.uniform(0, 800), y=rng.uniform(0, 700))
+
+def _target(rng):
+    return 'Target:0', 'Canvas', dict(label='move', x=rng.uniform(-100, 100), y=rng.uniform(-100, 100))
+
+def _warning_light(rng):
+    return 'WarningLight:{0}'.format(rng.randint(0, 1)), 'Canvas', dict(label='change', value=rng.randint(0, 1))
+
+def _scale(rng):
+    return 'Scale:{0}'.format(rng.randint(0, 3)), 'Canvas', dict(label='change', value=rng.randint(0, 10))
+
+def _pump(rng):
+    return rng.choice(['Pump:AB', 'Pump:BA', 'Pump:CA', 'Pump:DB', 'Pump:EA', 'Pump:EC', 'Pump:FB', 'Pump:FD']), 'Canvas', dict(label='change', value=rng.randint(0, 2))
+
+def _fuel_tank(rng):
+    if rng.random() < 0.05: # acceptable level changes are rare
+        return rng.choice(['FuelTank:A', 'FuelTank:B']), 'Canvas', dict(label='fuel', value=rng.uniform(0, 2000), acceptable=rng.random() < 0.5)
+    return rng.choice(['FuelTank:A', 'FuelTank:B', 'FuelTank:C', 'FuelTank:D', 'FuelTank:E', 'FuelTank:F']), 'Canvas', dict(label='change', value=rng.uniform(0, 1000))
+
+def _highlight(rng):
+    return 'Highlight:{0}'.format(rng.choice(PANELS)), 'Canvas', dict(label='highlight', value=rng.random() < 0.5)
+
+# event generators for each component group, generator(rng) -> (src, dst, data)
+GENERATORS = dict(Overlay=_overlay, Target=_target, WarningLight=_warning_light, Scale=_scale, Pump=_pump, FuelTank=_fuel_tank, Highlight=_highlight)
+
+def event_stream(rates=DEFAULT_RATES, duration=60, seed=0, start=0.):
+    """ Generate a stream of ICU events, events of each group arrive as a Poisson process with the given rate.
+        The same arguments always give the same stream.
+
+    Args:
+        rates (dict, optional): {group:events per second}. Defaults to DEFAULT_RATES.
+        duration (float, optional): length of the stream (seconds). Defaults to 60.
+        seed (int, optional): random seed. Defaults to 0.
+        start (float, optional): timestamp of the start of the stream. Defaults to 0.
+
+    Returns:
+        list: events (ordered by timestamp), each has timestamp, name, src, dst and data (as ICU events do).
+    """
+    events = []
+    for group, rate in sorted(rates.items()):
+        if group not in GENERATORS:
+            raise ValueError("Unknown component group: {0}, avaliable groups are: {1}".format(group, list(GENERATORS.keys())))
+        if rate <= 0:
+            continue
+        rng = random.Random("{0}:{1}".format(seed, group)) # independent of the other groups, changing one rate does not change the rest
+        t = rng.expovariate(rate)
+        while t < duration:
+            src, dst, data = GENERATORS[group](rng)
+            events.append((t, src, dst, data))
+            t += rng.expovariate(rate)
+    events.sort(key=lambda e: e[0])
+    return [SimpleNamespace(timestamp=start + t, name="{0:012d}".format(i), src=src, dst=dst, data=SimpleNamespace(**data))
+            for i, (t, src, dst, data) in enumerate(events)]
+
+class BenchmarkProcess(HeadlessProcess):
+    """ A headless ICU process that replays an event stream (see event_stream) and ignores agent actions. """
+
+    def __init__(self, events, duration, config=None, clock=None, window_properties=WINDOW_PROPERTIES):
+        """
+        Args:
+            events (list): events to replay, timestamps are relative to the start of the process.
+            duration (float): time (seconds) at which the process shuts down.
+            config (str, dict, optional): ICU config given to agents. Defaults to None (the default config).
+            clock (Clock, optional): clock that drives the process. Defaults to a new VirtualClock.
+            window_properties (dict, optional): widget positions reported to agents. Defaults to WINDOW_PROPERTIES.
+        """
+        config = load_config(config) if not isinstance(config, dict) else dict(config)
+        config['shutdown'] = duration * 1000
+        super(BenchmarkProcess, self).__init__(config=config, clock=clock, window_properties=window_properties)
+        self.events = events
+        self.next_event = 0
+        if len(events) > 0:
+            self.timer(self.start_time + events[0].timestamp, self.replay)
+
+    def replay(self, t):
+        events = self.events
+        i = self.next_event
+        while i < len(events) and self.start_time + events[i].timestamp <= t:
+            event = events[i]
+            self.emit(self.start_time + event.timestamp, event.src, event.dst, **event.data.__dict__)
+            i += 1
+        self.next_event = i
+        if i < len(events):
+            self.timer(self.start_time + events[i].timestamp, self.replay)
+
+def _rate(n, seconds):
+    return dict(events=n, seconds=seconds, events_per_second=n / seconds if seconds > 0 else float('inf'))
+
+def _agents(names, clock):
+    from .runner import AGENTS
+    with using(clock):
+        return [AGENTS[name](load_config(), WINDOW_PROPERTIES) for name in names]
+
+def bench_perception(events, repeat=3):
+    """ Throughput of perception (ICU event -> perception), the best of several repeats.
+
+    Args:
+        events (list): ICU events.
+        repeat (int, optional): number of repeats. Defaults to 3.
+
+    Returns:
+        dict: events, seconds and events_per_second.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for event in events:
+            perception(event)
+        best = min(best, time.perf_counter() - start_time)
+    return _rate(len(events), best)
+
+def bench_route(perceptions, agents, cycle=0.1):
+    """ Throughput of routing perceptions to agent sensors, perceptions are routed in batches (one batch per cycle) and sensors are drained between batches.
+
+    Args:
+        perceptions (list): perceptions (ordered by timestamp).
+        agents (list): agent bodies.
+        cycle (float, optional): length of a cycle (seconds). Defaults to 0.1.
+
+    Returns:
+        dict: events, seconds and events_per_second.
+    """
+    router = ICURouter(agents)
+    total = 0.
+    for batch in _batches(perceptions, cycle):
+        start_time = time.perf_counter()
+        router.route(batch)
+        total += time.perf_counter() - start_time
+        for agent in agents:
+            agent.perceive()
+    return _rate(len(perceptions), total)
+
+def bench_agents(perceptions, agents, clock, cycle=0.1):
+    """ Throughput of each mind's revise and decide. Each mind is given the perceptions that it subscribes to, in batches
+        (one batch per cycle), the clock is advanced to the end of each cycle before the batch is given.
+
+    Args:
+        perceptions (list): perceptions (ordered by timestamp).
+        agents (list): agent bodies.
+        clock (VirtualClock): the clock used by the agents.
+        cycle (float, optional): length of a cycle (seconds). Defaults to 0.1.
+
+    Returns:
+        dict: {mind type:{revise:..., decide:...}}, decide counts cycles rather than events.
+    """
+    router = ICURouter(agents)
+    results = {}
+    for agent in agents:
+        sensors = set(agent.sensors.values())
+        subscribed = [p for p in perceptions if any(s in sensors for s in router.subscribers(p.group, p.src, p.data.label))]
+        mind = agent.mind
+        revise, decide, cycles = 0., 0., 0
+        for t, batch in _batches(subscribed, cycle, times=True, start=perceptions[0].timestamp if len(perceptions) > 0 else 0):
+            clock.advance(t)
+            start_time = time.perf_counter()
+            mind.revise(*batch)
+            revise += time.perf_counter() - start_time
+            start_time = time.perf_counter()
+            mind.decide()
+            decide += time.perf_counter() - start_time
+            cycles += 1
+        results[type(mind).__name__] = dict(revise=_rate(len(subscribed), revise), decide=_rate(cycles, decide))
+    return results
+
+def bench_environment(events, duration, agents, cycle=0.1):
+    """ Throughput of a full environment run with a headless process (see BenchmarkProcess) that replays the events in simulated time.
+
+    Args:
+        events (list): ICU events, timestamps are relative to the start of the run.
+        duration (float): length of the run (seconds of simulated time).
+        agents (list(str)): agent names (see icua.runner.AGENTS).
+        cycle (float, optional): longest time (seconds) between environment cycles. Defaults to 0.1.
+
+    Returns:
+        dict: events, seconds (wall time), events_per_second and the environment metrics (see icua.metrics).
+    """
+    from .environment import ICUEnvironment
+    from .runner import AGENTS
+
+    process = BenchmarkProcess(events, duration)
+    env = ICUEnvironment(*[AGENTS[name] for name in agents], process=process, idle_timeout=cycle)
+    start_time = time.perf_counter()
+    env.simulate()
+    total = time.perf_counter() - start_time
+    result = _rate(len(events), total)
+    result['metrics'] = env.metrics.snapshot()
+    return result
+
+def _batches(perceptions, cycle, times=False, start=None):
+    if len(perceptions) == 0:
+        return
+    start = perceptions[0].timestamp if start is None else start
+    end, batch = start + cycle, []
+    for p in perceptions:
+        while p.timestamp >= end:
+            if len(batch) > 0:
+                yield (end, batch) if times else batch
+                batch = []
+            end += cycle
+        batch.append(p)
+    if len(batch) > 0:
+        yield (end, batch) if times else batch
+
+def run(agents=DEFAULT_AGENTS, rates=DEFAULT_RATES, duration=60, seed=0, cycle=0.1, environment=True):
+    """ Run all benchmarks.
+
+    Args:
+        agents (list(str), optional): agent names (see icua.runner.AGENTS). Defaults to DEFAULT_AGENTS.
+        rates (dict, optional): {group:events per second}. Defaults to DEFAULT_RATES.
+        duration (float, optional): length of the event stream (seconds). Defaults to 60.
+        seed (int, optional): random seed of the event stream. Defaults to 0.
+        cycle (float, optional): length of a cycle (seconds). Defaults to 0.1.
+        environment (bool, optional): whether to run the (slower) full environment benchmark. Defaults to True.
+
+    Returns:
+        dict: parameters and results.
+    """
+    events = event_stream(rates, duration=duration, seed=seed)
+    clock = VirtualClock(start=0.)
+    perceptions = [perception(event) for event in events]
+
+    with contextlib.redirect_stdout(io.StringIO()): # agents may print
+        results = dict(perception=bench_perception(events),
+                       route=bench_route(perceptions, _agents(agents, clock), cycle=cycle),
+                       agents=bench_agents(perceptions, _agents(agents, clock), clock, cycle=cycle))
+        if environment:
+            results['environment'] = bench_environment(events, duration, agents, cycle=cycle)
+
+    return dict(parameters=dict(agents=list(agents), rates=dict(rates), duration=duration, seed=seed, cycle=cycle, events=len(events)),
+                platform=dict(python=platform.python_version(), machine=platform.machine(), processor=platform.processor()),
+                results=results)
+
+def main():
+    parser = argparse.ArgumentParser(description="ICUA throughput benchmarks.")
+    parser.add_argument("--agents", nargs="+", default=list(DEFAULT_AGENTS), help="agents to benchmark (see icua.runner.AGENTS).")
+    parser.add_argument("--rate", nargs="+", default=[], metavar="GROUP=RATE", help="events per second for a component group, e.g. Overlay=500.")
+    parser.add_argument("--duration", type=float, default=60, help="length of the event stream (seconds).")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the event stream.")
+    parser.add_argument("--cycle", type=float, default=0.1, help="length of a cycle (seconds).")
+    parser.add_argument("--no-environment", action="store_true", help="skip the full environment benchmark.")
+    parser.add_argument("--output", default=None, help="path of a JSON file for the results (default: stdout).")
+    args = parser.parse_args()
+
+    rates = dict(DEFAULT_RATES)
+    for rate in args.rate:
+        group, value = rate.split("=")
+        rates[group] = float(value)
+
+    results = run(agents=args.agents, rates=rates, duration=args.duration, seed=args.seed, cycle=args.cycle, environment=not args.no_environment)
+    if args.output is None:
+        print(json.dumps(results, indent=2))
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 18-10-2026 10:12:31
+
+    Clocks used by the environment, agents and evaluation. All time dependent logic in ICUA should ask a clock for the time
+    rather than calling time.time() directly so that sessions can be run in simulated time (see VirtualClock).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from contextlib import contextmanager
+import time
+
+class Clock:
+    """ Wall clock, time passes in real time. """
+
+    virtual = False
+
+    def time(self):
+        """
+        Returns:
+            float: the current time (seconds since epoch).
+        """
+        return time.time()
+
+    def sleep(self, t):
+        """ Let t seconds pass.
+
+        Args:
+            t (float): seconds.
+        """
+        if t > 0:
+            time.sleep(t)
+
+class VirtualClock(Clock):
+    """ Simulated clock, time only passes when the clock is told to sleep. Sleeping returns immediately, so a session
+        driven by a virtual clock runs as fast as the CPU allows.
+    """
+
+    virtual = True
+
+    def __init__(self, start=None):
+        """
+        Args:
+            start (float, optional): initial time. Defaults to None (the current wall time, so that timestamps look like those produced by ICU).
+        """
+        self._time = time.time() if start is None else start
+
+    def time(self):
+        return self._time
+
+    def sleep(self, t):
+        if t > 0:
+            self._time += t
+
+    def advance(self, t):
+        """ Move the clock forward to time t (has no effect if t is in the past).
+
+        Args:
+            t (float): time to advance to.
+        """
+        self._time = max(self._time, t)
+
+WALL_CLOCK = Clock()
+
+_clock = WALL_CLOCK
+
+def get_clock():
+    """
+    Returns:
+        Clock: the current default clock, used by agents (and anything else that is not explicitly given a clock) on creation.
+    """
+    return _clock
+
+def set_clock(clock):
+    """ Set the default clock.
+
+    Args:
+        clock (Clock): the new default clock, None resets to WALL_CLOCK.
+    """
+    global _clock
+    _clock = WALL_CLOCK if clock is None else clock
+
+@contextmanager
+def using(clock):
+    """ Temporarily set the default clock, used by the environment when creating agents.
+
+    Args:
+        clock (Clock): the clock to use.
+    """
+    previous = get_clock()
+    set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
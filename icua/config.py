@@ -13,11 +13,15 @@ options_fuel_ag = dict(
 options_track_ag = dict(
     grace_period = Option('track', is_type(int, float))
 ) 
+options_evaluator_ag = dict(
+    snapshot = Option('evaluator', is_type(int, float))
+)
 
 options_agent = dict(
     system = Option("agent", validate_options('system', _options=options_system_ag)),
     fuel = Option("agent", validate_options('fuel', _options=options_fuel_ag)),
     track = Option("agent", validate_options('track', _options=options_track_ag)),  
+    evaluator = Option("agent", validate_options('evaluator', _options=options_evaluator_ag)),
 )
 
 options = dict(
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 20-10-2026 16:40:12
+
+    Edge triggered subscriptions. Many ICU events are level updates (e.g. a scale moved from one bad position to another),
+    an agent that only cares about transitions can attach an edge to a topic that it subscribes to, the router then
+    forwards an event only when the value of the edge (for the source of the event) changes. The first event of each
+    source is always forwarded.
+
+    Edges are evaluated by the router once per event, however many sensors subscribe with the same edge (edges with the
+    same type and arguments are equal). A mind declares its edges with ICUMind.edges.
+
+    Example:
+        def edges(self):
+            return {Topic('FuelTank', label='fuel'):Changes('acceptable')}
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from abc import ABC, abstractmethod
+
+class Edge(ABC):
+    """ Base class for edges, subclasses give the value of an event (see __call__). Edges are compared by type and arguments. """
+
+    def __init__(self, *args):
+        self.args = args
+
+    @abstractmethod
+    def __call__(self, percept):
+        """
+        Args:
+            percept (ICUPerception): perception.
+
+        Returns:
+            object: value of the edge for this perception, the perception is forwarded if the value differs from the
+                value of the previous perception from the same source.
+        """
+        pass
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.args == other.args
+
+    def __hash__(self):
+        return hash((type(self), self.args))
+
+    def __repr__(self):
+        return "{0}{1}".format(type(self).__name__, self.args)
+
+class Changes(Edge):
+    """ Forward when a field of the event data changes, e.g. Changes('acceptable'). """
+
+    def __init__(self, field):
+        super(Changes, self).__init__(field)
+        self.field = field
+
+    def __call__(self, percept):
+        return getattr(percept.data, self.field, None)
+
+class Equals(Edge):
+    """ Forward when a field of the event data starts or stops being equal to a value (given for each source),
+        e.g. Equals('value', {'Scale:0':5, 'Scale:1':5}).
+    """
+
+    def __init__(self, field, values):
+        values = tuple(sorted(values.items()))
+        super(Equals, self).__init__(field, values)
+        self.field = field
+        self.values = dict(values)
+
+    def __call__(self, percept):
+        return getattr(percept.data, self.field, None) == self.values.get(percept.src, None)
+
+class Outside(Edge):
+    """ Forward when a position (x, y) crosses a circle of the given radius (around (0,0)), the value is -1 (inside),
+        0 (on) or 1 (outside). e.g. Outside(50) for the tracking target.
+    """
+
+    def __init__(self, radius):
+        super(Outside, self).__init__(radius)
+        self.radius = radius
+
+    def __call__(self, percept):
+        x, y = getattr(percept.data, 'x', None), getattr(percept.data, 'y', None)
+        if x is None or y is None:
+            return None
+        d = (x**2 + y**2)**0.5
+        return (d > self.radius) - (d < self.radius)
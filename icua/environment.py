@@ -9,54 +9,256 @@ __author__ = "Benedict Wilkins"
 __email__ = "benrjw@gmail.com"
 __status__ = "Development"
 
-CYCLE_DELAY = 0.1 # seconds WARNING see below
-assert CYCLE_DELAY > 10e-4 #otherwise crash (interprocess communication cant keep up)
+CYCLE_DELAY = 0.1 # seconds, the longest the environment will wait for something to happen before cycling anyway
+MAX_CYCLE_RATE = 1000 # cycles per second, upper bound on the cycle rate (stops an event flood from spinning a core)
+EVENT_BUDGET = 1000 # maximum number of ICU events taken in one cycle, the rest wait for the next cycle
+EVENT_TIME_SLICE = 0.05 # seconds, maximum time spent taking ICU events in one cycle
+RING_SIZE = 1 << 22 # bytes, size of each ring buffer of the shared memory transport (see ICUProcess ring_size)
 
 import icu
 
 import time
+import queue
 import random 
+import multiprocessing
+import numpy as np
+from collections import deque
 from pprint import pprint
 
 from threading import Thread
 
 from icu.process import PipedMemory
+from icu.event import Event
 
 from pystarworlds.environment import Environment, Physics, Ambient, Process
 
 from .action import ICUAction, InputAction
 from .perception import ICUPerception, perception
-
-from .icu_stub import ICUProcessStub, ICUProcessStub2 # EXPERIMENTS
+from .clock import WALL_CLOCK, using
+from .scheduler import Scheduler, scheduling
+from .world import WorldState, sharing
+from .routing import ICURouter, TopicFilter
+from .metrics import Metrics
+from .journal import JournalProcess
+from .ringbuffer import RingBuffer
+from .transport import RingQueue
+
+class FilteredBuffer:
+    """ Event buffer of an ICUEventSink that drops the events that no agent subscribes to. ICU puts every event into the
+        buffer of each external sink (in the ICU process), the filter is applied there (and only there) so that unwanted 
+        events are not pickled and piped to the agents. The filter is set after ICU has started (agents are created once 
+        ICU is running), until the ICU process has received it all events are accepted.
+
+        Filters are sent to the ICU process through a queue, tagged with a generation number. The current generation is 
+        also kept in shared memory, so that the ICU process only looks at the queue when the filter has changed, and keeps
+        using its previous filter until the filter of the current generation arrives.
+    """
+
+    def __init__(self, buffer):
+        """
+        Args:
+            buffer (Queue, RingQueue): the underlying event buffer.
+        """
+        self.buffer = buffer
+        self.generation = multiprocessing.Value('L', 0, lock=False) # incremented (by the subscriber only) each time the filter changes
+        self.filters = multiprocessing.Queue() # (generation, filter)
+        self.filter = None
+        self.filter_generation = 0 # generation of self.filter (in this process)
+
+    def __getattr__(self, name): # everything else is the underlying buffer (get, empty, qsize, ...)
+        if name == 'buffer':
+            raise AttributeError(name)
+        return getattr(self.buffer, name)
+
+    def set_filter(self, filter):
+        """ Set the filter (in the subscribing process).
+
+        Args:
+            filter (TopicFilter): filter, None accepts all events.
+        """
+        generation = self.generation.value + 1
+        self.filters.put((generation, filter))
+        self.generation.value = generation
+
+    def accept(self, event):
+        if self.filter_generation != self.generation.value: # the filter has changed, take the latest that has arrived
+            try:
+                while True:
+                    self.filter_generation, self.filter = self.filters.get_nowait()
+            except queue.Empty:
+                pass
+        return self.filter is None or self.filter.accept(event.src, event.dst, event.data.label)
+
+    def put(self, event, *args, **kwargs):
+        if self.accept(event):
+            self.buffer.put(event, *args, **kwargs)
+
+    def close(self):
+        self.filters.close()
+        self.filters.cancel_join_thread() # filters that were not taken by the ICU process are no longer needed
+        return self.buffer.close()
+
+def _set_buffer(channel, cls, buffer):
+    # ICU reads and writes the buffer of its external sinks and sources through their private (name mangled) __buffer
+    # attribute, in both processes, and has no way to be given a buffer. This is the only place that replaces it.
+    setattr(channel, '_{0}__buffer'.format(cls.__name__), buffer)
 
 class ICUEventSink(icu.ExternalEventSink):
 
-    def __init__(self):
+    def __init__(self, buffer=None, ring_size=None):
+        """
+        Args:
+            buffer (Queue, RingQueue, optional): buffer through which events are received from ICU. Defaults to None (a 
+                multiprocessing queue, or a ring buffer if ring_size is given).
+            ring_size (int, optional): if given, events are received through a shared memory ring buffer of this size
+                (see icua.transport) rather than a multiprocessing queue. Defaults to None.
+        """
         super(ICUEventSink, self).__init__()
+        self.__pending = deque() # events taken from the buffer while waiting
+        if buffer is None:
+            buffer = multiprocessing.Queue() if ring_size is None else RingQueue(RingBuffer(ring_size), Event)
+        self.buffer = FilteredBuffer(buffer)
+        _set_buffer(self, icu.ExternalEventSink, self.buffer)
+
+    def wait(self, timeout=None):
+        """ Block until an event is available or the timeout expires.
+
+        Args:
+            timeout (float, optional): maximum time to wait (seconds). Defaults to None (wait forever).
+
+        Returns:
+            bool: True if an event is available.
+        """
+        if len(self.__pending) > 0:
+            return True
+        try:
+            self.__pending.append(self.buffer.get(timeout=timeout))
+            return True
+        except queue.Empty:
+            return False
+
+    def empty(self):
+        return len(self.__pending) == 0 and super(ICUEventSink, self).empty()
+
+    def get(self):
+        if len(self.__pending) > 0:
+            return self.__pending.popleft()
+        return super(ICUEventSink, self).get()
+
+    def get_many(self, n=None, time_slice=None):
+        """ Take all waiting events, up to a maximum number or until the time slice expires (whichever comes first). 
+
+        Args:
+            n (int, optional): maximum number of events to take. Defaults to None (no maximum).
+            time_slice (float, optional): maximum time (seconds) to spend taking events. Defaults to None (no maximum).
+
+        Returns:
+            list: events (oldest first).
+        """
+        n = float('inf') if n is None else n
+        events = []
+        while len(self.__pending) > 0 and len(events) < n:
+            events.append(self.__pending.popleft())
+
+        buffer = self.buffer
+        end = None if time_slice is None else time.time() + time_slice
+        try:
+            while len(events) < n:
+                events.append(buffer.get_nowait()) # a single lock acquisition per event (empty + get takes two)
+                if end is not None and len(events) % 32 == 0 and time.time() > end:
+                    break
+        except queue.Empty:
+            pass
+        return events
+
+    def subscribe(self, filter):
+        """ Only receive the events accepted by a filter (applied in the ICU process).
+
+        Args:
+            filter (TopicFilter): filter, None to receive all events.
+        """
+        self.buffer.set_filter(filter)
+
+    def backlog(self):
+        """ 
+        Returns:
+            int: (approximate) number of events waiting to be taken.
+        """
+        try:
+            return len(self.__pending) + self.buffer.qsize()
+        except NotImplementedError: # qsize is not implemented on some platforms (macOS)
+            return len(self.__pending) + int(not super(ICUEventSink, self).empty())
 
 class ICUEventSource(icu.ExternalEventSource):
 
-    def __init__(self):
+    def __init__(self, buffer=None, ring_size=None):
+        """
+        Args:
+            buffer (Queue, RingQueue, optional): buffer through which events are sent to ICU. Defaults to None (a 
+                multiprocessing queue, or a ring buffer if ring_size is given).
+            ring_size (int, optional): if given, events are sent through a shared memory ring buffer of this size
+                (see icua.transport) rather than a multiprocessing queue. Defaults to None.
+        """
         super(ICUEventSource, self).__init__()
+        if buffer is None:
+            buffer = multiprocessing.Queue() if ring_size is None else RingQueue(RingBuffer(ring_size), Event)
+        self.buffer = buffer
+        _set_buffer(self, icu.ExternalEventSource, self.buffer)
 
 class ICUProcess(Process): #connection to the ICU environment via an environmental Process
 
-    def __init__(self, *args, **kwargs):
-        self.__icu_sink = ICUEventSink()
-        self.__icu_source = ICUEventSource()
+    def __init__(self, *args, budget=EVENT_BUDGET, time_slice=EVENT_TIME_SLICE, ring_size=None, **kwargs):
+        """
+        Args:
+            budget (int, optional): maximum number of events taken each cycle (None for no maximum). Defaults to EVENT_BUDGET.
+            time_slice (float, optional): maximum time (seconds) spent taking events each cycle (None for no maximum). Defaults to EVENT_TIME_SLICE.
+            ring_size (int, optional): if given, events and actions are exchanged with ICU through shared memory ring buffers
+                of this size (bytes) rather than multiprocessing queues (see icua.transport), e.g. RING_SIZE. Defaults to None.
+            args, kwargs: ICU options (see icu.start).
+        """
+        self.budget = budget
+        self.time_slice = time_slice
+        self.__icu_sink = ICUEventSink(ring_size=ring_size)
+        self.__icu_source = ICUEventSource(ring_size=ring_size)
         self.__icu_process, self.__icu_memory = icu.start(*args, sinks=[self.__icu_sink], sources=[self.__icu_source], **kwargs)
     
     def shared_memory(self):
         return self.__icu_memory
 
     def __call__(self, *args, **kwargs):
-        events = []
         if self.__icu_process.is_alive():
-            while not self.__icu_sink.empty():
-                event = perception(self.__icu_sink.get())
-                events.append(event)
-
-        return events
+            # events are filtered in the ICU process (see subscribe), those emitted before the filter arrived there are not
+            # subscribed to by any agent and are ignored by the router
+            return [perception(event) for event in self.__icu_sink.get_many(self.budget, self.time_slice)]
+        return []
+
+    def subscribe(self, topics):
+        """ Only take the ICU events that match one of the given topics, other events are dropped by ICU.
+
+        Args:
+            topics (iterable(Topic)): topics (see ICURouter.topics).
+        """
+        self.__icu_sink.subscribe(TopicFilter(topics))
+
+    def backlog(self):
+        """
+        Returns:
+            int: (approximate) number of ICU events waiting to be processed.
+        """
+        return self.__icu_sink.backlog()
+
+    def wait(self, timeout=None):
+        """ Block until ICU has emitted an event or the timeout expires. 
+
+        Args:
+            timeout (float, optional): maximum time to wait (seconds). Defaults to None (wait forever).
+
+        Returns:
+            bool: True if there are events waiting to be processed.
+        """
+        if not self.__icu_process.is_alive():
+            return False
+        return self.__icu_sink.wait(timeout)
 
     def sink(self, agent, destination, data): #send an event to the icu system
         #print(data)
@@ -64,17 +266,48 @@ class ICUProcess(Process): #connection to the ICU environment via an environment
 
     def join(self):
         self.__icu_process.join()
+        self.__icu_sink.close() # ring buffers are removed by the process that created them (this one)
+        self.__icu_source.close()
 
     def is_alive(self):
         return self.__icu_process.is_alive()
 
 class ICUEnvironment(Environment):
     
-    def __init__(self, *agents, **kwargs):
-
-        #processes = [ICUProcessStub2()]
-        processes = [ICUProcess(**kwargs)]
+    def __init__(self, *agents, process=None, clock=None, max_rate=MAX_CYCLE_RATE, idle_timeout=CYCLE_DELAY, metrics=None, seed=None, journal=None, **kwargs):
+        """ 
+        Args:
+            agents (callable): agent factories, each is called with (config, window_properties).
+            process (Process, optional): the connection to ICU. Defaults to None, a new ICUProcess is started with kwargs (launches the ICU GUI). 
+                A headless process (see icua.headless) runs without the GUI.
+            clock (Clock, optional): clock that drives the environment and agents. Defaults to the process clock if it has one, otherwise the wall clock.
+            max_rate (float, optional): maximum number of cycles per second. Defaults to MAX_CYCLE_RATE.
+            idle_timeout (float, optional): longest time (seconds) to wait for events before cycling anyway. Defaults to CYCLE_DELAY.
+            metrics (Metrics, optional): where timings and counts for each cycle are recorded (see icua.metrics). Defaults to a new Metrics.
+            seed (int, optional): seed for random behaviour in ICUA (random and numpy.random), a simulator should be given its own seed. Defaults to None.
+            journal (str, optional): path of a journal file, all events and actions are recorded (see icua.journal). Events are then
+                not filtered by the process, to record only the events that agents subscribe to give process=JournalProcess(..., complete=False). 
+                Defaults to None (no journal).
+            kwargs: ICU options (see icu.start).
+        """
+        self.min_cycle_period = 1. / max_rate
+        self.idle_timeout = idle_timeout
+        self.cycle_start = 0
+        self.metrics = Metrics() if metrics is None else metrics
+
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed)
+
+        if process is None:
+            process = ICUProcess(**kwargs)
+        if journal is not None:
+            process = JournalProcess(process, journal, seed=getattr(process, 'seed', seed))
+        processes = [process]
         self.icuprocess = processes[0]
+        if clock is None:
+            clock = getattr(process, 'clock', WALL_CLOCK)
+        self.clock = clock
 
         #print("SHARED MEMORY")
         #pprint(processes[0].shared_memory().window_properties)
@@ -82,47 +315,127 @@ class ICUEnvironment(Environment):
         #pprint(processes[0].shared_memory().event_sources)
         #pprint(processes[0].shared_memory().config)
 
-        config = processes[0].shared_memory().config # the configuration data used when launching ICU
-        window_properties = processes[0].shared_memory().window_properties # the position of each widget in the current window
+        memory = processes[0].shared_memory()
+        config = memory.config # the configuration data used when launching ICU
+        window_properties = memory.window_properties # the position of each widget in the current window
 
         if not isinstance(config, dict):
             config = config.__dict__
 
-        agents = [agent(config, window_properties) for agent in agents]
+        self.scheduler = Scheduler() # grace period deadlines of all agents
+        # component states read by all agents, published by the process if it can (e.g. a headless process), otherwise
+        # updated by the environment once per event
+        self.world = getattr(memory, 'world', None)
+        self.own_world = self.world is None
+        if self.own_world:
+            self.world = WorldState(config, shared=True)
+        with using(self.clock), scheduling(self.scheduler), sharing(self.world): # agents (and their evaluation) use the environment clock
+            agents = [agent(config, window_properties) for agent in agents]
+        # the environment only updates its world state if an agent reads it (e.g. not with only an Evaluator)
+        self.update_world = self.own_world and self.world.readers > 0
+        # agents whose deadlines are not in the scheduler are asked for them (see next_deadline)
+        self.polled = [a for a in agents if not (getattr(a.mind, 'INCREMENTAL', False) and a.mind.scheduler is self.scheduler)]
 
         ambient = ICUAmbient(agents, processes=processes)
         physics = ICUPhysics([ICUAction, InputAction])
 
 
         super(ICUEnvironment, self).__init__(physics, ambient)
+        self.router = ICURouter(agents) # ICU events go only to the sensors that subscribe to them
+        for process in processes: # events that no agent (or the world state) subscribes to are not sent
+            if hasattr(process, 'subscribe'):
+                process.subscribe(self.router.topics() | (self.world.topics() if self.update_world else set()))
         
     def simulate(self, *args, **kwargs):
 
         while self.icuprocess.is_alive():
+            self.cycle_start = self.clock.time()
             self.evolveEnvironment()
-            time.sleep(CYCLE_DELAY)
+            self.wait()
         
         self.icuprocess.join()
+        for a in self.ambient.agents.values():
+            a.mind.terminate()
+        if self.own_world:
+            self.world.close()
+
+    def backlog(self):
+        """ The number of ICU events waiting to be processed, a persistent backlog means that agents are not keeping up 
+            (see ICUProcess budget and time_slice). 
+
+        Returns:
+            int: number of waiting events.
+        """
+        return sum(getattr(process, 'backlog', lambda: 0)() for process in self.ambient.processes.values())
+
+    def next_deadline(self):
+        """ The earliest time at which an agent needs to cycle regardless of new events (e.g. a grace period expires).
+
+        Returns:
+            float: deadline (seconds since epoch), None if no agent has a deadline.
+        """
+        deadlines = [d for d in (a.mind.next_deadline() for a in self.polled) if d is not None]
+        deadline = self.scheduler.next()
+        if deadline is not None:
+            deadlines.append(deadline)
+        if len(deadlines) > 0:
+            return min(deadlines)
+
+    def wait(self):
+        """ Wait until there is something to do, either ICU has emitted events or an agent deadline is due. 
+            Never returns sooner than the minimum cycle period after the start of the current cycle. 
+        """
+        _time = self.clock.time()
+        earliest = self.cycle_start + self.min_cycle_period
+        if earliest > _time: # rate cap
+            self.clock.sleep(earliest - _time)
+            _time = earliest
+
+        timeout = self.idle_timeout
+        deadline = self.next_deadline()
+        if deadline is not None:
+            timeout = min(timeout, deadline - _time)
+
+        if timeout > 0:
+            self.icuprocess.wait(timeout)
 
     # TODO this + ICUProcess needs to be updates to fit with pystarworlds v0.0.4!
     def evolveEnvironment(self): #TODO remove in favour of evolve
+        metrics = self.metrics
+        start_time = time.perf_counter()
+
         #allow all processes to do their thing
-        total_events = 0
-        for process in self.ambient.processes.values():
+        for i, process in self.ambient.processes.items():
+            _time = time.perf_counter()
             events = process(self)
-            total_events += len(events)
-            self.physics.execute(self, events)
+            metrics.time('cycle.drain', time.perf_counter() - _time)
+            metrics.count('events.process.{0}'.format(i), len(events))
+
+            if self.update_world:
+                _time = time.perf_counter()
+                self.world.update(events) # before routing, agents see the state after their perceptions
+                metrics.time('cycle.world', time.perf_counter() - _time)
+            
+            _time = time.perf_counter()
+            self.router.route(events)
+            metrics.time('cycle.route', time.perf_counter() - _time)
 
-        # measure time to execute
-        #start_time = time.time()
-        
         agents = self.ambient.agents.values()
         for a in agents:
+            _time = time.perf_counter()
             a.cycle()
+            name = type(a.mind).__name__
+            metrics.time('cycle.agent.{0}'.format(name), time.perf_counter() - _time)
+            metrics.count('events.agent.{0}'.format(name), a.mind.cycle_percepts)
 
-        #print("Agents took: {0} to process {1} events.".format(time.time() - start_time, total_events))
+        _time = time.perf_counter()
         attempts = [action for agent in agents for actuator in agent.actuators.values() for action in actuator]
         self.physics.execute(self, attempts)
+        metrics.time('cycle.actions', time.perf_counter() - _time)
+        metrics.count('actions', len(attempts))
+
+        metrics.count('backlog', self.backlog())
+        metrics.time('cycle', time.perf_counter() - start_time)
         
     # TODO REMOVE
     def execute_events(self, events): # this should be moved into pystarworlds
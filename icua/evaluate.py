@@ -10,7 +10,31 @@ __email__ = "benrjw@gmail.com"
 __status__ = "Development"
 
 from abc import abstractmethod
-import time
+from collections import namedtuple
+
+from .clock import get_clock
+
+class Score(namedtuple('Score', 'warning_light warning_light0 warning_light1 scale scales tracking fuel highlight')):
+    """ A record of Evaluator scores (see Evaluator for a description of each score), str gives the formatted score report. """
+
+    __slots__ = ()
+
+    def __str__(self):
+        return "\nWarningLight:   {0:0.3f} {1:0.5f} {2:0.5f}".format(self.warning_light, self.warning_light0, self.warning_light1) + \
+               "\nScales:         {0:0.3f} ".format(self.scale) + " ".join(["{0:0.3f}".format(s) for s in self.scales]) + \
+               "\nTracking:       {0:0.3f}".format(self.tracking) + \
+               "\nFuel:           {0:0.3f}".format(self.fuel) + \
+               "\nHighlight:      {0:0.3f}".format(self.highlight)
+
+    def columns(self):
+        """ Flat view of the record for columnar storage, scales are split into scale_0, scale_1, ...
+
+        Returns:
+            dict: {column:value}
+        """
+        columns = self._asdict()
+        columns.update({'scale_{0}'.format(i):s for i, s in enumerate(columns.pop('scales'))})
+        return columns
 
 class Eval:
     
@@ -32,6 +56,8 @@ class CMA:
 
     def __call__(self, x, w=1):
         nc = self._n + w
+        if nc == 0: # no weight yet (e.g. no time has passed)
+            return self.avg
         self._avg = ((self._avg * self._n) + w * x) / nc
         self._n = nc
         return self.avg
@@ -42,38 +68,48 @@ class CMA:
 
 class EvalTime:
 
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = get_clock() if clock is None else clock
         self.t = None
         self.f = False
         self._score = 0
-        self.start_time = time.time()
+        self.start_time = self.clock.time()
 
-    def start(self):
+    def start(self, t=None):
         if not self.f:
-            self.t = time.time()
+            self.t = self.clock.time() if t is None else t
             self.f = True
 
-    def stop(self):
+    def stop(self, t=None):
         if self.f: 
-            self._score += time.time() - self.t
+            self._score += (self.clock.time() if t is None else t) - self.t
             self.f = False
 
     @property
     def score(self):
         if self.f: # currently running so add to score
-            return self._score + time.time() - self.t
+            return self._score + self.clock.time() - self.t
         return self._score
 
+    @property
+    def proportion(self):
+        """ Proportion of the time since creation that the timer has been running, 0 if no time has passed. """
+        elapsed = self.clock.time() - self.start_time
+        if elapsed <= 0:
+            return 0.
+        return self.score / elapsed
+
 class EvalScale:
 
-    def __init__(self, x, c=5):
+    def __init__(self, x, c=5, clock=None):
+        self.clock = get_clock() if clock is None else clock
         self.c = c
         self.cma = CMA()
-        self.t = time.time()
+        self.t = self.clock.time()
         self.px = x
         
-    def __call__(self, x):
-        t = time.time()
+    def __call__(self, x, t=None):
+        t = self.clock.time() if t is None else t
         d = abs(self.px - self.c)
         self.cma(d, t - self.t) #time weighted average
         #print(d, t - self.t)
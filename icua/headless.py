@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 18-10-2026 11:03:52
+
+    Headless (no GUI) ICU processes. A headless process produces ICU events itself and is driven by a clock,
+    with a VirtualClock a full session runs as fast as the CPU allows in simulated time. The state of its components
+    is published in a shared world state (see icua.world) that is updated with every event, including the events that
+    no agent subscribes to.
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from types import SimpleNamespace
+import copy
+import heapq
+import itertools
+import json
+
+from pystarworlds.environment import Process
+
+from .perception import new_perception
+from .routing import TopicFilter
+from .clock import VirtualClock
+from .world import WorldState
+
+# the position of each widget in the window when ICU runs at its default screen size (800x700), there is no window in headless mode.
+WINDOW_PROPERTIES = {'fuel': {'FuelTank:A': {'position': (341.6666666666667, 424.0),
+                         'size': (91.66666666666666, 100.0)},
+          'FuelTank:B': {'position': (616.6666666666615, 424.0),
+                         'size': (91.66666666666666, 100.0)},
+          'FuelTank:C': {'position': (295.83333333333337, 576.0),
+                         'size': (45.83333333333333, 100.0)},
+          'FuelTank:D': {'position': (570.8333333333385, 576.0),
+                         'size': (45.83333333333333, 100.0)},
+          'FuelTank:E': {'position': (424.16666666666663, 576.0),
+                         'size': (64.16666666666666, 100.0)},
+          'FuelTank:F': {'position': (699.1666666666646, 576.0),
+                         'size': (64.16666666666666, 100.0)},
+          'Pump:AB': {'position': (512.1093749999973, 446.08333333333337),
+                      'size': (25.78125, 22.5)},
+          'Pump:BA': {'position': (512.1093749999973, 479.41666666666674),
+                      'size': (25.78125, 22.5)},
+          'Pump:CA': {'position': (305.859375, 538.75),
+                      'size': (25.78125, 22.5)},
+          'Pump:DB': {'position': (580.859375, 538.75),
+                      'size': (25.78125, 22.5)},
+          'Pump:EA': {'position': (443.359375, 538.75),
+                      'size': (25.78125, 22.5)},
+          'Pump:EC': {'position': (370.02604166666663, 614.75),
+                      'size': (25.78125, 22.5)},
+          'Pump:FB': {'position': (718.359375, 538.75),
+                      'size': (25.78125, 22.5)},
+          'Pump:FD': {'position': (645.0260416666708, 614.75),
+                      'size': (25.78125, 22.5)},
+          'position': (250.0, 400.0),
+          'size': (550.0, 300.0)},
+ 'system': {'Scale:0': {'position': (12.5, 121.24999999999999),
+                         'size': (32.142857142857146, 236.25)},
+             'Scale:1': {'position': (76.78571428571428, 121.24999999999999),
+                         'size': (32.142857142857146, 236.25)},
+             'Scale:2': {'position': (141.0714285714286, 121.24999999999999),
+                         'size': (32.142857142857146, 236.25)},
+             'Scale:3': {'position': (205.3571428571429, 121.24999999999999),
+                         'size': (32.142857142857146, 236.25)},
+             'WarningLight:0': {'position': (12.5, 42.5),
+                                'size': (75.0, 47.25)},
+             'WarningLight:1': {'position': (162.50000000000003, 42.5),
+                                'size': (75.0, 47.25)},
+             'position': (0.0, 25.0),
+             'size': (250.0, 350.0)},
+ 'track': {'position': (350.0, 25.0), 'size': (350.0, 350.0)},
+ 'window': {'position': (0, 0), 'size': (800, 700)}}
+
+# task panels (these can be highlighted as a whole, e.g. Highlight:SystemMonitor)
+WINDOW_PROPERTIES.update({'SystemMonitor': {k:WINDOW_PROPERTIES['system'][k] for k in ('position', 'size')},
+                          'FuelMonitor': {k:WINDOW_PROPERTIES['fuel'][k] for k in ('position', 'size')},
+                          'TrackMonitor': {k:WINDOW_PROPERTIES['track'][k] for k in ('position', 'size')}})
+
+# ICU defaults for each component (used to fill in options missing from a config file)
+DEFAULT_CONFIG = {'FuelTank:A': {'accept_position': 0.5, 'accept_proportion': 0.3, 'burn_rate': 6, 'capacity': 2000, 'fuel': 1000},
+                  'FuelTank:B': {'accept_position': 0.5, 'accept_proportion': 0.3, 'burn_rate': 6, 'capacity': 2000, 'fuel': 1000},
+                  'FuelTank:C': {'capacity': 1000, 'fuel': 100},
+                  'FuelTank:D': {'capacity': 1000, 'fuel': 100},
+                  'FuelTank:E': {'capacity': 1000, 'fuel': 1000},
+                  'FuelTank:F': {'capacity': 1000, 'fuel': 1000},
+                  'Pump:AB': {'event_rate': 10, 'flow_rate': 100, 'state': 1},
+                  'Pump:BA': {'event_rate': 10, 'flow_rate': 100, 'state': 1},
+                  'Pump:CA': {'event_rate': 10, 'flow_rate': 100, 'state': 1},
+                  'Pump:DB': {'event_rate': 10, 'flow_rate': 100, 'state': 1},
+                  'Pump:EA': {'event_rate': 10, 'flow_rate': 100, 'state': 1},
+                  'Pump:EC': {'event_rate': 10, 'flow_rate': 100, 'state': 1},
+                  'Pump:FB': {'event_rate': 10, 'flow_rate': 100, 'state': 1},
+                  'Pump:FD': {'event_rate': 10, 'flow_rate': 100, 'state': 1},
+                  'Scale:0': {'key': '<F1>', 'position': 5, 'size': 11},
+                  'Scale:1': {'key': '<F2>', 'position': 5, 'size': 11},
+                  'Scale:2': {'key': '<F3>', 'position': 5, 'size': 11},
+                  'Scale:3': {'key': '<F4>', 'position': 5, 'size': 11},
+                  'Target:0': {'invert': True, 'step': 1},
+                  'WarningLight:0': {'grace': 2, 'key': '<F5>', 'state': 1},
+                  'WarningLight:1': {'grace': 2, 'key': '<F6>', 'state': 0},
+                  'task': {'fuel': True, 'system': True, 'track': True}}
+
+def load_config(path=None):
+    """ Load an ICU config file (JSON) and fill in any missing component options with ICU defaults.
+
+    Args:
+        path (str, optional): path to the config file. Defaults to None (the default config).
+
+    Returns:
+        dict: config.
+    """
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    if path is not None:
+        with open(path) as f:
+            for k, v in json.load(f).items():
+                if isinstance(v, dict) and isinstance(config.get(k, None), dict):
+                    config[k].update(v)
+                else:
+                    config[k] = v
+    return config
+
+class HeadlessProcess(Process):
+    """
+        An ICU process that runs without the ICU GUI. Subclasses produce events by scheduling timers (see timer)
+        which emit events (see emit) when they are due. The process shuts down after config['shutdown'] milliseconds
+        (if given) of clock time.
+    """
+
+    def __init__(self, config=None, clock=None, window_properties=WINDOW_PROPERTIES):
+        """
+        Args:
+            config (str, dict, optional): ICU config or path to an ICU config file. Defaults to None (the default config).
+            clock (Clock, optional): clock that drives the process. Defaults to a new VirtualClock.
+            window_properties (dict, optional): widget positions reported to agents. Defaults to WINDOW_PROPERTIES.
+        """
+        if not isinstance(config, dict):
+            config = load_config(config)
+        self.config = config
+        self.window_properties = window_properties
+        self.clock = VirtualClock() if clock is None else clock
+        self.start_time = self.clock.time()
+
+        self.shutdown = None
+        if config.get('shutdown', None) is not None:
+            self.shutdown = self.start_time + config['shutdown'] / 1000
+
+        self.__timers = [] # heap of (time, n, callback)
+        self.__events = [] # events emitted but not yet collected
+        self.__count = itertools.count()
+        self.__filter = None # only events accepted by the filter are emitted (see subscribe)
+        self.world = WorldState(config, shared=True) # the state of the components, written by this process only
+
+    def timer(self, t, callback):
+        """ Schedule a callback at time t, the callback is given the time t when it is due and may emit events or schedule new timers.
+
+        Args:
+            t (float): time (clock time) at which to call the callback.
+            callback (callable): callback(t).
+        """
+        heapq.heappush(self.__timers, (t, next(self.__count), callback))
+
+    def emit(self, t, src, dst, **data):
+        """ Emit an ICU event.
+
+        Args:
+            t (float): timestamp of the event.
+            src (str): source of the event (ICU component id).
+            dst (str): destination of the event (ICU component id).
+            data: event data, must include a label.
+        """
+        n = next(self.__count)
+        self.world.apply(t, src, data)
+        if self.__filter is None or self.__filter.accept(src, dst, data['label']):
+            self.__events.append(new_perception(t, "{0:012d}".format(n), src, dst, SimpleNamespace(**data)))
+
+    def subscribe(self, topics):
+        """ Only emit the events that match one of the given topics, other events are dropped before a perception is created.
+
+        Args:
+            topics (iterable(Topic)): topics (see ICURouter.topics).
+        """
+        self.__filter = TopicFilter(topics)
+
+    def update(self, t):
+        """ Run all timers that are due at time t.
+
+        Args:
+            t (float): time.
+        """
+        timers = self.__timers
+        while len(timers) > 0 and timers[0][0] <= t:
+            _t, _, callback = heapq.heappop(timers)
+            callback(_t)
+
+    def next_time(self):
+        """
+        Returns:
+            float: time of the next timer, None if there are no timers.
+        """
+        if len(self.__timers) > 0:
+            return self.__timers[0][0]
+
+    def __call__(self, *args, **kwargs):
+        self.update(self.clock.time())
+        events, self.__events = self.__events, []
+        return events
+
+    def wait(self, timeout=None):
+        """ Let time pass until the next timer is due or the timeout expires.
+
+        Args:
+            timeout (float, optional): maximum time to wait (seconds). Defaults to None (wait for the next timer or shutdown).
+
+        Returns:
+            bool: True if there are events waiting to be processed.
+        """
+        if len(self.__events) > 0:
+            return True
+        _time = self.clock.time()
+        t = self.next_time()
+        if timeout is not None:
+            t = _time + timeout if t is None else min(t, _time + timeout)
+        if self.shutdown is not None:
+            t = self.shutdown if t is None else min(t, self.shutdown)
+        if t is None: # nothing will ever happen
+            return False
+        self.clock.sleep(t - _time)
+        return self.next_time() is not None and self.next_time() <= self.clock.time()
+
+    def backlog(self):
+        """
+        Returns:
+            int: number of events emitted but not yet processed.
+        """
+        return len(self.__events)
+
+    def sink(self, agent, destination, data): # an agent acted
+        self.on_action(self.clock.time(), agent, destination, data)
+
+    def on_action(self, t, agent, destination, data):
+        """ Called when an agent sends an event to ICU, subclasses may override this to enact changes.
+
+        Args:
+            t (float): time of the action.
+            agent (str): the agent that sent the event.
+            destination (str): ICU component the event was sent to.
+            data (dict): event data.
+        """
+        pass
+
+    def is_alive(self):
+        return self.shutdown is None or self.clock.time() < self.shutdown
+
+    def join(self):
+        self.world.close()
+
+    def shared_memory(self):
+        return SimpleNamespace(config=self.config, window_properties=self.window_properties, world=self.world)
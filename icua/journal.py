@@ -0,0 +1,403 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 19-10-2026 09:14:27
+
+    Session journals. A journal records every event that ICU emitted and every action that agents sent to ICU (with
+    timestamps), along with the session seed, ICU config and window properties. A journal can be replayed (see ReplayProcess)
+    through an ICUEnvironment without ICU, so that new agents (monitors, evaluators) can be run against identical stimuli
+    in simulated time.
+
+    A journal is a JSON lines file, the first record is the session header, then events and actions in the order they occurred:
+        {"kind": "session", "seed": 0, "start": 1603637264.1, "config": {...}, "window_properties": {...}}
+        {"kind": "event", "t": 1603637264.2, "name": "...", "src": "Scale:0", "dst": "Global", "data": {"label": "change", "value": 4}}
+        {"kind": "action", "t": 1603637264.3, "src": "<agent id>", "dst": "Highlight:Scale:0", "data": {"label": "highlight", "value": true}}
+        {"kind": "end", "t": 1603637324.1}
+
+    For long (eyetracker heavy) sessions there is a compact binary format (see BinaryJournal), a directory that holds
+    fixed-width records that can be read with numpy.memmap (see open_binary). Journal paths that end with .jsonl are
+    written as JSON lines, any other path is written in the binary format.
+
+    Example:
+        env = ICUEnvironment(SystemMonitor, Evaluator, process=ICUSimulator(config, seed=0), journal="session.jsonl")
+        env.simulate()
+
+        env = ICUEnvironment(NewSystemMonitor, Evaluator, process=ReplayProcess("session.jsonl"))
+        env.simulate()
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from types import SimpleNamespace
+import json
+import os
+
+import numpy as np
+
+from pystarworlds.environment import Process
+
+from .headless import HeadlessProcess
+from .clock import VirtualClock, WALL_CLOCK
+
+class Journal:
+    """ Writes a session journal (see module documentation). """
+
+    def __init__(self, path, seed=None, start=None, config=None, window_properties=None, complete=True):
+        """
+        Args:
+            path (str): path of the journal file (overwritten if it exists).
+            seed (int, optional): session seed. Defaults to None.
+            start (float, optional): start time of the session. Defaults to None.
+            config (dict, optional): ICU config. Defaults to None.
+            window_properties (dict, optional): ICU window properties. Defaults to None.
+            complete (bool, optional): are all events recorded (False if only those subscribed to, see JournalProcess). Defaults to True.
+        """
+        self.path = path
+        self.file = open(path, 'w')
+        self.write(dict(kind='session', seed=seed, start=start, config=config, window_properties=window_properties, complete=complete))
+
+    def write(self, record):
+        self.file.write(json.dumps(record, default=_default))
+        self.file.write('\n')
+
+    def events(self, events):
+        """ Record events emitted by ICU.
+
+        Args:
+            events (list(ICUPerception)): events (as perceptions).
+        """
+        for event in events:
+            self.write(dict(kind='event', t=event.timestamp, name=event.name, src=event.src, dst=event.dst, data=event.data.__dict__))
+
+    def action(self, t, agent, destination, data):
+        """ Record an action sent to ICU.
+
+        Args:
+            t (float): time of the action.
+            agent (str): the agent that sent the action.
+            destination (str): ICU component the action was sent to.
+            data (dict): action data.
+        """
+        self.write(dict(kind='action', t=t, src=agent, dst=destination, data=data))
+
+    def close(self, t=None):
+        if not self.file.closed:
+            self.write(dict(kind='end', t=t))
+            self.file.close()
+
+# binary journal record, string fields are ids in the string table, data fields other than label/x/y/value are in the payload table
+# x/y/value are stored as float64, types holds the original type of each (2 bits each, see TYPES) so that it can be restored
+RECORD = np.dtype([('t', '<f8'), ('kind', 'u1'), ('src', '<u2'), ('dst', '<u2'), ('label', '<u2'),
+                   ('x', '<f8'), ('y', '<f8'), ('value', '<f8'), ('types', 'u1'), ('payload', '<i8'), ('payload_size', '<u4')])
+
+KINDS = SimpleNamespace(event=0, action=1)
+
+FIELDS = ('x', 'y', 'value') # data fields that are stored in the record
+TYPES = (float, int, bool) # the type of a record field, index is the 2 bit type code
+
+_NUMERIC = (int, float, bool, np.number)
+
+def _type(v):
+    if isinstance(v, (bool, np.bool_)):
+        return 2
+    if isinstance(v, (int, np.integer)):
+        return 1
+    return 0
+
+class BinaryJournal:
+    """ Writes a binary session journal, a directory that contains:
+            header.json  - the session header (see Journal) and end time (once closed)
+            records.bin  - fixed-width records (see RECORD), one per event/action in the order they occurred
+            strings.txt  - string table, component ids, agent ids and labels (the line number is the id)
+            payload.bin  - variable payloads (JSON), event data that does not fit in a record (most events have none)
+        Records are buffered and appended in blocks, so recording costs little more than building a tuple per event.
+        Event names are not recorded (events are ordered).
+    """
+
+    def __init__(self, path, seed=None, start=None, config=None, window_properties=None, complete=True, buffer_size=4096):
+        """
+        Args:
+            path (str): directory of the journal (created if it does not exist, existing journal files are overwritten).
+            seed (int, optional): session seed. Defaults to None.
+            start (float, optional): start time of the session. Defaults to None.
+            config (dict, optional): ICU config. Defaults to None.
+            window_properties (dict, optional): ICU window properties. Defaults to None.
+            complete (bool, optional): are all events recorded (False if only those subscribed to, see JournalProcess). Defaults to True.
+            buffer_size (int, optional): number of records buffered before they are written. Defaults to 4096.
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.header = dict(seed=seed, start=start, end=None, config=config, window_properties=window_properties, complete=complete)
+        self._write_header()
+        self.records = open(os.path.join(path, 'records.bin'), 'wb')
+        self.strings = open(os.path.join(path, 'strings.txt'), 'w')
+        self.payloads = open(os.path.join(path, 'payload.bin'), 'wb')
+        self.string_ids = {}
+        self.payload_offset = 0
+        self.buffer = []
+        self.buffer_size = buffer_size
+
+    def _write_header(self):
+        with open(os.path.join(self.path, 'header.json'), 'w') as f:
+            json.dump(self.header, f, default=_default)
+
+    def intern(self, string):
+        """ The id of a string in the string table (the string is added if it is new).
+
+        Args:
+            string (str): string.
+
+        Returns:
+            int: id.
+        """
+        i = self.string_ids.get(string, None)
+        if i is None:
+            i = self.string_ids[string] = len(self.string_ids)
+            self.strings.write(string.replace('\n', ' ') + '\n')
+        return i
+
+    def record(self, t, kind, src, dst, data):
+        intern = self.intern
+        x = y = value = np.nan
+        types = 0
+        rest = None
+        for k, v in data.items():
+            if k == 'label':
+                continue
+            if k == 'x' and isinstance(v, _NUMERIC):
+                x = v
+                types |= _type(v)
+            elif k == 'y' and isinstance(v, _NUMERIC):
+                y = v
+                types |= _type(v) << 2
+            elif k == 'value' and isinstance(v, _NUMERIC):
+                value = v
+                types |= _type(v) << 4
+            else:
+                if rest is None:
+                    rest = {}
+                rest[k] = v
+        payload, size = -1, 0
+        if rest is not None:
+            payload = json.dumps(rest, default=_default).encode('utf-8')
+            self.payloads.write(payload)
+            payload, size = self.payload_offset, len(payload)
+            self.payload_offset += size
+        self.buffer.append((t, kind, intern(src), intern(dst), intern(data.get('label', '')), x, y, value, types, payload, size))
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def events(self, events):
+        for event in events:
+            self.record(event.timestamp, KINDS.event, event.src, event.dst, event.data.__dict__)
+
+    def action(self, t, agent, destination, data):
+        self.record(t, KINDS.action, agent, destination, data)
+
+    def flush(self):
+        if len(self.buffer) > 0:
+            self.records.write(np.array(self.buffer, dtype=RECORD).tobytes())
+            self.buffer = []
+        self.records.flush()
+        self.strings.flush()
+        self.payloads.flush()
+
+    def close(self, t=None):
+        if not self.records.closed:
+            self.flush()
+            for f in (self.records, self.strings, self.payloads):
+                f.close()
+            self.header['end'] = t
+            self._write_header()
+
+def open_binary(path):
+    """ Open a binary journal for analysis, records are memory mapped (not read into memory).
+
+    Args:
+        path (str): directory of the journal.
+
+    Returns:
+        SimpleNamespace: header (dict), records (np.memmap of RECORD), strings (np.ndarray of str, indexed by id), 
+            payload (callable, the payload of a record as a dict).
+    """
+    with open(os.path.join(path, 'header.json')) as f:
+        header = json.load(f)
+    with open(os.path.join(path, 'strings.txt')) as f:
+        strings = np.array(f.read().split('\n')[:-1], dtype=str)
+    file = os.path.join(path, 'records.bin')
+    if os.path.getsize(file) > 0:
+        records = np.memmap(file, dtype=RECORD, mode='r')
+    else:
+        records = np.zeros(0, dtype=RECORD)
+    payloads = os.path.join(path, 'payload.bin')
+
+    def payload(record):
+        if record['payload'] < 0:
+            return {}
+        with open(payloads, 'rb') as f:
+            f.seek(int(record['payload']))
+            return json.loads(f.read(int(record['payload_size'])).decode('utf-8'))
+
+    return SimpleNamespace(header=header, records=records, strings=strings, payload=payload)
+
+def _load_binary(path):
+    journal = open_binary(path)
+    strings, payloads = journal.strings, os.path.join(path, 'payload.bin')
+    events, actions = [], []
+    with open(payloads, 'rb') as f:
+        for i, r in enumerate(journal.records):
+            data = dict(label=str(strings[r['label']]))
+            types = int(r['types'])
+            for j, k in enumerate(FIELDS):
+                if not np.isnan(r[k]):
+                    data[k] = TYPES[(types >> (2 * j)) & 3](r[k])
+            if r['payload'] >= 0:
+                f.seek(int(r['payload']))
+                data.update(json.loads(f.read(int(r['payload_size'])).decode('utf-8')))
+            src, dst = str(strings[r['src']]), str(strings[r['dst']])
+            if r['kind'] == KINDS.event:
+                events.append(SimpleNamespace(timestamp=float(r['t']), name="{0:012d}".format(i), src=src, dst=dst, data=SimpleNamespace(**data)))
+            else:
+                actions.append(SimpleNamespace(timestamp=float(r['t']), src=src, dst=dst, data=data))
+    header = journal.header
+    end = header.pop('end')
+    return SimpleNamespace(header=dict(header), events=events, actions=actions, end=end)
+
+def new_journal(path, **kwargs):
+    """ Create a journal, JSON lines if the path ends with .jsonl, otherwise binary (see BinaryJournal).
+
+    Args:
+        path (str): path of the journal.
+        kwargs: session header (see Journal).
+
+    Returns:
+        Journal, BinaryJournal: journal.
+    """
+    if path.endswith('.jsonl'):
+        return Journal(path, **kwargs)
+    return BinaryJournal(path, **kwargs)
+
+def _default(o):
+    if isinstance(o, SimpleNamespace):
+        return o.__dict__
+    return str(o)
+
+def load(path):
+    """ Load a session journal (either format).
+
+    Args:
+        path (str): path of the journal file (or directory of a binary journal).
+
+    Returns:
+        SimpleNamespace: header (dict), events (list(SimpleNamespace)), actions (list(SimpleNamespace)) and end (float, None if the session did not end cleanly).
+    """
+    if os.path.isdir(path):
+        return _load_binary(path)
+    header, events, actions, end = None, [], [], None
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            kind = record.pop('kind')
+            if kind == 'event':
+                events.append(SimpleNamespace(timestamp=record['t'], name=record['name'], src=record['src'], dst=record['dst'], data=SimpleNamespace(**record['data'])))
+            elif kind == 'action':
+                actions.append(SimpleNamespace(timestamp=record['t'], src=record['src'], dst=record['dst'], data=record['data']))
+            elif kind == 'session':
+                header = record
+            elif kind == 'end':
+                end = record['t']
+    return SimpleNamespace(header=header, events=events, actions=actions, end=end)
+
+class JournalProcess(Process):
+    """ Wraps an ICU process (e.g. ICUProcess, ICUSimulator) and records its events and the actions sent to it in a journal. 
+        
+        A complete journal (the default) records every event, so that the session can be replayed with agents that subscribe
+        to other events. The wrapped process is then not told what the agents subscribe to (see ICUProcess.subscribe) and 
+        emits every event, which costs more with high event rates (e.g. an eyetracker). An incomplete journal keeps event
+        filtering on and only records the events that the agents of the session subscribe to.
+    """
+
+    def __init__(self, process, path, seed=None, complete=True):
+        """
+        Args:
+            process (Process): the process to record.
+            path (str): path of the journal (see new_journal).
+            seed (int, optional): session seed to record. Defaults to None.
+            complete (bool, optional): record every event (event filtering is off), otherwise only the events that are subscribed to. Defaults to True.
+        """
+        self.process = process
+        self.complete = complete
+        self.clock = getattr(process, 'clock', WALL_CLOCK)
+        memory = process.shared_memory()
+        config = memory.config if isinstance(memory.config, dict) else memory.config.__dict__
+        self.journal = new_journal(path, seed=seed, start=self.clock.time(), config=config, window_properties=memory.window_properties, complete=complete)
+
+    def __call__(self, *args, **kwargs):
+        events = self.process(*args, **kwargs)
+        self.journal.events(events)
+        return events
+
+    def sink(self, agent, destination, data):
+        self.journal.action(self.clock.time(), agent, destination, data)
+        self.process.sink(agent, destination, data)
+
+    def join(self):
+        self.process.join()
+        self.journal.close(self.clock.time())
+
+    def subscribe(self, topics):
+        """ Only take the events that match one of the given topics, if the journal is not complete (otherwise every event is recorded).
+
+        Args:
+            topics (iterable(Topic)): topics (see ICURouter.topics).
+        """
+        if not self.complete and hasattr(self.process, 'subscribe'):
+            self.process.subscribe(topics)
+
+    def __getattr__(self, name): # everything else (wait, is_alive, backlog, shared_memory, ...) is the wrapped process
+        return getattr(self.__dict__['process'], name)
+
+class ReplayProcess(HeadlessProcess):
+    """ Replays the events of a session journal in simulated time, agent actions have no effect on the events.
+        The actions that agents send are collected (see actions) so that they can be compared with the recorded actions.
+    """
+
+    def __init__(self, journal, clock=None):
+        """
+        Args:
+            journal (str, SimpleNamespace): path of the journal (or a loaded journal, see load).
+            clock (Clock, optional): clock that drives the process. Defaults to a new VirtualClock set to the start of the session.
+        """
+        if isinstance(journal, str):
+            journal = load(journal)
+        self.journal = journal
+        header = journal.header
+        start = header['start'] if header['start'] is not None else (journal.events[0].timestamp if len(journal.events) > 0 else 0.)
+
+        config = dict(header['config'])
+        end = journal.end if journal.end is not None else (journal.events[-1].timestamp if len(journal.events) > 0 else start)
+        config['shutdown'] = (end - start) * 1000
+
+        clock = VirtualClock(start=start) if clock is None else clock
+        super(ReplayProcess, self).__init__(config=config, clock=clock, window_properties=header['window_properties'])
+        self.seed = header['seed']
+        self.actions = [] # actions sent by agents during the replay
+
+        self.next_event = 0
+        if len(journal.events) > 0:
+            self.timer(journal.events[0].timestamp, self.replay)
+
+    def replay(self, t):
+        events = self.journal.events
+        i = self.next_event
+        while i < len(events) and events[i].timestamp <= t:
+            event = events[i]
+            self.emit(event.timestamp, event.src, event.dst, **event.data.__dict__)
+            i += 1
+        self.next_event = i
+        if i < len(events):
+            self.timer(events[i].timestamp, self.replay)
+
+    def on_action(self, t, agent, destination, data):
+        self.actions.append(SimpleNamespace(timestamp=t, src=agent, dst=destination, data=data))
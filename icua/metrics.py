@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 18-10-2026 19:12:05
+
+    Run time metrics for the environment cycle. Timings (seconds) and counts are recorded in histograms with fixed
+    exponential buckets, recording a value costs a few comparisons and no allocation. Metrics can be scraped during
+    a run (see Metrics.snapshot) or dumped at the end (see Metrics.dump).
+
+    Names used by ICUEnvironment:
+        cycle            - time taken by a full cycle (excluding waiting)
+        cycle.drain      - time spent taking events from the processes
+        cycle.world      - time spent updating the shared world state (see icua.world), unless the process publishes it
+        cycle.route      - time spent routing events to agent sensors
+        cycle.agent.X    - time spent in the cycle of agent X (by mind type, e.g. cycle.agent.ICUSystemMind)
+        cycle.actions    - time spent executing agent actions
+        events.process.N - events taken from process N each cycle
+        events.agent.X   - perceptions handled by agent X each cycle
+        actions          - actions attempted each cycle
+        backlog          - events waiting to be processed at the end of each cycle
+        deadline.agent.X - cycles of agent X that missed their deadline (AsyncICUEnvironment only)
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+import bisect
+import json
+import sys
+
+TIME_BUCKETS = tuple(1e-6 * 2 ** i for i in range(24)) # 1us - ~8s
+COUNT_BUCKETS = (0,) + tuple(2 ** i for i in range(20)) # 0 - ~500k
+
+class Histogram:
+    """ A histogram of observed values with fixed bucket upper bounds (the last bucket is unbounded). """
+
+    def __init__(self, buckets=TIME_BUCKETS):
+        """
+        Args:
+            buckets (tuple, optional): sorted upper bounds of the buckets. Defaults to TIME_BUCKETS.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def observe(self, x):
+        self.counts[bisect.bisect_left(self.buckets, x)] += 1
+        self.count += 1
+        self.total += x
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    @property
+    def mean(self):
+        if self.count == 0:
+            return float('nan')
+        return self.total / self.count
+
+    def quantile(self, q):
+        """ Approximate quantile, the upper bound of the bucket that contains it (clipped to the observed range).
+
+        Args:
+            q (float): quantile [0-1].
+
+        Returns:
+            float: quantile, nan if nothing has been observed.
+        """
+        if self.count == 0:
+            return float('nan')
+        n, rank = 0, q * self.count
+        for i, c in enumerate(self.counts):
+            n += c
+            if n >= rank and c > 0:
+                return min(max(self.buckets[i] if i < len(self.buckets) else self.max, self.min), self.max)
+        return self.max
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: summary statistics (count, total, mean, min, max, p50, p90, p99).
+        """
+        if self.count == 0:
+            return dict(count=0, total=0)
+        return dict(count=self.count, total=self.total, mean=self.mean, min=self.min, max=self.max,
+                    p50=self.quantile(0.5), p90=self.quantile(0.9), p99=self.quantile(0.99))
+
+class Metrics:
+    """ A collection of named histograms. """
+
+    def __init__(self):
+        self.histograms = {}
+
+    def histogram(self, name, buckets=TIME_BUCKETS):
+        """ Get a histogram by name, a new histogram is created if it does not exist.
+
+        Args:
+            name (str): name of the histogram.
+            buckets (tuple, optional): bucket upper bounds for a new histogram. Defaults to TIME_BUCKETS.
+
+        Returns:
+            Histogram: histogram.
+        """
+        histogram = self.histograms.get(name, None)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram(buckets)
+        return histogram
+
+    def time(self, name, t):
+        self.histogram(name, TIME_BUCKETS).observe(t)
+
+    def count(self, name, n):
+        self.histogram(name, COUNT_BUCKETS).observe(n)
+
+    def reset(self):
+        self.histograms = {}
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: {name:summary} for each histogram (see Histogram.snapshot).
+        """
+        return {name:h.snapshot() for name, h in sorted(list(self.histograms.items()))}
+
+    def dump(self, file=None):
+        """ Write a summary of all metrics, as JSON if a path is given, otherwise as a table.
+
+        Args:
+            file (str, optional): path of a JSON file. Defaults to None (print to stdout).
+        """
+        snapshot = self.snapshot()
+        if file is not None:
+            with open(file, 'w') as f:
+                json.dump(snapshot, f, indent=2)
+            return
+        print("{0:<32} {1:>8} {2:>12} {3:>12} {4:>12} {5:>12}".format("metric", "count", "mean", "p50", "p99", "max"))
+        for name, s in snapshot.items():
+            if s['count'] > 0:
+                print("{0:<32} {1:>8} {2:>12.6g} {3:>12.6g} {4:>12.6g} {5:>12.6g}".format(name, s['count'], s['mean'], s['p50'], s['p99'], s['max']))
+        sys.stdout.flush()
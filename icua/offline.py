@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 19-10-2026 11:48:30
+
+    Offline (vectorised) evaluation of recorded sessions. The events of a session journal (see icua.journal) are loaded
+    as arrays and scored with interval arithmetic in NumPy, giving the same scores as the online Evaluator
+    (see icua.agent.evaluator) up to floating point error. Both are timed by event timestamps.
+
+    Example:
+        score_journal("experiment4/journals/experiment4-000000.jsonl") # Score
+        score_journals(glob.glob("experiment4/journals/*")) # [Score]
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+import numpy as np
+
+from .evaluate import Score
+from .perception import perception_type
+from . import journal as _journal
+
+TARGET_PROPORTION = 1/6 # size of the target relative to the tracking widget (see Evaluator)
+TRACKING_ACCEPTABLE_PROPORTION = 1/4 # size of the acceptable tracking region relative to the tracking widget (see Evaluator)
+
+EVALUATED_GROUPS = ('WarningLight', 'Scale', 'Target', 'FuelTank', 'Highlight') # the groups that the Evaluator subscribes to
+
+def columns(path):
+    """ The events of a session journal (either format) as arrays.
+
+    Args:
+        path (str): path of the journal.
+
+    Returns:
+        tuple: (header, end, columns) where columns is a dict of arrays (one entry per event, in order):
+            t, src, dst, label (str), x, y, value, acceptable (float, nan if missing).
+    """
+    if os.path.isdir(path): # binary, only the (few) fuel events need their payload
+        j = _journal.open_binary(path)
+        records = j.records[j.records['kind'] == _journal.KINDS.event]
+        strings = j.strings
+        label = strings[records['label']] if len(records) > 0 else np.zeros(0, dtype=str)
+        acceptable = np.full(len(records), np.nan)
+        for i in np.nonzero(label == 'fuel')[0]:
+            acceptable[i] = float(j.payload(records[i]).get('acceptable', np.nan))
+        header = dict(j.header)
+        end = header.pop('end')
+        cols = dict(t=np.asarray(records['t'], dtype=np.float64), src=strings[records['src']] if len(records) > 0 else label,
+                    dst=strings[records['dst']] if len(records) > 0 else label, label=label,
+                    x=np.asarray(records['x'], dtype=np.float64), y=np.asarray(records['y'], dtype=np.float64),
+                    value=np.asarray(records['value'], dtype=np.float64), acceptable=acceptable)
+        return header, end, cols
+
+    j = _journal.load(path)
+    get = lambda e, k: float(getattr(e.data, k)) if isinstance(getattr(e.data, k, None), (int, float, bool)) else np.nan
+    events = j.events
+    cols = dict(t=np.array([e.timestamp for e in events], dtype=np.float64),
+                src=np.array([e.src for e in events], dtype=str), dst=np.array([e.dst for e in events], dtype=str),
+                label=np.array([e.data.label for e in events], dtype=str),
+                x=np.array([get(e, 'x') for e in events], dtype=np.float64), y=np.array([get(e, 'y') for e in events], dtype=np.float64),
+                value=np.array([get(e, 'value') for e in events], dtype=np.float64),
+                acceptable=np.array([get(e, 'acceptable') for e in events], dtype=np.float64))
+    return j.header, j.end, cols
+
+def _groups(src, dst):
+    # the group of each event (as used to route it), resolved once for each unique (src, dst) pair
+    pairs, inverse = np.unique(np.stack([src, dst]), axis=1, return_inverse=True)
+    groups = []
+    for s, d in pairs.T:
+        _type = perception_type(str(s)) or perception_type(str(d))
+        groups.append(_type.group if _type is not None else '')
+    return np.array(groups, dtype=str)[inverse.reshape(-1)]
+
+def _time_in_state(t, state, end):
+    """ Total time spent in state (True), the state changes to state[i] at time t[i] and is False before t[0].
+        Timing starts on the first event in a run of True and stops on the first False (as EvalTime).
+    """
+    if len(t) == 0:
+        return 0.
+    state = np.asarray(state, dtype=bool)
+    previous = np.concatenate([[False], state[:-1]])
+    starts = t[state & ~previous]
+    stops = t[~state & previous]
+    if len(stops) < len(starts): # still running at the end
+        stops = np.concatenate([stops, [end]])
+    return float(np.sum(stops - starts))
+
+def _proportion(score, start, end):
+    elapsed = end - start
+    return score / elapsed if elapsed > 0 else 0.
+
+def score(cols, start, end, config, window_properties):
+    """ Evaluator scores of a session.
+
+    Args:
+        cols (dict): events as arrays (see columns).
+        start (float): start time of the session.
+        end (float): end time of the session.
+        config (dict): ICU config of the session.
+        window_properties (dict): ICU window properties of the session.
+
+    Returns:
+        Score: scores.
+    """
+    t, src, label = cols['t'], cols['src'], cols['label']
+    group = _groups(src, cols['dst'])
+
+    # WARNING LIGHTS - time spent in a bad state (0 is bad for WarningLight:0, 1 is bad for WarningLight:1)
+    change = (label == 'change')
+    m = change & (group == 'WarningLight') & (src == 'WarningLight:0')
+    warning_light0 = _time_in_state(t[m], cols['value'][m] == 0, end)
+    m = change & (group == 'WarningLight') & (src == 'WarningLight:1')
+    warning_light1 = _time_in_state(t[m], cols['value'][m] != 0, end)
+    warning_light = (_proportion(warning_light0, start, end) + _proportion(warning_light1, start, end)) / 2
+
+    # SCALES - time weighted average distance from the center, over the intervals between changes (as EvalScale)
+    scales = []
+    for scale in sorted(k for k in window_properties['system'].keys() if "Scale" in k):
+        m = change & (group == 'Scale') & (src == scale)
+        c = config[scale]['size'] // 2
+        positions = np.concatenate([[config[scale]['position']], cols['value'][m][:-1]]) # position during each interval
+        w = np.diff(np.concatenate([[start], t[m]]))
+        total = np.sum(w)
+        scales.append(float(np.sum(w * np.abs(positions - c)) / total) if total != 0 else 0.)
+    scale = sum(scales) / len(scales) if len(scales) > 0 else float('nan')
+
+    # TRACKING - average distance of the target from the acceptable region (over move events)
+    m = (label == 'move') & (group == 'Target') & ~np.isnan(cols['x'])
+    size = np.array(window_properties['track']['size'], dtype=np.float64)
+    w, h = TRACKING_ACCEPTABLE_PROPORTION * size
+    d = np.maximum(np.maximum(np.abs(cols['x'][m]) - w / 2, 0), np.maximum(np.abs(cols['y'][m]) - h / 2, 0))
+    denom = max(size * (1 - (TARGET_PROPORTION + TRACKING_ACCEPTABLE_PROPORTION)))
+    tracking = 2 * (float(np.mean(d)) if len(d) > 0 else 0.) / denom
+
+    # FUEL - time spent with an unacceptable amount of fuel in each of the main tanks
+    fuel = (label == 'fuel') & (group == 'FuelTank')
+    tanks = []
+    for tank in ("FuelTank:A", "FuelTank:B"):
+        m = fuel & (src == tank)
+        tanks.append(_proportion(_time_in_state(t[m], cols['acceptable'][m] == 0, end), start, end))
+    fuel = sum(tanks) / len(tanks)
+
+    # HIGHLIGHT - time spent with anything highlighted
+    m = (label == 'highlight') & (group == 'Highlight')
+    highlight = _proportion(_time_in_state(t[m], _highlighted(src[m], cols['value'][m] != 0), end), start, end)
+
+    return Score(warning_light=warning_light, warning_light0=warning_light0, warning_light1=warning_light1, scale=scale,
+                 scales=tuple(scales), tracking=tracking, fuel=fuel, highlight=highlight)
+
+def _highlighted(src, value):
+    # is anything highlighted after each event, the number highlighted changes by (value - previous value of the same src)
+    if len(src) == 0:
+        return np.zeros(0, dtype=bool)
+    value = value.astype(np.int64)
+    order = np.lexsort((np.arange(len(src)), src))
+    v = value[order]
+    previous = np.concatenate([[0], v[:-1]])
+    previous[np.concatenate([[True], src[order][1:] != src[order][:-1]])] = 0 # first event of each src
+    delta = np.empty_like(value)
+    delta[order] = v - previous
+    return np.cumsum(delta) > 0
+
+def score_journal(path):
+    """ Evaluator scores of a recorded session.
+
+    Args:
+        path (str): path of the journal (either format, see icua.journal).
+
+    Returns:
+        Score: scores.
+    """
+    header, end, cols = columns(path)
+    if end is None: # the session did not end cleanly
+        end = float(cols['t'][-1]) if len(cols['t']) > 0 else header['start']
+    return score(cols, header['start'], end, header['config'], header['window_properties'])
+
+def score_journals(paths, processes=None):
+    """ Evaluator scores of many recorded sessions (in parallel).
+
+    Args:
+        paths (list(str)): paths of the journals.
+        processes (int, optional): number of worker processes. Defaults to None (the number of CPUs).
+
+    Returns:
+        list(Score): scores (in the same order as paths).
+    """
+    paths = list(paths)
+    if len(paths) <= 1:
+        return [score_journal(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(score_journal, paths, chunksize=max(1, len(paths) // (4 * (processes or os.cpu_count())))))
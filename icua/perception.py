@@ -9,15 +9,58 @@ __author__ = "Benedict Wilkins"
 __email__ = "benrjw@gmail.com"
 __status__ = "Development"
 
+from collections import namedtuple
+
 from icu.event import Event
 from pystarworlds.event import Perception
 
+class Topic(namedtuple('Topic', 'group src label')):
+    """ A subscription to ICU events, e.g. Topic('Scale', label='change'). None matches anything.
+            group - component group (see ICU_PERCEPTION_GROUPS)
+            src - source of the event (e.g. Scale:0)
+            label - label of the event (e.g. change)
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, group=None, src=None, label=None):
+        return super(Topic, cls).__new__(cls, group, src, label)
+
+    def matches(self, group, src, label):
+        return (self.group is None or self.group == group) and \
+               (self.src is None or self.src == src) and \
+               (self.label is None or self.label == label)
+
 class ICUPerception(Perception):
-    """ Perception class for ICU agents, wraps an ICU event. """
+    """ Perception class for ICU agents, wraps an ICU event. Perceptions are created for every ICU event (hundreds per second 
+        with an eyetracker), attributes are kept in slots rather than an instance dict. 
+    """
+
+    __slots__ = ('timestamp', 'name', 'src', 'dst', 'data')
+
+    group = None # the component group that this type of perception corresponds to
 
     def __init__(self, event):
         self.timestamp, self.name, self.src, self.dst, self.data =  event.timestamp, event.name, event.src, event.dst, event.data
 
+    @classmethod
+    def new(cls, timestamp, name, src, dst, data):
+        """ Create a perception directly from event fields (no intermediate ICU event is needed).
+
+        Args:
+            timestamp (float): time of the event.
+            name (str): unique name of the event.
+            src (str): source of the event (ICU component id).
+            dst (str): destination of the event (ICU component id).
+            data (SimpleNamespace): event data, must include a label.
+
+        Returns:
+            ICUPerception: perception.
+        """
+        percept = cls.__new__(cls)
+        percept.timestamp, percept.name, percept.src, percept.dst, percept.data = timestamp, name, src, dst, data
+        return percept
+
     def __str__(self):
         return "{0}:{1} - ({2}->{3}): {4}".format(self.name, self.timestamp, self.src, self.dst, self.data.__dict__)
     
@@ -26,45 +69,47 @@ class ICUPerception(Perception):
 
 class EyeTrackerPerception(ICUPerception):
     """ Perception corresponding to an ICU eyetracker event. """
-    pass
+    __slots__ = ()
+    group = 'Overlay'
 
 class WarningLightPerception(ICUPerception):
     """ Perception corresponding to an ICU warning light event. """
-    pass
+    __slots__ = ()
+    group = 'WarningLight'
 
 class FuelTankPerception(ICUPerception):
     """ Perception corresponding to an ICU fuel tank event. """
-    pass
+    __slots__ = ()
+    group = 'FuelTank'
 
 class PumpPerception(ICUPerception):
     """ Perception corresponding to an ICU pump event. """
-    pass
+    __slots__ = ()
+    group = 'Pump'
 
 class ScalePerception(ICUPerception):
     """ Perception corresponding to an ICU scale event. """
-    pass
+    __slots__ = ()
+    group = 'Scale'
 
 class TrackPerception(ICUPerception):
     """ Perception corresponding to an ICU track event. """
-    pass
+    __slots__ = ()
+    group = 'Target'
 
 class HighlightPerception(ICUPerception):
     """ Perception corresponding to an ICU highlight event. """
-    pass
+    __slots__ = ()
+    group = 'Highlight'
 
 class SystemPerception(ICUPerception):
     """ Perception for icu system event. """
-    pass 
+    __slots__ = ()
+    group = 'System'
 
 # used to convert ICU event to the appropriate perception type for use in publish/subscribe
-ICU_PERCEPTION_GROUPS = {'WarningLight':WarningLightPerception, 
-                         'FuelTank':FuelTankPerception,
-                         'Pump':PumpPerception,
-                         'Scale':ScalePerception,
-                         'Overlay':EyeTrackerPerception,
-                         'Target':TrackPerception,
-                         'Highlight':HighlightPerception,
-                         'System':SystemPerception}
+ICU_PERCEPTION_GROUPS = {p.group:p for p in [WarningLightPerception, FuelTankPerception, PumpPerception, ScalePerception, 
+                                             EyeTrackerPerception, TrackPerception, HighlightPerception, SystemPerception]}
                          
 def perception(event):
     """
@@ -87,16 +132,53 @@ def perception(event):
         print(event)
     """
 
-    group = event.src.split(":")[0]
-    if group in ICU_PERCEPTION_GROUPS:
-        return ICU_PERCEPTION_GROUPS[group](event)
+    return new_perception(event.timestamp, event.name, event.src, event.dst, event.data)
+
+# known ICU component ids, resolved when the module is loaded (other ids are resolved when first seen)
+ICU_COMPONENTS = ['WarningLight:0', 'WarningLight:1', 'Scale:0', 'Scale:1', 'Scale:2', 'Scale:3', 'Target:0', 'Overlay:0',
+                  'FuelTank:A', 'FuelTank:B', 'FuelTank:C', 'FuelTank:D', 'FuelTank:E', 'FuelTank:F', 
+                  'Pump:AB', 'Pump:BA', 'Pump:CA', 'Pump:DB', 'Pump:EA', 'Pump:EC', 'Pump:FB', 'Pump:FD',
+                  'Highlight:SystemMonitor', 'Highlight:FuelMonitor', 'Highlight:TrackMonitor']
+
+_PERCEPTION_TYPES = {} # component id -> perception type (None if the id does not belong to a group)
+
+def perception_type(component):
+    """ The perception type of an ICU component (given by its group), results are cached for each component id.
+
+    Args:
+        component (str): ICU component id (e.g. Scale:0).
+
+    Returns:
+        type: perception type, None if the component does not belong to a group (e.g. an event generator).
+    """
+    try:
+        return _PERCEPTION_TYPES[component]
+    except KeyError:
+        _type = ICU_PERCEPTION_GROUPS.get(component.split(":")[0], None)
+        _PERCEPTION_TYPES[component] = _type
+        return _type
+
+for _component in ICU_COMPONENTS:
+    perception_type(_component)
 
-    group = event.dst.split(":")[0]
-    if group in ICU_PERCEPTION_GROUPS:
-        return ICU_PERCEPTION_GROUPS[group](event)
+def new_perception(timestamp, name, src, dst, data):
+    """
+    Generate a new perception given the fields of an ICU event, the perception type is given by the group of the source (or destination).
 
-    raise ValueError("Failed to find perception group for event:\n    {0}\n    avaliable groups are: {1}".format(event, list(ICU_PERCEPTION_GROUPS.keys())))
+    Args:
+        timestamp (float): time of the event.
+        name (str): unique name of the event.
+        src (str): source of the event (ICU component id).
+        dst (str): destination of the event (ICU component id).
+        data (SimpleNamespace): event data, must include a label.
 
+    Returns:
+        ICUPerception : a perception
+    """
+    _type = _PERCEPTION_TYPES.get(src, None) or perception_type(src) or perception_type(dst)
+    if _type is None:
+        raise ValueError("Failed to find perception group for event:\n    {0}->{1}: {2}\n    avaliable groups are: {3}".format(src, dst, data, list(ICU_PERCEPTION_GROUPS.keys())))
+    return _type.new(timestamp, name, src, dst, data)
 
 def filter_print(event, src, dst, label):
     result = True
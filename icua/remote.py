@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 19-10-2026 16:58:34
+
+    Agents hosted in worker processes. A remote agent runs its body (mind, sensors, actuators) in its own process, the
+    environment holds a proxy (RemoteAgent) that looks like any other agent: its sensors are notified of perceptions,
+    it is cycled and its actuators hold actions. Perceptions and actions are sent between the processes over shared
+    memory ring buffers (see icua.ringbuffer). A cycle of a remote agent only sends its perceptions to the worker and
+    collects any actions the worker has produced so far, so a heavy mind does not lengthen the environment cycle, its
+    actions arrive in a later cycle. If the worker falls behind, its queued cycles are merged into one.
+
+    Remote agents follow the environment clock, a worker with a virtual clock is advanced to the environment time
+    that is sent with each cycle. A worker attaches to the environment's world state if it is shared (see icua.world),
+    agents read the current component states without them being sent.
+
+    Example:
+        env = ICUEnvironment(FuelMonitor, SystemMonitor, TrackMonitor, remote(GazePredictionUser), Evaluator)
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+import multiprocessing
+import pickle
+import time
+
+from .ringbuffer import RingBuffer
+from .perception import ICU_PERCEPTION_GROUPS
+from .routing import topics, edges
+from .clock import VirtualClock, get_clock, using
+from .world import get_world, sharing
+
+RING_SIZE = 1 << 22 # bytes, size of each ring buffer (perceptions to the worker, actions from the worker)
+START_TIMEOUT = 60 # seconds, time allowed for a worker to create its agent
+JOIN_TIMEOUT = 10 # seconds, time allowed for a worker to terminate its agent
+
+def remote(factory, ring_size=RING_SIZE):
+    """ Host the agents created by a factory in worker processes.
+
+    Args:
+        factory (callable): agent factory (e.g. FuelMonitor), called with (config, window_properties) in the worker.
+        ring_size (int, optional): size (bytes) of each ring buffer. Defaults to RING_SIZE.
+
+    Returns:
+        callable: agent factory that creates a RemoteAgent.
+    """
+    def _remote(config, window_properties):
+        return RemoteAgent(factory, config, window_properties, ring_size=ring_size)
+    return _remote
+
+class RemoteSensor:
+    """ Proxy of a sensor in a worker process, perceptions are buffered until the agent cycles. """
+
+    def __init__(self, ID, subscribe, topics, edges, agent):
+        self.ID = ID
+        self.subscribe = subscribe
+        self.topics = topics
+        self.edges = edges
+        self.agent = agent
+
+    def notify(self, percept):
+        self.agent.perceptions.append((self.ID, percept))
+
+class RemoteActuator:
+    """ Proxy of the actuators in a worker process, holds the actions received from the worker. """
+
+    def __init__(self, agent):
+        self.agent = agent
+
+    def __iter__(self):
+        self.agent.receive()
+        actions, self.agent.actions = self.agent.actions, []
+        return iter(actions)
+
+class RemoteMind:
+    """ Proxy of a mind in a worker process (the proxy type takes the name of the mind type). """
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.cycle_percepts = 0 # number of perceptions sent in the last cycle
+
+    def next_deadline(self):
+        return self.agent.next_deadline
+
+    def terminate(self):
+        self.agent.terminate()
+
+class RemoteAgent:
+    """ Proxy of an agent that runs in a worker process. """
+
+    def __init__(self, factory, config, window_properties, ring_size=RING_SIZE):
+        """
+        Args:
+            factory (callable): agent factory, called with (config, window_properties) in the worker.
+            config (dict): ICU config.
+            window_properties (dict): ICU window properties.
+            ring_size (int, optional): size (bytes) of each ring buffer. Defaults to RING_SIZE.
+        """
+        self.clock = get_clock()
+        world = get_world()
+        world = world if world is not None and world.shared else None
+        if world is not None: # the agent may read it in the worker
+            world.readers += 1
+        self.inbox = RingBuffer(ring_size) # to the worker
+        self.outbox = RingBuffer(ring_size) # from the worker
+        self.wake = multiprocessing.Semaphore(0)
+        self.process = multiprocessing.Process(target=_worker, args=(factory, config, window_properties, self.inbox, self.outbox,
+                                                                     self.wake, self.clock.virtual, self.clock.time(), world), daemon=True)
+        self.process.start()
+
+        self.perceptions = [] # (sensor id, perception) waiting to be sent
+        self.actions = []
+        self.next_deadline = None
+        self.terminated = False
+
+        message = self._wait('ready', START_TIMEOUT)
+        _, self.ID, name, sensors = message
+        self.mind = type(name, (RemoteMind,), {})(self)
+        self.sensors = {ID:RemoteSensor(ID, tuple(ICU_PERCEPTION_GROUPS[g] for g in groups), _topics, _edges, self) for ID, groups, _topics, _edges in sensors}
+        self.actuators = {'remote':RemoteActuator(self)}
+
+    def send(self, message):
+        data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+        while not self.inbox.put(data): # the worker is behind, wait for space
+            if not self.process.is_alive():
+                raise RuntimeError("Remote agent {0} has stopped.".format(self.ID))
+            time.sleep(0.0005)
+        self.wake.release()
+
+    def receive(self):
+        """ Take all messages from the worker (without waiting). """
+        data = self.outbox.get()
+        while data is not None:
+            self._handle(pickle.loads(data))
+            data = self.outbox.get()
+
+    def _handle(self, message):
+        if message[0] == 'actions':
+            _, actions, deadline = message
+            self.actions.extend(actions)
+            self.next_deadline = deadline
+        return message
+
+    def _wait(self, kind, timeout):
+        end = time.time() + timeout
+        while time.time() < end:
+            data = self.outbox.get()
+            if data is not None:
+                message = self._handle(pickle.loads(data))
+                if message[0] == kind:
+                    return message
+            elif not self.process.is_alive():
+                break
+            else:
+                time.sleep(0.001)
+        raise RuntimeError("Remote agent did not respond ({0}).".format(kind))
+
+    def cycle(self):
+        perceptions, self.perceptions = self.perceptions, []
+        self.mind.cycle_percepts = len(perceptions)
+        self.send(('cycle', self.clock.time(), perceptions))
+
+    def perceive(self):
+        perceptions, self.perceptions = self.perceptions, []
+        result = {}
+        for ID, percept in perceptions:
+            result.setdefault(ID, []).append(percept)
+        return result
+
+    def terminate(self):
+        if self.terminated:
+            return
+        self.terminated = True
+        try:
+            self.send(('terminate', self.clock.time(), []))
+            self._wait('terminated', JOIN_TIMEOUT)
+        finally:
+            self.process.join(JOIN_TIMEOUT)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.inbox.close()
+            self.outbox.close()
+
+def _worker(factory, config, window_properties, inbox, outbox, wake, virtual, start, world):
+    clock = VirtualClock(start) if virtual else get_clock()
+    with using(clock), sharing(world): # without a shared world state, the mind keeps its own
+        body = factory(config, window_properties)
+    sensors = [(ID, [p.group for p in sensor.subscribe], topics(sensor), edges(sensor)) for ID, sensor in body.sensors.items()]
+    _send(outbox, ('ready', body.ID, type(body.mind).__name__, sensors))
+
+    while True:
+        wake.acquire()
+        cycle, terminate, t = False, False, None
+        data = inbox.get()
+        while data is not None: # take everything that is waiting, queued cycles are merged
+            kind, t, perceptions = pickle.loads(data)
+            for ID, percept in perceptions:
+                body.sensors[ID].notify(percept)
+            cycle = cycle or kind == 'cycle'
+            terminate = terminate or kind == 'terminate'
+            data = inbox.get()
+        if virtual and t is not None:
+            clock.advance(t)
+        if cycle:
+            body.cycle()
+            actions = [action for actuator in body.actuators.values() for action in actuator]
+            deadline = body.mind.next_deadline()
+            _send(outbox, ('actions', actions, deadline))
+        if terminate:
+            body.mind.terminate()
+            _send(outbox, ('terminated',))
+            inbox.close()
+            outbox.close()
+            return
+
+def _send(ring, message):
+    data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    while not ring.put(data):
+        time.sleep(0.0005)
+
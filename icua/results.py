@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 18-10-2026 16:02:18
+
+    Columnar storage for experiment results. A result store is a directory of NumPy .npz parts, each part holds a batch
+    of result records (see icua.runner) as one array per column. Appending writes a new part, loading concatenates all
+    parts so that thousands of runs can be analysed with vectorised operations.
+
+    Example:
+        with ResultStore("experiment4/results") as store:
+            run(grid, callback=store.append)
+
+        results = load("experiment4/results")
+        results['fuel'][(results['delay'] == 0.5) & (results['config'] == 'hard')].mean()
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+import glob
+import os
+
+import numpy as np
+
+PART_FORMAT = "part-{0:06d}.npz"
+
+_NUMERIC = (int, float, bool, np.number)
+
+class ResultStore:
+    """ Append-only columnar store of result records (dicts of scalar values). """
+
+    def __init__(self, path, batch_size=64, exclude=('result',)):
+        """
+        Args:
+            path (str): directory of the store (created if it does not exist).
+            batch_size (int, optional): number of records buffered before a new part is written. Defaults to 64.
+            exclude (tuple, optional): record keys that are not stored. Defaults to ('result',) (the formatted score report).
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.exclude = set(exclude)
+        self.buffer = []
+        os.makedirs(path, exist_ok=True)
+        self.__part = len(glob.glob(os.path.join(path, PART_FORMAT.replace("{0:06d}", "*"))))
+
+    def append(self, record):
+        """ Add a record to the store, the record is written when the buffer is full or the store is flushed.
+
+        Args:
+            record (dict): record to add.
+        """
+        self.buffer.append({k:v for k,v in record.items() if k not in self.exclude})
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def flush(self):
+        """ Write all buffered records to a new part. """
+        if len(self.buffer) == 0:
+            return
+        keys = sorted(set(k for record in self.buffer for k in record.keys()))
+        columns = {k:_column([record.get(k, None) for record in self.buffer]) for k in keys}
+        np.savez(os.path.join(self.path, PART_FORMAT.format(self.__part)), **columns)
+        self.__part += 1
+        self.buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.flush()
+
+def _column(values): # numeric if every value is a number (or None), otherwise str
+    if all(isinstance(v, _NUMERIC) or v is None for v in values):
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    return np.array(['' if v is None else str(v) for v in values], dtype=str)
+
+def _strings(array):
+    if array.dtype.kind == 'U':
+        return array
+    return np.array(['' if np.isnan(v) else str(v) for v in array.tolist()], dtype=str)
+
+def load(path):
+    """ Load all records in a store. Columns that are missing from some parts are filled with nan (numeric) or '' (str).
+        A column that holds anything other than numbers (in any part) is a str column, numbers are converted with str 
+        and missing values are ''.
+
+    Args:
+        path (str): directory of the store.
+
+    Returns:
+        dict: {column:np.ndarray}, one entry per record in each column.
+    """
+    parts = []
+    for file in sorted(glob.glob(os.path.join(path, PART_FORMAT.replace("{0:06d}", "*")))):
+        with np.load(file) as part:
+            parts.append({k:part[k] for k in part.files})
+    keys = sorted(set(k for part in parts for k in part.keys()))
+    columns = {}
+    for k in keys:
+        strings = any(p[k].dtype.kind == 'U' for p in parts if k in p)
+        arrays = []
+        for part in parts:
+            n = len(next(iter(part.values())))
+            if k in part:
+                arrays.append(_strings(part[k]) if strings else part[k])
+            else:
+                arrays.append(np.full(n, '' if strings else np.nan, dtype=str if strings else np.float64))
+        columns[k] = np.concatenate(arrays) if len(arrays) > 0 else np.array([])
+    return columns
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 19-10-2026 16:22:10
+
+    Single producer, single consumer ring buffer of byte messages in shared memory (multiprocessing.shared_memory). One
+    process puts messages, another gets them, there are no locks. The producer only writes the tail counter and the
+    consumer only writes the head counter, messages are length prefixed and may wrap around the end of the buffer. Each
+    counter is read and written with a single aligned 8 byte access, so the other process never sees a partly written
+    counter (struct.pack_into clears the target bytes before writing them).
+
+    Example:
+        ring = RingBuffer(size=1 << 20) # producer
+        ring.put(b"hello")
+
+        ring = RingBuffer(name=name, size=1 << 20, create=False) # consumer (another process)
+        ring.get() # b"hello"
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from multiprocessing import shared_memory
+import os
+import struct
+
+HEADER_SIZE = 16 # head (uint64), tail (uint64)
+LENGTH_SIZE = 4 # length prefix of each message (uint32)
+
+_LENGTH = struct.Struct('<I')
+
+class RingBuffer:
+
+    def __init__(self, size=1 << 20, name=None, create=True):
+        """
+        Args:
+            size (int, optional): capacity in bytes (each message takes its length + 4 bytes). Defaults to 1MB.
+            name (str, optional): name of the shared memory block, required to attach to an existing buffer. Defaults to None.
+            create (bool, optional): create a new buffer (True) or attach to an existing one (False). Defaults to True.
+        """
+        self.size = size
+        self.owner = os.getpid() if create else None # only the creating process removes the buffer (also if forked)
+        # attaching registers the block with the resource tracker again, worker processes share the tracker of the
+        # process that created them so the block is still only removed once (by close in the creating process)
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=HEADER_SIZE + size)
+        self.buffer = self.shm.buf
+        self.counters = self.buffer[:HEADER_SIZE].cast('Q') # head, tail
+        if create:
+            self.counters[0] = self.counters[1] = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def __reduce__(self): # other processes attach to the same block
+        return (RingBuffer, (self.size, self.name, False))
+
+    def _head(self):
+        return self.counters[0]
+
+    def _tail(self):
+        return self.counters[1]
+
+    def _write(self, position, data):
+        i = position % self.size
+        n = min(len(data), self.size - i)
+        self.buffer[HEADER_SIZE + i:HEADER_SIZE + i + n] = data[:n]
+        if n < len(data): # wrap around
+            self.buffer[HEADER_SIZE:HEADER_SIZE + len(data) - n] = data[n:]
+
+    def _read(self, position, length):
+        i = position % self.size
+        n = min(length, self.size - i)
+        data = bytes(self.buffer[HEADER_SIZE + i:HEADER_SIZE + i + n])
+        if n < length: # wrap around
+            data += bytes(self.buffer[HEADER_SIZE:HEADER_SIZE + length - n])
+        return data
+
+    def free(self):
+        """
+        Returns:
+            int: number of free bytes.
+        """
+        return self.size - (self._tail() - self._head())
+
+    def empty(self):
+        return self._head() == self._tail()
+
+    def put(self, data):
+        """ Put a message (producer only).
+
+        Args:
+            data (bytes): message.
+
+        Returns:
+            bool: True if the message was added, False if there is not enough space (try again later).
+        """
+        frame = LENGTH_SIZE + len(data)
+        if frame > self.size:
+            raise ValueError("Message of {0} bytes does not fit in a ring buffer of {1} bytes.".format(len(data), self.size))
+        tail = self._tail()
+        if frame > self.size - (tail - self._head()):
+            return False
+        self._write(tail, _LENGTH.pack(len(data)))
+        self._write(tail + LENGTH_SIZE, data)
+        self.counters[1] = tail + frame # publish the message
+        return True
+
+    def get(self):
+        """ Get the oldest message (consumer only).
+
+        Returns:
+            bytes: message, None if the buffer is empty.
+        """
+        head = self._head()
+        if head == self._tail():
+            return None
+        length = _LENGTH.unpack(self._read(head, LENGTH_SIZE))[0]
+        data = self._read(head + LENGTH_SIZE, length)
+        self.counters[0] = head + LENGTH_SIZE + length # release the space
+        return data
+
+    def close(self):
+        """ Detach from the buffer, the buffer is removed once the process that created it closes it. """
+        self.counters.release() # views of the block must be released before it is closed
+        self.counters, self.buffer = None, None
+        self.shm.close()
+        if self.owner == os.getpid():
+            self.shm.unlink()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 18-10-2026 17:10:36
+
+    Topic based routing of ICU perceptions to agent sensors. Sensors subscribe to topics (component group, source, label),
+    the router keeps an index from each (group, src, label) key that it has seen to the sensors that subscribe to it, 
+    so an agent only receives the events it handles and routing costs a single dictionary lookup per event.
+
+    The union of all subscriptions (ICURouter.topics) is given to the ICU process as a filter (TopicFilter), events that
+    no agent subscribes to are dropped where they are produced (see ICUProcess.subscribe, HeadlessProcess.subscribe).
+
+    A sensor may attach an edge to a topic (see icua.edges), events of the topic are then only forwarded to the sensor
+    when the value of the edge changes, each edge is evaluated once per event for all of its subscribers.
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from .perception import Topic, perception_type
+
+def topics(sensor):
+    """ The topics that a sensor subscribes to, sensors that do not declare topics (see icua.agent.agent.new_icu_sensor) 
+        receive all events of the perception types they subscribe to.
+
+    Args:
+        sensor (Sensor): sensor.
+
+    Returns:
+        tuple(Topic): topics.
+    """
+    _topics = getattr(sensor, 'topics', None)
+    if _topics is None:
+        _topics = tuple(Topic(p.group) for p in sensor.subscribe if getattr(p, 'group', None) is not None)
+    return _topics
+
+def edges(sensor):
+    """ The edges that a sensor attaches to its topics (see icua.edges), set by ICUBody from ICUMind.edges.
+
+    Args:
+        sensor (Sensor): sensor.
+
+    Returns:
+        dict: {Topic:Edge}.
+    """
+    return getattr(sensor, 'edges', None) or {}
+
+class TopicFilter:
+    """ Accepts the ICU events that match one of a set of topics, the result is cached for each (src, dst, label). 
+        Filters are sent to the ICU process, they only hold topics (and can be pickled).
+    """
+
+    def __init__(self, topics):
+        """
+        Args:
+            topics (iterable(Topic)): topics to accept.
+        """
+        self.topics = tuple(set(topics))
+        self.cache = {} # (src, dst, label) -> bool
+
+    def accept(self, src, dst, label):
+        """ Does an event match one of the topics? Events that do not belong to a group are accepted (they are rejected 
+            when converted to a perception, see icua.perception.perception).
+
+        Returns:
+            bool: True if the event should be kept.
+        """
+        key = (src, dst, label)
+        result = self.cache.get(key, None)
+        if result is None:
+            _type = perception_type(src) or perception_type(dst)
+            result = _type is None or any(t.matches(_type.group, src, label) for t in self.topics)
+            self.cache[key] = result
+        return result
+
+class ICURouter:
+
+    def __init__(self, agents):
+        """
+        Args:
+            agents (list(Body)): agents whose sensors will receive perceptions.
+        """
+        self.subscriptions = [(sensor, topics(sensor), edges(sensor)) for agent in agents for sensor in agent.sensors.values()]
+        self.index = {} # (group, src, label) -> (sensors, ((edge, sensors), ...)), filled as new keys arrive (there are only a few dozen)
+        self.values = {} # (edge, src) -> value of the edge for the last event from src
+
+    def topics(self):
+        """ The union of the topics of all sensors.
+
+        Returns:
+            set(Topic): topics.
+        """
+        return {t for _, _topics, _ in self.subscriptions for t in _topics}
+
+    def subscribers(self, group, src, label):
+        """ All sensors that subscribe to events with the given group, src and label (including edge triggered subscriptions).
+
+        Returns:
+            tuple(Sensor): sensors.
+        """
+        sensors, edges = self._entry((group, src, label))
+        return sensors + tuple(sensor for _, _sensors in edges for sensor in _sensors)
+
+    def _entry(self, key):
+        entry = self.index.get(key, None)
+        if entry is None:
+            sensors, edges = [], {}
+            for sensor, _topics, _edges in self.subscriptions:
+                matched = [t for t in _topics if t.matches(*key)]
+                if len(matched) == 0:
+                    continue
+                edge = [_edges[t] for t in matched if t in _edges]
+                if len(edge) < len(matched): # a topic without an edge, every event is forwarded
+                    sensors.append(sensor)
+                else:
+                    edges.setdefault(edge[0], []).append(sensor)
+            entry = (tuple(sensors), tuple((edge, tuple(_sensors)) for edge, _sensors in edges.items()))
+            self.index[key] = entry
+        return entry
+
+    def route(self, perceptions, notified=None):
+        """ Notify each subscribing sensor of each perception.
+
+        Args:
+            perceptions (list(ICUPerception)): perceptions to route.
+            notified (dict, optional): if given, the number of perceptions given to each sensor is added to it ({sensor:count}). Defaults to None.
+        """
+        index, values = self.index, self.values
+        for percept in perceptions:
+            key = (percept.group, percept.src, percept.data.label)
+            entry = index.get(key, None)
+            if entry is None:
+                entry = self._entry(key)
+            sensors, edges = entry
+            for edge, _sensors in edges: # edge triggered, forward only if the value has changed
+                value, _key = edge(percept), (edge, percept.src)
+                if _key in values and values[_key] == value:
+                    continue
+                values[_key] = value
+                sensors = sensors + _sensors
+            for sensor in sensors:
+                sensor.notify(percept)
+            if notified is not None:
+                for sensor in sensors:
+                    notified[sensor] = notified.get(sensor, 0) + 1
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 18-10-2026 15:20:44
+
+    Run experiments (many ICU sessions) in parallel. An experiment is described by a Grid (agents, user model and
+    its parameters, config files, repetitions and a seed), each point in the grid is a Session that runs in its own
+    worker process. The Evaluator results of all sessions are collected into a single list of records (which may be
+    written to a columnar store, see icua.results).
+
+    Example:
+        grid = Grid(['FuelMonitor', 'SystemMonitor', 'TrackMonitor'], user='FixedUser',
+                    user_params=dict(fix=['fuel'], delay=[0, 0.5, 1.]),
+                    configs=dict(med='config/med-config.json', hard='config/hard-config.json'),
+                    repetitions=10, seed=0, experiment='experiment4')
+        results = run(grid)
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import contextlib
+import itertools
+import io
+import os
+
+from . import agent
+from .agent import users
+
+# agents that can be used in a grid (by name)
+AGENTS = dict(FuelMonitor=agent.FuelMonitor, SystemMonitor=agent.SystemMonitor, TrackMonitor=agent.TrackMonitor,
+              Evaluator=agent.Evaluator, User=users.User, PerfectUser=users.PerfectUser, DelayedUser=users.DelayedUser,
+              FixatedUser=users.FixatedUser, FixedUser=users.FixedUser)
+
+BACKENDS = ('simulator', 'icu')
+JOURNAL_FORMATS = dict(jsonl='.jsonl', binary='') # journal path suffix of each format, binary journals are directories (see icua.journal.new_journal)
+
+Session = namedtuple('Session', 'experiment index run seed config_name config agents user user_params backend journal')
+
+class Grid:
+    """ A declarative description of an experiment, the sessions are the product of configs x user parameters x repetitions. """
+
+    def __init__(self, agents, user=None, user_params=None, configs=None, repetitions=1, seed=0, experiment='experiment', backend='simulator', journal=None, journal_format='jsonl'):
+        """
+        Args:
+            agents (list(str)): names of the agents (see AGENTS) to use in every session. An Evaluator is always added.
+            user (str, optional): name of the user model (see AGENTS). Defaults to None (no user).
+            user_params (dict, optional): user model parameters, each maps to a list of values to try (e.g. dict(delay=[0, 0.5])). Defaults to None.
+            configs (dict, list, optional): ICU config files, {name:path} or [path]. Defaults to None (the default ICU config).
+            repetitions (int, optional): number of runs for each point in the grid. Defaults to 1.
+            seed (int, optional): base seed, each session is seeded with seed + session index. Defaults to 0.
+            experiment (str, optional): name of the experiment. Defaults to 'experiment'.
+            backend (str, optional): 'simulator' (icua.simulator, no GUI) or 'icu' (the ICU GUI). Defaults to 'simulator'.
+            journal (str, optional): directory in which a journal of each session is written (see icua.journal). Defaults to None (no journals).
+            journal_format (str, optional): 'jsonl' (JSON lines) or 'binary' (see icua.journal.BinaryJournal). Defaults to 'jsonl'.
+        """
+        if backend not in BACKENDS:
+            raise ValueError("Unknown backend: {0}, avaliable backends are: {1}".format(backend, BACKENDS))
+        if journal_format not in JOURNAL_FORMATS:
+            raise ValueError("Unknown journal format: {0}, avaliable formats are: {1}".format(journal_format, tuple(JOURNAL_FORMATS.keys())))
+        for name in itertools.chain(agents, [user] if user is not None else []):
+            if name not in AGENTS:
+                raise ValueError("Unknown agent: {0}, avaliable agents are: {1}".format(name, list(AGENTS.keys())))
+
+        self.agents = tuple(a for a in agents if a != 'Evaluator')
+        self.user = user
+        self.user_params = dict() if user_params is None else dict(user_params)
+        if configs is None:
+            configs = {None:None}
+        elif not isinstance(configs, dict):
+            configs = {path:path for path in configs}
+        self.configs = {k:(os.path.abspath(v) if v is not None else None) for k,v in configs.items()}
+        self.repetitions = repetitions
+        self.seed = seed
+        self.experiment = experiment
+        self.backend = backend
+        self.journal = os.path.abspath(journal) if journal is not None else None
+        self.journal_format = journal_format
+
+    def sessions(self):
+        """
+        Returns:
+            list(Session): all sessions in the grid (in order).
+        """
+        keys = sorted(self.user_params.keys())
+        sessions = []
+        points = itertools.product(self.configs.items(), itertools.product(*[self.user_params[k] for k in keys]), range(self.repetitions))
+        for index, ((name, path), values, run) in enumerate(points):
+            journal = None
+            if self.journal is not None:
+                journal = os.path.join(self.journal, "{0}-{1:06d}{2}".format(self.experiment, index, JOURNAL_FORMATS[self.journal_format]))
+            sessions.append(Session(self.experiment, index, run, self.seed + index, name, path, self.agents, self.user, dict(zip(keys, values)), self.backend, journal))
+        return sessions
+
+    def __len__(self):
+        return len(self.configs) * len(list(itertools.product(*self.user_params.values()))) * self.repetitions
+
+def run_session(session, quiet=True):
+    """ Run a single session (in the current process).
+
+    Args:
+        session (Session): the session to run.
+        quiet (bool, optional): suppress console output from agents. Defaults to True.
+
+    Returns:
+        dict: result record, session parameters and Evaluator scores.
+    """
+    from .environment import ICUEnvironment # import here, workers only need the environment when a session runs
+
+    factories = [AGENTS[a] for a in session.agents]
+    if session.user is not None:
+        user, params = AGENTS[session.user], session.user_params
+        factories.append(lambda *args: user(*args, **params))
+    factories.append(AGENTS['Evaluator'])
+
+    kwargs = dict(seed=session.seed, journal=session.journal)
+    if session.journal is not None:
+        os.makedirs(os.path.dirname(session.journal), exist_ok=True)
+    if session.backend == 'simulator':
+        from .simulator import ICUSimulator
+        kwargs['process'] = ICUSimulator(session.config, seed=session.seed)
+    elif session.config is not None:
+        kwargs['config'] = session.config
+
+    with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.suppress():
+        env = ICUEnvironment(*factories, **kwargs)
+        env.simulate()
+
+    evaluator = [a for a in env.ambient.agents.values() if hasattr(a.mind, "result")][-1].mind
+    return dict(experiment=session.experiment, index=session.index, config=session.config_name, run=session.run, seed=session.seed,
+                **session.user_params, **evaluator.final_scores.columns(), result=evaluator.result)
+
+def workers(grid, processes=None):
+    """ The number of worker processes used to run a grid, sessions with the ICU backend each open an ICU GUI and are
+        run one at a time unless more processes are asked for.
+
+    Args:
+        grid (Grid): the experiment.
+        processes (int, optional): number of worker processes asked for. Defaults to None (the number of CPUs, 1 for the ICU backend).
+
+    Returns:
+        int: number of worker processes.
+    """
+    if processes is None:
+        processes = 1 if grid.backend == 'icu' else os.cpu_count()
+    return max(1, min(processes, len(grid)))
+
+def run(grid, processes=None, callback=None, quiet=True):
+    """ Run all sessions in a grid in parallel.
+
+    Args:
+        grid (Grid): the experiment.
+        processes (int, optional): number of worker processes. Defaults to None (see workers).
+        callback (callable, optional): called with each result record as soon as its session finishes. Defaults to None.
+        quiet (bool, optional): suppress console output from agents. Defaults to True.
+
+    Returns:
+        list(dict): result records of all sessions (in session order).
+    """
+    sessions = grid.sessions()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers(grid, processes)) as executor:
+        futures = [executor.submit(run_session, session, quiet=quiet) for session in sessions]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if callback is not None:
+                callback(result)
+    return sorted(results, key=lambda r: r['index'])
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 20-10-2026 10:12:47
+
+    Shared deadline scheduler. Minds register the time at which something they are waiting for happens (e.g. a grace
+    period expires and a component may be highlighted), the scheduler keeps all deadlines in a single heap and calls
+    back the minds once their deadline is reached. The environment sleeps until the earliest deadline
+    (see ICUEnvironment.next_deadline) instead of asking every mind, and minds do not need to poll their timers.
+
+    The environment shares one scheduler between its agents, in the same way as the clock (see icua.clock).
+
+    Example:
+        scheduler = Scheduler()
+        scheduler.schedule(mind, t, mind.wake) # mind.wake() is called in the first run at or after t
+        scheduler.next() # t
+        scheduler.run(t + 1) # 1
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from contextlib import contextmanager
+from threading import Lock
+import heapq
+import itertools
+
+class Scheduler:
+
+    def __init__(self):
+        self.heap = [] # [deadline, sequence, key, callback], entries that are replaced or cancelled have callback None
+        self.entries = {} # key -> entry
+        self.sequence = itertools.count() # orders entries with the same deadline (and avoids comparing keys)
+        self.lock = Lock() # agents may cycle concurrently (see icua.async_environment)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def schedule(self, key, t, callback):
+        """ Schedule a callback, replaces the deadline already scheduled for the key (if any).
+
+        Args:
+            key (object): owner of the deadline (e.g. a mind), each key has at most one deadline.
+            t (float): deadline (seconds since epoch), None only cancels the current deadline of the key.
+            callback (callable): called (without arguments) in the first run at or after t.
+        """
+        with self.lock:
+            self._cancel(key)
+            if t is not None:
+                entry = [t, next(self.sequence), key, callback]
+                self.entries[key] = entry
+                heapq.heappush(self.heap, entry)
+
+    def cancel(self, key):
+        """ Cancel the deadline of a key (if any).
+
+        Args:
+            key (object): owner of the deadline.
+        """
+        with self.lock:
+            self._cancel(key)
+
+    def _cancel(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            entry[-1] = None # removed from the heap lazily
+
+    def _prune(self):
+        while len(self.heap) > 0 and self.heap[0][-1] is None:
+            heapq.heappop(self.heap)
+
+    def next(self):
+        """
+        Returns:
+            float: the earliest deadline, None if nothing is scheduled.
+        """
+        with self.lock:
+            self._prune()
+            if len(self.heap) > 0:
+                return self.heap[0][0]
+
+    def run(self, t):
+        """ Call back (and remove) every deadline that has been reached (deadline <= t).
+
+        Args:
+            t (float): current time.
+
+        Returns:
+            int: number of callbacks.
+        """
+        callbacks = []
+        with self.lock:
+            self._prune()
+            while len(self.heap) > 0 and self.heap[0][0] <= t:
+                _, _, key, callback = heapq.heappop(self.heap)
+                if callback is not None:
+                    del self.entries[key]
+                    callbacks.append(callback)
+                self._prune()
+        for callback in callbacks: # outside the lock, callbacks may schedule again
+            callback()
+        return len(callbacks)
+
+_scheduler = None
+
+def get_scheduler():
+    """
+    Returns:
+        Scheduler: the current default scheduler, or a new scheduler if there is no default (e.g. a mind created outside an environment).
+    """
+    return Scheduler() if _scheduler is None else _scheduler
+
+def set_scheduler(scheduler):
+    """ Set the default scheduler.
+
+    Args:
+        scheduler (Scheduler): the new default scheduler, None resets (each mind has its own scheduler).
+    """
+    global _scheduler
+    _scheduler = scheduler
+
+@contextmanager
+def scheduling(scheduler):
+    """ Temporarily set the default scheduler, used by the environment when creating agents.
+
+    Args:
+        scheduler (Scheduler): the scheduler to use.
+    """
+    previous = _scheduler
+    set_scheduler(scheduler)
+    try:
+        yield scheduler
+    finally:
+        set_scheduler(previous)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 18-10-2026 13:41:07
+
+    A pure python simulation of the ICU tasks (system monitoring, tracking and fuel management) that runs in the ICUA process.
+    It is configured with the same JSON config files as ICU and applies agent actions (clicks, key presses, highlights),
+    so batch experiments can run without starting the ICU GUI. Events mirror those emitted by ICU (0.0.1), components
+    send their events to GLOBAL, with the following differences:
+        - components also emit a change event with their new state (value) when it changes (pumps, warning lights,
+          scales, tanks), ICUA agents and the world state (see icua.world) are built on these events.
+        - fuel burn and pump transfer happen at a single rate (the fastest pump event rate, at least 10 per second).
+    As in ICU, tanks E and F never run out of fuel and a warning light only fails if the user has not fixed it within the
+    last grace seconds (the grace option of the light).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from types import SimpleNamespace
+import itertools
+import random
+import re
+
+from .headless import HeadlessProcess, WINDOW_PROPERTIES
+
+PUMP_STATES = SimpleNamespace(on=0, off=1, fail=2)
+
+KEY_DIRECTIONS = {"Up":(0,-1), "Down":(0,1), "Left":(-1,0), "Right":(1,0)}
+
+TARGET_PROPORTION = 1/6 # size of the target relative to the tracking widget (fixed in ICU)
+
+GLOBAL = 'Global' # destination of the events that ICU components emit for external systems (e.g. ICUA)
+
+INFINITE_TANKS = ('FuelTank:E', 'FuelTank:F') # fixed in ICU, their fuel never changes
+
+_SCHEDULE_PATTERN = re.compile(r"^\s*(\w+)\s*\(\s*([^,]+?)\s*,\s*([^,]+?)\s*\)\s*$")
+
+class Schedule:
+    """ An ICU event schedule, e.g. [["uniform(1000,20000)", 5000]]. Each inner list is a sequence of waiting times (milliseconds) that
+        repeats forever, an event is produced after each wait. Waiting times may be numbers or uniform(a,b)/normal(mu,sigma).
+    """
+
+    def __init__(self, schedule, random):
+        self.random = random
+        self.sequences = [[self._parse(w) for w in sequence] for sequence in schedule]
+
+    def _parse(self, wait):
+        if isinstance(wait, (int, float)):
+            return lambda: wait
+        match = _SCHEDULE_PATTERN.match(wait)
+        if match is None:
+            wait = float(wait)
+            return lambda: wait
+        dist, a, b = match.group(1), float(match.group(2)), float(match.group(3))
+        if dist == 'uniform':
+            return lambda: self.random.uniform(a, b)
+        elif dist == 'normal':
+            return lambda: max(self.random.gauss(a, b), 0)
+        raise ValueError("Unknown schedule distribution: {0}".format(wait))
+
+    def start(self, process, t, callback):
+        """ Start all sequences at time t, callback(t, i) is called after each wait where i is the position of the wait in its sequence.
+
+        Args:
+            process (HeadlessProcess): process to schedule timers with.
+            t (float): start time (seconds).
+            callback (callable): callback(t, i).
+        """
+        for sequence in self.sequences:
+            if len(sequence) > 0:
+                self._next(process, t, itertools.cycle(enumerate(sequence)), callback)
+
+    def _next(self, process, t, sequence, callback):
+        i, wait = next(sequence)
+        def _callback(t):
+            callback(t, i)
+            self._next(process, t, sequence, callback)
+        process.timer(t + wait() / 1000, _callback)
+
+class ICUSimulator(HeadlessProcess):
+    """
+        Simulated ICU. Reproduces warning light and scale failures, target drift, pump failures and fuel flow between tanks
+        according to the component schedules in the ICU config, and responds to clicks, key presses and highlights sent by agents.
+    """
+
+    def __init__(self, config=None, clock=None, seed=None, window_properties=WINDOW_PROPERTIES):
+        """
+        Args:
+            config (str, dict, optional): ICU config or path to an ICU config file. Defaults to None (the default config).
+            clock (Clock, optional): clock that drives the simulation. Defaults to a new VirtualClock.
+            seed (int, optional): seed for all random behaviour (schedules, failures). Defaults to None.
+            window_properties (dict, optional): widget positions reported to agents. Defaults to WINDOW_PROPERTIES.
+        """
+        super(ICUSimulator, self).__init__(config=config, clock=clock, window_properties=window_properties)
+        self.seed = seed
+        self.random = random.Random(seed)
+        config = self.config
+        task = config.get('task', {})
+        t = self.start_time
+
+        components = lambda group: sorted(k for k in config.keys() if k.startswith(group + ':'))
+
+        self.warning_lights = {}
+        self.warning_light_fixed = {} # when each light was last fixed by the user, it does not fail again within its grace period
+        self.scales = {}
+        if task.get('system', True):
+            for light in components('WarningLight'):
+                self.warning_lights[light] = int(config[light]['state'])
+                self.warning_light_fixed[light] = float('-inf')
+                Schedule(config[light].get('schedule', []), self.random).start(self, t, self._callback(self.switch_warning_light, light))
+            for scale in components('Scale'):
+                self.scales[scale] = SimpleNamespace(position=config[scale]['position'], size=config[scale]['size'])
+                Schedule(config[scale].get('schedule', []), self.random).start(self, t, self._callback(self.slide_scale, scale))
+
+        self.targets = {}
+        if task.get('track', True):
+            w, h = window_properties['track']['size']
+            self.track_bounds = (w * (1 - TARGET_PROPORTION) / 2, h * (1 - TARGET_PROPORTION) / 2)
+            for target in components('Target'):
+                self.targets[target] = SimpleNamespace(x=0, y=0, step=config[target]['step'], invert=config[target]['invert'])
+                Schedule(config[target].get('schedule', []), self.random).start(self, t, self._callback(self.drift_target, target))
+
+        self.highlights = {} # highlight -> is it on?
+
+        self.tanks = {}
+        self.pumps = {}
+        if task.get('fuel', True):
+            for tank in components('FuelTank'):
+                c = config[tank]
+                # acceptable is unknown until the first update, which reports it (as ICU does)
+                self.tanks[tank] = SimpleNamespace(fuel=c['fuel'], capacity=c['capacity'], burn_rate=c.get('burn_rate', 0),
+                                                   accept=c.get('accept_position', None), proportion=c.get('accept_proportion', None), acceptable=None,
+                                                   infinite=tank in INFINITE_TANKS)
+            for pump in components('Pump'):
+                c = config[pump]
+                src, dst = ('FuelTank:' + k for k in pump.split(':')[1])
+                self.pumps[pump] = SimpleNamespace(state=c['state'], flow_rate=c['flow_rate'], src=src, dst=dst)
+                Schedule(config[pump].get('schedule', []), self.random).start(self, t, self._callback(self.fail_pump, pump))
+            if len(self.tanks) > 0:
+                self.fuel_rate = max([config[pump]['event_rate'] for pump in self.pumps] + [10])
+                self.timer(t + 1 / self.fuel_rate, self.update_fuel)
+
+    def _callback(self, callback, component):
+        return lambda t, i: callback(t, component, i)
+
+    # ==== EVENT GENERATION ==== #
+
+    def switch_warning_light(self, t, light, i=0):
+        self.emit(t, 'WarningLightEventGenerator', light, label='switch')
+        if t - self.config[light]['grace'] > self.warning_light_fixed[light]: # the light always switches to its failed state
+            self.set_warning_light(t, light, 1 - self.warning_light_preferred(light))
+
+    def warning_light_preferred(self, light):
+        return 1 - int(light.split(":")[1]) # WarningLight:0 should be on, WarningLight:1 off
+
+    def set_warning_light(self, t, light, state):
+        if self.warning_lights[light] != state:
+            self.warning_lights[light] = state
+            self.emit(t, light, GLOBAL, label='change', value=state)
+
+    def slide_scale(self, t, scale, i=0):
+        self.emit(t, 'ScaleEventGenerator', scale, label='slide')
+        state = self.scales[scale]
+        self.set_scale(t, scale, min(max(state.position + self.random.choice((-1, 1)), 0), state.size - 1))
+
+    def set_scale(self, t, scale, position):
+        if self.scales[scale].position != position:
+            self.scales[scale].position = position
+            self.emit(t, scale, GLOBAL, label='change', value=position)
+
+    def drift_target(self, t, target, i=0):
+        step = self.targets[target].step
+        dx, dy = self.random.choice((-step, step)), self.random.choice((-step, step))
+        self.emit(t, 'TargetEventGenerator', target, label='move', dx=dx, dy=dy)
+        self.move_target(t, target, dx, dy)
+
+    def move_target(self, t, target, dx, dy):
+        state = self.targets[target]
+        bx, by = self.track_bounds
+        state.x = min(max(state.x + dx, -bx), bx)
+        state.y = min(max(state.y + dy, -by), by)
+        self.emit(t, target, GLOBAL, label='move', dx=dx, dy=dy, x=state.x, y=state.y)
+
+    def fail_pump(self, t, pump, i=0):
+        label = ('fail', 'repair')[i % 2]
+        self.emit(t, 'PumpEventGenerator', pump, label=label)
+        if label == 'fail':
+            self.set_pump(t, pump, PUMP_STATES.fail)
+        elif self.pumps[pump].state == PUMP_STATES.fail:
+            self.set_pump(t, pump, PUMP_STATES.off)
+
+    def set_pump(self, t, pump, state):
+        if self.pumps[pump].state != state:
+            self.pumps[pump].state = state
+            self.emit(t, pump, GLOBAL, label='change', value=state)
+
+    def tank_acceptable(self, tank):
+        state = self.tanks[tank]
+        if state.accept is None:
+            return True
+        return abs(state.fuel - state.accept * state.capacity) < state.proportion * state.capacity / 2 # strictly within the limits
+
+    def update_fuel(self, t):
+        dt = 1 / self.fuel_rate
+        changed = set()
+        for pump, state in self.pumps.items():
+            if state.state == PUMP_STATES.on:
+                src, dst = self.tanks[state.src], self.tanks[state.dst]
+                flow = min(state.flow_rate * dt, src.fuel, dst.capacity - dst.fuel)
+                if flow > 0:
+                    for tank, dfuel in ((state.src, -flow), (state.dst, flow)):
+                        if not self.tanks[tank].infinite:
+                            self.tanks[tank].fuel += dfuel
+                            changed.add(tank)
+                    self.emit(t, pump, GLOBAL, label='transfer', value=flow)
+        for tank, state in self.tanks.items():
+            burn = min(state.burn_rate * dt, state.fuel)
+            if burn > 0:
+                state.fuel -= burn
+                changed.add(tank)
+                self.emit(t, tank, GLOBAL, label='burn', value=-burn) # the change in fuel
+        for tank in sorted(changed):
+            state = self.tanks[tank]
+            self.emit(t, tank, GLOBAL, label='change', value=state.fuel)
+            acceptable = self.tank_acceptable(tank)
+            if state.accept is not None and acceptable != state.acceptable:
+                state.acceptable = acceptable
+                self.emit(t, tank, GLOBAL, label='fuel', acceptable=acceptable)
+        self.timer(t + dt, self.update_fuel)
+
+    # ==== AGENT ACTIONS ==== #
+
+    def on_action(self, t, agent, destination, data):
+        label = data.get('label', None)
+        group = destination.split(":")[0]
+        if label == 'highlight':
+            value = bool(data['value']) if 'value' in data else not self.highlights.get(destination, False) # no value flips the highlight
+            self.highlights[destination] = value
+            self.emit(t, destination, GLOBAL, label='highlight', value=value)
+        elif label == 'click':
+            if group == 'WarningLight' and destination in self.warning_lights:
+                preferred = self.warning_light_preferred(destination)
+                if self.warning_lights[destination] != preferred: # back to the good state
+                    self.warning_light_fixed[destination] = t
+                    self.set_warning_light(t, destination, preferred)
+            elif group == 'Scale' and destination in self.scales:
+                self.set_scale(t, destination, self.scales[destination].size // 2) # back to the center
+            elif group == 'Pump' and destination in self.pumps:
+                state = self.pumps[destination].state
+                if state != PUMP_STATES.fail:
+                    self.set_pump(t, destination, PUMP_STATES.off if state == PUMP_STATES.on else PUMP_STATES.on)
+        elif label == 'key' and destination in self.targets and data.get('action', 'press') == 'press':
+            state = self.targets[destination]
+            dx, dy = KEY_DIRECTIONS.get(data.get('key', None), (0,0))
+            sign = -1 if state.invert else 1
+            self.move_target(t, destination, sign * dx * state.step, sign * dy * state.step)
+        # overlay events (gaze, arrow) have no effect on the simulation
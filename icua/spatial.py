@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 20-10-2026 13:31:05
+
+    Spatial index of the ICU window, answers which tasks and widgets are at a (gaze) position. All regions from
+    window_properties (tasks, panels and the widgets in each task) are placed in a uniform grid, a query looks at the
+    regions of one cell, so the cost does not grow with the number of widgets. Recorded gaze can be tested in batch
+    (NumPy) against every region at once.
+
+    Agents of an environment are given the same window_properties and share one index (see spatial_index).
+
+    Example:
+        index = spatial_index(window_properties)
+        index.query(x, y) # ('Pump:CA', 'fuel', 'FuelMonitor', 'window')
+        index.contains('system', x, y) # False
+        index.batch(xs, ys) # bool array, hits[i, j] is True if gaze sample i is in region index.names[j]
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+import math
+
+import numpy as np
+
+CELL_SIZE = 25 # pixels, width and height of each grid cell
+
+ALIASES = {'Target:0':'track'} # regions that are not in window_properties (the target moves within the tracking task)
+
+class SpatialIndex:
+
+    def __init__(self, window_properties, cell_size=CELL_SIZE):
+        """
+        Args:
+            window_properties (dict): ICU window properties (positions and sizes of tasks and their widgets).
+            cell_size (float, optional): width and height of each grid cell (pixels). Defaults to CELL_SIZE.
+        """
+        self.boxes = regions(window_properties) # name -> (x1, y1, x2, y2)
+        self.names = sorted(self.boxes.keys())
+        self.cell_size = cell_size
+
+        bounds = np.array([self.boxes[name] for name in self.names], dtype=np.float64).reshape(-1, 4)
+        self.bounds = bounds
+        self.origin = (float(bounds[:,0].min()), float(bounds[:,1].min())) if len(bounds) > 0 else (0., 0.)
+        self.grid = {} # (i, j) -> names of the regions that overlap the cell
+        for name in self.names:
+            x1, y1, x2, y2 = self.boxes[name]
+            (i1, j1), (i2, j2) = self._cell(x1, y1), self._cell(x2, y2)
+            for i in range(i1, i2 + 1):
+                for j in range(j1, j2 + 1):
+                    self.grid.setdefault((i, j), []).append(name)
+        self.grid = {k:tuple(v) for k,v in self.grid.items()}
+
+    def _cell(self, x, y):
+        return (math.floor((x - self.origin[0]) / self.cell_size), math.floor((y - self.origin[1]) / self.cell_size))
+
+    def query(self, x, y):
+        """ The regions that contain a position (edges included).
+
+        Args:
+            x (float): x position (window coordinates).
+            y (float): y position (window coordinates).
+
+        Returns:
+            tuple(str): names of the regions.
+        """
+        boxes = self.boxes
+        return tuple(name for name in self.grid.get(self._cell(x, y), ()) if _inside(boxes[name], x, y))
+
+    def contains(self, name, x, y):
+        """ Does a region contain a position (edges included)?
+
+        Args:
+            name (str): name of the region (e.g. 'fuel', 'Pump:CA').
+            x (float): x position (window coordinates).
+            y (float): y position (window coordinates).
+
+        Returns:
+            bool: True if the position is inside the region.
+        """
+        return _inside(self.boxes[name], x, y)
+
+    def center(self, name):
+        """
+        Args:
+            name (str): name of the region.
+
+        Returns:
+            tuple: (x, y) center of the region.
+        """
+        x1, y1, x2, y2 = self.boxes[name]
+        return ((x1 + x2) / 2, (y1 + y2) / 2)
+
+    def batch(self, x, y, names=None):
+        """ Test many positions against many regions at once.
+
+        Args:
+            x (numpy.ndarray): x positions.
+            y (numpy.ndarray): y positions.
+            names (list(str), optional): regions to test. Defaults to None (all regions, in the order of self.names).
+
+        Returns:
+            numpy.ndarray: bool array of shape (len(x), len(names)), True where a position is inside a region.
+        """
+        bounds = self.bounds if names is None else np.array([self.boxes[name] for name in names], dtype=np.float64).reshape(-1, 4)
+        x = np.asarray(x, dtype=np.float64)[:, np.newaxis]
+        y = np.asarray(y, dtype=np.float64)[:, np.newaxis]
+        return (x >= bounds[:,0]) & (x <= bounds[:,2]) & (y >= bounds[:,1]) & (y <= bounds[:,3])
+
+def _inside(box, x, y):
+    x1, y1, x2, y2 = box
+    return not (x < x1 or y < y1 or x > x2 or y > y2)
+
+def regions(window_properties):
+    """ The bounding box of every region in window_properties, tasks (e.g. 'fuel'), panels (e.g. 'FuelMonitor') and widgets
+        (e.g. 'Pump:CA'), and the ALIASES.
+
+    Args:
+        window_properties (dict): ICU window properties.
+
+    Returns:
+        dict: name -> (x1, y1, x2, y2).
+    """
+    box = lambda v: (v['position'][0], v['position'][1], v['position'][0] + v['size'][0], v['position'][1] + v['size'][1])
+    boxes = {}
+    for k, v in window_properties.items():
+        if isinstance(v, dict) and 'position' in v and 'size' in v:
+            boxes[k] = box(v)
+            boxes.update({_k:box(_v) for _k,_v in v.items() if isinstance(_v, dict) and 'position' in _v and 'size' in _v})
+    boxes.update({k:boxes[v] for k,v in ALIASES.items() if v in boxes})
+    return boxes
+
+_index = (None, None) # (window_properties, SpatialIndex) of the latest environment
+
+def spatial_index(window_properties):
+    """ The spatial index of window_properties, shared by everything that is given the same window_properties (e.g. the agents of an environment).
+
+    Args:
+        window_properties (dict): ICU window properties.
+
+    Returns:
+        SpatialIndex: index.
+    """
+    global _index
+    properties, index = _index
+    if properties is not window_properties:
+        index = SpatialIndex(window_properties)
+        _index = (window_properties, index)
+    return index
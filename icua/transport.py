@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 21-10-2026 15:26:40
+
+    Shared memory transport of ICU events. A RingQueue is a drop-in replacement for the multiprocessing queues that ICU
+    uses for its external sinks and sources (see ICUProcess ring_size). Events are written as compact binary records
+    to a single producer, single consumer ring buffer (see icua.ringbuffer) instead of being pickled and piped through
+    a feeder thread, and the consumer polls rather than waiting on a lock.
+
+    Record encoding (little endian):
+        timestamp (f8), number of data fields (u1), name, src, dst, then a (key, value) pair for each data field
+    where each name, src, dst, key and value is a tagged value:
+        N (None), T (True), F (False), i (i8), d (f8), r (u2, string id), s (u2 length + utf-8, new string),
+        u (u2 length + utf-8, string that is not given an id), p (u4 length + pickle, anything else)
+    Strings (component ids, labels, keys) are sent once, then by id. Each end of a ring keeps its own string table and
+    records are read in the order they were written, so the tables agree.
+
+    Example:
+        queue = RingQueue(RingBuffer(1 << 22), Event)
+        queue.put(event) # producer (e.g. the ICU process)
+        queue.get(timeout=0.1) # consumer (another process)
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from types import SimpleNamespace
+import os
+import pickle
+import queue
+import struct
+import threading
+import time
+
+RECORD = struct.Struct('<dB') # timestamp, number of data fields
+
+MAX_STRINGS = 0xFFFF # size of the string table, later strings are sent in full every time
+MAX_STRING = 0xFF # characters, longer strings are not given an id
+SPIN = 200 if (os.cpu_count() or 1) > 1 else 0 # polls of an empty ring before a consumer starts to sleep (spinning on a single core only delays the producer)
+MIN_SLEEP = 0.00005 # seconds, first sleep of a waiting consumer (doubles up to MAX_SLEEP)
+MAX_SLEEP = 0.001
+PUT_TIMEOUT = 1 # seconds, time a producer waits for space before an event is dropped
+
+_F8 = struct.Struct('<d')
+_I8 = struct.Struct('<q')
+_U2 = struct.Struct('<H')
+_U4 = struct.Struct('<I')
+
+class Encoder:
+    """ Encodes events as records (producer side). """
+
+    def __init__(self):
+        self.strings = {} # str -> encoded reference
+        self.added = [] # strings given an id by the last record
+
+    def encode(self, timestamp, name, src, dst, data):
+        """
+        Args:
+            timestamp (float): time of the event.
+            name (str): unique name of the event.
+            src (str): source of the event.
+            dst (str, list): destination(s) of the event.
+            data (dict): event data.
+
+        Returns:
+            bytes: record.
+        """
+        self.added.clear()
+        value = self.value
+        parts = [RECORD.pack(timestamp, len(data)), self.unique(name), value(src), value(dst)]
+        for k, v in data.items():
+            parts.append(value(k))
+            parts.append(value(v))
+        return b''.join(parts)
+
+    def unique(self, v):
+        if type(v) is str:
+            data = v.encode('utf-8')
+            if len(data) <= 0xFFFF:
+                return b'u' + _U2.pack(len(data)) + data
+        return self.value(v)
+
+    def value(self, v):
+        _type = type(v)
+        if _type is str:
+            ref = self.strings.get(v, None)
+            if ref is not None:
+                return ref
+            data = v.encode('utf-8')
+            if len(v) <= MAX_STRING and len(self.strings) < MAX_STRINGS:
+                self.strings[v] = b'r' + _U2.pack(len(self.strings))
+                self.added.append(v)
+                return b's' + _U2.pack(len(data)) + data
+            if len(data) <= 0xFFFF:
+                return b'u' + _U2.pack(len(data)) + data
+        elif _type is bool:
+            return b'T' if v else b'F'
+        elif _type is float:
+            return b'd' + _F8.pack(v)
+        elif _type is int and -(1 << 63) <= v < (1 << 63):
+            return b'i' + _I8.pack(v)
+        elif v is None:
+            return b'N'
+        data = pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL)
+        return b'p' + _U4.pack(len(data)) + data
+
+    def forget(self):
+        """ Forget the strings that were given an id by the last record, the record was not sent. """
+        for v in self.added:
+            del self.strings[v]
+        self.added.clear()
+
+class Decoder:
+    """ Decodes records (consumer side). """
+
+    def __init__(self):
+        self.strings = [] # string table, in the order the strings were sent
+
+    def decode(self, record):
+        """
+        Args:
+            record (bytes): record (see Encoder.encode).
+
+        Returns:
+            tuple: (timestamp, name, src, dst, data).
+        """
+        timestamp, n = RECORD.unpack_from(record, 0)
+        value = self.value
+        i = RECORD.size
+        name, i = value(record, i)
+        src, i = value(record, i)
+        dst, i = value(record, i)
+        data = {}
+        for _ in range(n):
+            k, i = value(record, i)
+            data[k], i = value(record, i)
+        return timestamp, name, src, dst, data
+
+    def value(self, record, i):
+        tag = record[i]
+        i += 1
+        if tag == 114: # r
+            return self.strings[_U2.unpack_from(record, i)[0]], i + 2
+        elif tag == 100: # d
+            return _F8.unpack_from(record, i)[0], i + 8
+        elif tag == 105: # i
+            return _I8.unpack_from(record, i)[0], i + 8
+        elif tag == 115 or tag == 117: # s, u
+            n = _U2.unpack_from(record, i)[0]
+            v = record[i + 2:i + 2 + n].decode('utf-8')
+            if tag == 115:
+                self.strings.append(v)
+            return v, i + 2 + n
+        elif tag == 84: # T
+            return True, i
+        elif tag == 70: # F
+            return False, i
+        elif tag == 78: # N
+            return None, i
+        elif tag == 112: # p
+            n = _U4.unpack_from(record, i)[0]
+            return pickle.loads(record[i + 4:i + 4 + n]), i + 4 + n
+        raise ValueError("Unknown tag {0} in record.".format(chr(tag)))
+
+class RingQueue:
+    """ Queue of ICU events over a ring buffer, has the parts of the multiprocessing.Queue interface that ICU and
+        ICUEventSink use. There must be a single producer process and a single consumer process (e.g. ICU and the
+        environment), threads of the producer process take turns. A producer that finds the ring full waits up to
+        PUT_TIMEOUT for space, then drops the event (see dropped) rather than blocking ICU if the consumer has stopped.
+    """
+
+    def __init__(self, ring, event_type, put_timeout=PUT_TIMEOUT):
+        """
+        Args:
+            ring (RingBuffer): ring buffer (in shared memory).
+            event_type (type): type of the events (e.g. icu.event.Event), created without calling __init__.
+            put_timeout (float, optional): time (seconds) to wait for space before an event is dropped. Defaults to PUT_TIMEOUT.
+        """
+        self.ring = ring
+        self.event_type = event_type
+        self.put_timeout = put_timeout
+        self.encoder = Encoder()
+        self.decoder = Decoder()
+        self.dropped = 0 # events dropped by this (producer) process because the ring was full
+        self.lock = threading.Lock()
+
+    def __getstate__(self): # sent to the other process (e.g. when ICU starts)
+        state = dict(self.__dict__)
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def put(self, event, block=True, timeout=None):
+        with self.lock:
+            data = self.encoder.encode(event.timestamp, event.name, event.src, event.dst, vars(event.data))
+            if self.ring.put(data):
+                return
+            timeout = self.put_timeout if timeout is None else timeout
+            end = time.perf_counter() + (timeout if block else 0)
+            while time.perf_counter() < end:
+                time.sleep(MIN_SLEEP)
+                if self.ring.put(data):
+                    return
+            self.encoder.forget()
+            self.dropped += 1
+
+    def put_nowait(self, event):
+        self.put(event, block=False)
+
+    def get(self, block=True, timeout=None):
+        ring = self.ring
+        data = ring.get()
+        if data is None:
+            if not block:
+                raise queue.Empty
+            for _ in range(SPIN): # events usually follow each other closely
+                data = ring.get()
+                if data is not None:
+                    break
+            end = None if timeout is None else time.perf_counter() + timeout
+            delay = MIN_SLEEP
+            while data is None:
+                _time = time.perf_counter()
+                if end is not None and _time >= end:
+                    raise queue.Empty
+                time.sleep(delay if end is None else min(delay, end - _time))
+                delay = min(delay * 2, MAX_SLEEP)
+                data = ring.get()
+        return self._event(*self.decoder.decode(data))
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def _event(self, timestamp, name, src, dst, data):
+        event = self.event_type.__new__(self.event_type)
+        event.timestamp, event.name, event.src, event.dst = timestamp, name, src, dst
+        event.data = SimpleNamespace(**data)
+        return event
+
+    def empty(self):
+        return self.ring.empty()
+
+    def full(self):
+        return False # the producer waits (or drops events) instead
+
+    def qsize(self):
+        raise NotImplementedError() # the number of records is not known without reading them (see ICUEventSink.backlog)
+
+    def close(self):
+        if self.ring.buffer is not None:
+            self.ring.close()
@@ -0,0 +1,324 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 21-10-2026 09:52:18
+
+    Shared world state. The state of each ICU component (scale positions, warning light states, pump states, tank levels,
+    the target position, highlights) is kept in a single array that the environment updates once per event, before
+    events are routed to agents. Agents (the user models and the task monitors) read the current state through read-only
+    views instead of each mirroring it from their own perceptions, and may watch it for changes. The task monitors only
+    keep when each component failed (to time grace periods) from their perceptions. The Evaluator integrates its scores
+    over every event (e.g. time in an unacceptable state), and so works from its perceptions alone. The environment
+    receives the events that update the world state (see WorldState.topics) whether or not an agent subscribes to them,
+    so agents only need to subscribe to the events that they react to. If no agent reads the world state (see readers)
+    the environment does not update it.
+
+    Each (component, field) has a slot in three arrays: values, timestamps (time of the last update) and versions
+    (number of changes). Fields that have not been set are nan.
+
+    A shared world state keeps its arrays in shared memory (multiprocessing.shared_memory) so that it can be read in
+    other processes without copying. An ICU process that knows the state of its components publishes it this way
+    (see HeadlessProcess.world), it is then authoritative and the environment does not update a world state of its
+    own. Agents in worker processes (see icua.remote) attach to the same block. There is one writer, a generation
+    counter (odd while the writer updates) lets readers in other processes take a consistent snapshot.
+
+    Example:
+        world = get_world() # when creating an agent, the environment's world state
+        world['Scale:0', 'position'] # 5.0
+        pumps = world.view('Pump', 'state') # {'Pump:AB':1.0, ...} (read-only, always up to date)
+        world.watch(lambda world, changed: print(changed)) # [('Scale:0', 'position'), ...] after each update
+
+        world = WorldState(config, shared=True) # writer
+        world = pickle.loads(pickle.dumps(world)) # reader (another process), attaches to the same block
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from collections.abc import Mapping
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+import os
+
+import numpy as np
+
+from .perception import ICU_COMPONENTS, Topic, perception_type
+
+# the fields of each component group
+FIELDS = {'WarningLight':('state',), 'Scale':('position',), 'Pump':('state',), 'FuelTank':('fuel', 'acceptable'),
+          'Target':('x', 'y'), 'Highlight':('value',)}
+
+# (group, label) -> ((field, event data attribute), ...), the events that update each field
+UPDATES = {('WarningLight', 'change'):(('state', 'value'),), ('Scale', 'change'):(('position', 'value'),),
+           ('Pump', 'change'):(('state', 'value'),), ('FuelTank', 'change'):(('fuel', 'value'),),
+           ('FuelTank', 'fuel'):(('acceptable', 'acceptable'),), ('Target', 'move'):(('x', 'x'), ('y', 'y')),
+           ('Highlight', 'highlight'):(('value', 'value'),)}
+
+PUMP_READY = 1 # pump state before any event (off)
+
+HEADER_SIZE = 8 # generation (uint64)
+
+class WorldState:
+
+    def __init__(self, config, shared=False, name=None):
+        """
+        Args:
+            config (dict): ICU config, gives the components and their initial state.
+            shared (bool, optional): keep the state in shared memory so that other processes can read it. Defaults to False.
+            name (str, optional): name of the shared memory block of an existing world state to attach to. Defaults to None.
+        """
+        self.config = config
+        components = [k for k in config.keys() if k.split(":")[0] in FIELDS and k.split(":")[0] != 'Highlight']
+        components += ['Highlight:{0}'.format(k) for k in components]
+        components += [k for k in ICU_COMPONENTS if k.startswith('Highlight:')]
+        self.components = sorted(set(components))
+
+        self.slots = {} # (component, field) -> index
+        for component in self.components:
+            for field in FIELDS[component.split(":")[0]]:
+                self.slots[(component, field)] = len(self.slots)
+        self.keys = sorted(self.slots.keys(), key=self.slots.get)
+
+        n = len(self.slots)
+        self.owner = None # only the creating process removes the shared memory block (also if forked)
+        self.shm = None
+        if shared or name is not None:
+            self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=HEADER_SIZE + 24 * max(n, 1)) # see RingBuffer
+            if name is None:
+                self.owner = os.getpid()
+            buffer = self.shm.buf
+        else:
+            buffer = bytearray(HEADER_SIZE + 24 * n)
+        self.generation = np.ndarray((1,), dtype=np.uint64, buffer=buffer, offset=0) # number of updates x 2, odd during an update
+        self.values = np.ndarray((n,), dtype=np.float64, buffer=buffer, offset=HEADER_SIZE)
+        self.timestamps = np.ndarray((n,), dtype=np.float64, buffer=buffer, offset=HEADER_SIZE + 8 * n)
+        self.versions = np.ndarray((n,), dtype=np.uint64, buffer=buffer, offset=HEADER_SIZE + 16 * n)
+        if name is None:
+            self.generation[0] = 0
+            self.values[:] = np.nan
+            self.timestamps[:] = 0
+            self.versions[:] = 0
+            self._initial(config)
+
+        self.updates = {} # (src, label) -> ((slot, event data attribute), ...), filled as new keys arrive
+        self.listeners = []
+        self.readers = 0 # number of agents given this world state to read (see world_state)
+
+    def _initial(self, config):
+        slots, values = self.slots, self.values
+        for (component, field), i in slots.items():
+            group = component.split(":")[0]
+            c = config.get(component, {})
+            if group == 'WarningLight':
+                values[i] = c.get('state', np.nan)
+            elif group == 'Scale':
+                values[i] = c.get('position', np.nan)
+            elif group == 'Pump':
+                values[i] = c.get('state', PUMP_READY)
+            elif group == 'FuelTank' and field == 'fuel':
+                values[i] = c.get('fuel', np.nan)
+            elif group == 'Target':
+                values[i] = 0
+            elif group == 'Highlight':
+                values[i] = 0
+
+    @property
+    def name(self):
+        return None if self.shm is None else self.shm.name
+
+    @property
+    def shared(self):
+        return self.shm is not None
+
+    def __reduce__(self): # other processes attach to the same block
+        if self.shm is None:
+            raise TypeError("Only a shared world state can be sent to another process.")
+        return (WorldState, (self.config, True, self.name))
+
+    def __getitem__(self, key):
+        return self.values[self.slots[key]]
+
+    def get(self, component, field, default=None):
+        """
+        Args:
+            component (str): ICU component id (e.g. Scale:0).
+            field (str): field (see FIELDS).
+            default (object, optional): value if the component/field is not in the world state. Defaults to None.
+
+        Returns:
+            float: value.
+        """
+        i = self.slots.get((component, field), None)
+        return default if i is None else self.values[i]
+
+    def view(self, group, field):
+        """ Read-only view of a field of every component in a group.
+
+        Args:
+            group (str): component group (e.g. Pump).
+            field (str): field (see FIELDS).
+
+        Returns:
+            WorldView: {component:value}.
+        """
+        return WorldView(self, [c for c in self.components if c.split(":")[0] == group], field)
+
+    def topics(self):
+        """ The topics of the events that update the world state, the environment receives them whether or not an agent subscribes.
+
+        Returns:
+            set(Topic): topics.
+        """
+        return {Topic(group, label=label) for group, label in UPDATES}
+
+    def watch(self, callback):
+        """ Register a callback that is called after each update that changed something, with (world, changed) where
+            changed is the list of (component, field) that changed.
+
+        Args:
+            callback (callable): callback(world, changed).
+        """
+        self.listeners.append(callback)
+
+    def _updates(self, src, label):
+        _type = perception_type(src)
+        group = _type.group if _type is not None else None
+        updates = tuple((self.slots[(src, field)], attr) for field, attr in UPDATES.get((group, label), ()) if (src, field) in self.slots)
+        self.updates[(src, label)] = updates
+        return updates
+
+    def update(self, perceptions):
+        """ Update the state from perceptions (once per event, by the environment).
+
+        Args:
+            perceptions (list(ICUPerception)): perceptions (in order).
+        """
+        self._update((percept.timestamp, percept.src, vars(percept.data)) for percept in perceptions)
+
+    def apply(self, t, src, data):
+        """ Update the state from a single event (e.g. by an ICU process that publishes its state, see icua.headless).
+
+        Args:
+            t (float): timestamp of the event.
+            src (str): source of the event (ICU component id).
+            data (dict): event data, including the label.
+        """
+        self._update(((t, src, data),))
+
+    def _update(self, events):
+        values, timestamps, versions, updates, generation = self.values, self.timestamps, self.versions, self.updates, self.generation
+        changed = []
+        generation[0] += 1 # odd, readers retry (see snapshot)
+        for t, src, data in events:
+            _updates = updates.get((src, data['label']), None)
+            if _updates is None:
+                _updates = self._updates(src, data['label'])
+            for i, attr in _updates:
+                value = data.get(attr, None)
+                if value is None:
+                    continue
+                timestamps[i] = t
+                if values[i] != value:
+                    values[i] = value
+                    versions[i] += 1
+                    changed.append(i)
+        generation[0] += 1
+        if len(changed) > 0 and len(self.listeners) > 0:
+            keys = self.keys
+            changed = [keys[i] for i in sorted(set(changed))]
+            for listener in self.listeners:
+                listener(self, changed)
+
+    def snapshot(self):
+        """ A consistent copy of the values, safe to take while the writer (e.g. in another process) is updating them.
+
+        Returns:
+            numpy.ndarray: values (see slots).
+        """
+        generation, values = self.generation, self.values
+        while True:
+            g = generation[0]
+            if g % 2 == 0:
+                snapshot = values.copy()
+                if generation[0] == g:
+                    return snapshot
+
+    def close(self):
+        """ Detach from shared memory, the block is removed once the process that created it closes it. The last state
+            remains readable (as a copy).
+        """
+        if self.shm is None:
+            return
+        self.generation, self.values, self.timestamps, self.versions = self.generation.copy(), self.snapshot(), self.timestamps.copy(), self.versions.copy()
+        self.shm.close()
+        if self.owner == os.getpid():
+            self.shm.unlink()
+        self.shm = None
+
+class WorldView(Mapping):
+    """ Read-only view of one field of some components in a world state, values are always current. """
+
+    def __init__(self, world, components, field):
+        self.world = world
+        self.field = field
+        self.index = {c:world.slots[(c, field)] for c in components}
+
+    def __getitem__(self, component):
+        return self.world.values[self.index[component]]
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+_world = None
+
+def get_world():
+    """
+    Returns:
+        WorldState: the current default world state (used by agents on creation), None if there is none.
+    """
+    return _world
+
+def set_world(world):
+    """ Set the default world state.
+
+    Args:
+        world (WorldState): the new default world state, None for none.
+    """
+    global _world
+    _world = world
+
+@contextmanager
+def sharing(world):
+    """ Temporarily set the default world state, used by the environment when creating agents.
+
+    Args:
+        world (WorldState): the world state to share.
+    """
+    previous = _world
+    set_world(world)
+    try:
+        yield world
+    finally:
+        set_world(previous)
+
+def world_state(config):
+    """ The world state for a new agent, the environment's world state if there is one, otherwise a new world state
+        that the agent must update itself (e.g. an agent that runs outside of an environment, see icua.remote).
+
+    Args:
+        config (dict): ICU config.
+
+    Returns:
+        tuple: (WorldState, bool) the world state and whether the agent must update it.
+    """
+    world = get_world()
+    if world is None:
+        return WorldState(config), True
+    world.readers += 1
+    return world, False
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 11:40:05
+
+    Task monitoring minds only decide when their beliefs change or a grace period expires (see icua.agent.agent.ICUMind).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from types import SimpleNamespace
+import itertools
+import os
+
+import numpy as np
+import pytest
+
+from icua.agent import Evaluator, SystemMonitor
+from icua.agent.system import ICUSystemMind
+from icua.agent.fuel import ICUFuelMind
+from icua.agent.track import ICUTrackMind
+from icua.clock import VirtualClock, using
+from icua.environment import ICUEnvironment
+from icua.headless import load_config
+from icua.simulator import ICUSimulator
+from icua.world import WorldState, sharing
+
+CONFIG = os.path.join(os.path.dirname(__file__), '..', 'config', 'med-config.json')
+
+names = itertools.count()
+
+def percept(t, src, group, **data):
+    return SimpleNamespace(name="{0:012d}".format(next(names)), timestamp=t, src=src, group=group, data=SimpleNamespace(**data))
+
+def gaze(t, x, y):
+    return percept(t, 'Overlay:0', 'Overlay', label='gaze', x=x, y=y)
+
+def system_mind(clock):
+    memory = ICUSimulator(CONFIG, seed=0, clock=clock).shared_memory()
+    with using(clock):
+        return ICUSystemMind(memory.config, memory.window_properties)
+
+def test_gaze():
+    clock = VirtualClock(start=0.)
+    mind = system_mind(clock)
+    on, off = mind.spatial.center('system'), mind.spatial.center('fuel')
+    mind.dirty = False
+    mind.revise(gaze(1., *off))
+    assert not mind.dirty # gaze that stays off the task changes nothing
+    mind.revise(gaze(2., *on))
+    assert mind.dirty and mind.last_viewed == 2. and mind.is_looking()
+    mind.dirty = False
+    mind.revise(gaze(3., *on))
+    assert mind.dirty and mind.last_viewed == 3. # still looking, the grace period starts again
+    mind.dirty = False
+    mind.revise(gaze(4., *off))
+    assert mind.dirty and mind.last_viewed == 3. and not mind.is_looking() # looked away
+
+def test_grace_times():
+    clock = VirtualClock(start=0.)
+    mind = system_mind(clock)
+    on, off = mind.spatial.center('system'), mind.spatial.center('fuel')
+    mind.revise(*[percept(0., k, 'Scale', label='change', value=c) for k, c in mind.scale_center.items()]) # scales in the center
+    mind.revise(gaze(1., *on), gaze(2., *off))
+    assert mind.failed_times() == [] and mind.grace_times() == [] and mind.next_deadline() is None # nothing is failing
+    mind.revise(percept(3., 'WarningLight:0', 'WarningLight', label='change', value=0))
+    assert mind.failed_times() == [3.]
+    assert mind.grace_times() == [1., 3.]
+    clock.sleep(3.5)
+    assert mind.next_deadline() == 3. + mind.grace_period # the grace period since the user last looked has expired
+    mind.revise(gaze(4., *on))
+    assert mind.grace_times() == [] # the user is looking
+
+def test_woken_at_deadline():
+    clock = VirtualClock(start=0.)
+    mind = system_mind(clock)
+    on, off = mind.spatial.center('system'), mind.spatial.center('fuel')
+    mind.revise(*[percept(0., k, 'Scale', label='change', value=c) for k, c in mind.scale_center.items()])
+    mind.revise(gaze(0., *on), gaze(0., *off), percept(1., 'WarningLight:0', 'WarningLight', label='change', value=0))
+    for start in (0., 1.): # last viewed, last failed
+        mind.cycle_time = clock.time()
+        deadline = mind.quiet_deadline()
+        assert deadline == start + mind.grace_period
+        mind.scheduler.schedule(mind, deadline, mind.wake)
+        mind.dirty = False
+        clock.sleep(deadline - clock.time())
+        assert mind.scheduler.run(clock.time()) == 1 and mind.dirty
+        mind.cycle_time = clock.time()
+        assert mind.expired(start) # the mind acts at its deadline
+    assert mind.quiet_deadline() is None
+
+@pytest.mark.parametrize('mind', [ICUSystemMind, ICUFuelMind, ICUTrackMind])
+def test_monitors_read_world(mind):
+    memory = ICUSimulator(CONFIG, seed=0).shared_memory()
+    world = WorldState(memory.config)
+    with sharing(world):
+        mind = mind(memory.config, memory.window_properties)
+    assert mind.world is world and not mind.own_world
+    world.update([percept(1., 'Scale:0', 'Scale', label='change', value=0), percept(1., 'FuelTank:A', 'FuelTank', label='fuel', acceptable=False), 
+                  percept(1., 'Target:0', 'Target', label='move', dx=0, dy=0, x=100, y=0)])
+    mind.revise(percept(1., 'Highlight:Scale:0', 'Highlight', label='highlight', value=True)) # perceptions do not change a shared world state
+    assert world['Highlight:Scale:0', 'value'] == 0
+    assert len(mind.failed_times()) > 0 # the failed component of the task
+
+def test_failed_times():
+    clock = VirtualClock(start=0.)
+    mind = system_mind(clock)
+    mind.revise(*[percept(0., k, 'Scale', label='change', value=c) for k, c in mind.scale_center.items()])
+    mind.revise(*[percept(0., k, 'WarningLight', label='change', value=1 - int(k[-1])) for k in mind.warning_light_status])
+    assert mind.failed_times() == []
+    mind.revise(percept(1., 'Scale:0', 'Scale', label='change', value=0))
+    mind.revise(percept(2., 'Scale:0', 'Scale', label='change', value=1)) # still failing, since 1
+    mind.revise(percept(3., 'WarningLight:0', 'WarningLight', label='change', value=0))
+    assert sorted(mind.failed_times()) == [1., 3.]
+    mind.revise(percept(4., 'Scale:0', 'Scale', label='change', value=mind.scale_center['Scale:0']))
+    assert mind.failed_times() == [3.]
+
+class GUIProcess(ICUSimulator): # does not publish its world state (like the ICU GUI)
+
+    def shared_memory(self):
+        memory = super(GUIProcess, self).shared_memory()
+        return SimpleNamespace(config=memory.config, window_properties=memory.window_properties)
+
+@pytest.mark.parametrize('agents', [[Evaluator], [SystemMonitor, Evaluator]])
+def test_environment_world(agents):
+    config = load_config(CONFIG)
+    config['shutdown'] = 30 * 1000
+    process = GUIProcess(config, seed=0)
+    env = ICUEnvironment(*agents, process=process)
+    env.simulate()
+    assert env.own_world and env.update_world == (SystemMonitor in agents) # only updated if an agent reads it
+    if env.update_world:
+        assert np.array_equal(env.world.values, process.world.values, equal_nan=True)
+    else:
+        assert env.world.versions.sum() == 0
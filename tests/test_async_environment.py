@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 19:20:06
+
+    Agents cycle concurrently in the asyncio environment, simulated time stays consistent (see icua.async_environment).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+import os
+import time
+
+import pytest
+
+from icua.async_environment import AsyncICUEnvironment
+from icua.environment import ICUEnvironment
+from icua.headless import load_config
+from icua.simulator import ICUSimulator
+from icua.agent import SystemMonitor, FuelMonitor, TrackMonitor, Evaluator
+
+CONFIG = os.path.join(os.path.dirname(__file__), '..', 'config', 'med-config.json')
+
+def session(environment, *agents, duration=60, **kwargs):
+    config = load_config(CONFIG)
+    config['shutdown'] = duration * 1000
+    env = environment(*agents, process=ICUSimulator(config, seed=0), **kwargs)
+    env.simulate()
+    return env
+
+def scores(env):
+    return [a.mind for a in env.ambient.agents.values() if hasattr(a.mind, "final_scores")][0].final_scores.columns()
+
+def test_same_scores():
+    agents = (SystemMonitor, FuelMonitor, TrackMonitor, Evaluator)
+    env = session(AsyncICUEnvironment, *agents)
+    assert env.icuprocess.clock.time() >= env.icuprocess.start_time + 60 # ran to the end of the session in simulated time
+    assert scores(env) == pytest.approx(scores(session(ICUEnvironment, *agents)))
+    metrics = env.metrics.snapshot()
+    assert metrics['cycle.agent.ICUSystemMind']['count'] > 0 and metrics['actions']['count'] > 0
+    assert 'deadline.agent.ICUSystemMind' not in metrics
+
+def slow(factory, delay):
+    def agent(*args, **kwargs):
+        body = factory(*args, **kwargs)
+        cycle = body.cycle
+        def _cycle():
+            time.sleep(delay) # wall time, the simulated clock does not move while agents cycle
+            cycle()
+        body.cycle = _cycle
+        return body
+    return agent
+
+def test_late_agent():
+    env = session(AsyncICUEnvironment, slow(SystemMonitor, 0.02), Evaluator, duration=2, deadline=10, deadlines=dict(ICUSystemMind=0.005))
+    metrics = env.metrics.snapshot()
+    assert metrics['deadline.agent.ICUSystemMind']['count'] == metrics['cycle.agent.ICUSystemMind']['count'] # every cycle is late
+    assert 'deadline.agent.Evaluator' not in metrics
+    assert scores(env) == pytest.approx(scores(session(ICUEnvironment, SystemMonitor, Evaluator, duration=2)))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 18:05:27
+
+    Benchmarks replay a seeded stream of ICU events (see icua.benchmark).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+import json
+
+import pytest
+
+from icua.benchmark import event_stream, run, _batches
+
+def stream(**kwargs):
+    return [(e.timestamp, e.src, e.dst, e.data.__dict__) for e in event_stream(**kwargs)]
+
+def test_event_stream_deterministic():
+    assert stream(duration=10, seed=1) == stream(duration=10, seed=1)
+    assert stream(duration=10, seed=1) != stream(duration=10, seed=2)
+
+def test_event_stream_ordered():
+    events = event_stream(duration=10, start=5.)
+    times = [e.timestamp for e in events]
+    assert times == sorted(times) and 5. <= times[0] and times[-1] < 15.
+    assert len({e.name for e in events}) == len(events)
+
+def test_event_stream_rates():
+    rates = dict(Overlay=100, Scale=2)
+    events = stream(rates=rates, duration=10, seed=0)
+    overlay = [e for e in events if e[1] == 'EyeTrackerStub']
+    assert len(overlay) == pytest.approx(1000, rel=0.2)
+    assert all(e[1].startswith('Scale:') for e in events if e[1] != 'EyeTrackerStub')
+    # groups are independent, changing the rate of one group does not change the others
+    assert [e for e in stream(rates=dict(Overlay=100, Scale=50), duration=10, seed=0) if e[1] == 'EyeTrackerStub'] == overlay
+
+def test_event_stream_unknown_group():
+    with pytest.raises(ValueError):
+        event_stream(rates=dict(Unknown=1))
+
+def test_batches():
+    events = event_stream(rates=dict(Overlay=50), duration=2)
+    batches = list(_batches(events, 0.1, times=True, start=0.))
+    assert sum(len(b) for _, b in batches) == len(events)
+    assert all(end - 0.1 <= e.timestamp < end for end, batch in batches for e in batch)
+
+def test_run():
+    results = run(duration=5, environment=True)
+    json.dumps(results) # results can be written as JSON
+    assert results['parameters']['events'] == len(event_stream(duration=5))
+    results = results['results']
+    assert results['perception']['events'] == results['route']['events'] == results['environment']['events']
+    assert set(results['agents'].keys()) == {'ICUSystemMind', 'ICUFuelMind', 'ICUTrackMind', 'Evaluator'}
+    assert results['environment']['metrics']['cycle']['count'] > 0
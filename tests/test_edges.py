@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 13:48:20
+
+    Edge triggered subscriptions only forward events on transitions (see icua.edges and icua.routing.ICURouter).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from types import SimpleNamespace
+
+import pytest
+
+from icua.edges import Edge, Changes, Equals, Outside
+from icua.perception import Topic, new_perception
+from icua.routing import ICURouter
+
+class Sensor:
+
+    def __init__(self, edges, *topics):
+        self.topics = topics
+        self.edges = edges
+        self.percepts = []
+
+    def notify(self, percept):
+        self.percepts.append(percept)
+
+def route(edge, topic, events):
+    sensor = Sensor({topic:edge}, topic)
+    router = ICURouter([SimpleNamespace(sensors=dict(sensor=sensor))])
+    router.route([new_perception(float(i), str(i), src, 'Global', SimpleNamespace(**data)) for i, (src, data) in enumerate(events)])
+    return [int(p.name) for p in sensor.percepts] # indices of the forwarded events
+
+def test_edge_is_abstract():
+    with pytest.raises(TypeError):
+        Edge()
+
+def test_equality():
+    assert Changes('acceptable') == Changes('acceptable') and hash(Changes('acceptable')) == hash(Changes('acceptable'))
+    assert Changes('acceptable') != Changes('value')
+    assert Equals('value', {'Scale:0':5, 'Scale:1':5}) == Equals('value', {'Scale:1':5, 'Scale:0':5})
+    assert Outside(50) != Changes(50)
+
+def test_changes():
+    values = [True, True, False, False, False, True, True]
+    events = [('FuelTank:A', dict(label='fuel', acceptable=v)) for v in values]
+    assert route(Changes('acceptable'), Topic('FuelTank', label='fuel'), events) == [0, 2, 5]
+
+def test_changes_per_source():
+    events = [('FuelTank:A', dict(label='fuel', acceptable=True)), ('FuelTank:B', dict(label='fuel', acceptable=True)),
+              ('FuelTank:A', dict(label='fuel', acceptable=True)), ('FuelTank:B', dict(label='fuel', acceptable=False))]
+    assert route(Changes('acceptable'), Topic('FuelTank', label='fuel'), events) == [0, 1, 3] # the first event of each source is forwarded
+
+def test_equals():
+    values = [5, 4, 3, 5, 5, 6, 6, 5]
+    events = [('Scale:0', dict(label='change', value=v)) for v in values]
+    assert route(Equals('value', {'Scale:0':5}), Topic('Scale', label='change'), events) == [0, 1, 3, 5, 7] # into and out of the center only
+
+def test_outside():
+    positions = [(0, 0), (10, 10), (60, 0), (0, -70), (30, 40), (0, 50), (0, 0)]
+    events = [('Target:0', dict(label='move', x=x, y=y)) for x, y in positions]
+    assert route(Outside(50), Topic('Target', label='move'), events) == [0, 2, 4, 6] # (30,40) and (0,50) are both on the circle
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 13:10:52
+
+    Events that no agent subscribes to are dropped by the buffer of the ICU event sink, in the ICU process (see icua.environment).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from types import SimpleNamespace
+import multiprocessing
+import queue
+import os
+import time
+
+import pytest
+
+from icua.environment import ICUEnvironment, ICUEventSink, FilteredBuffer
+from icua.headless import HeadlessProcess
+from icua.clock import VirtualClock
+from icua.routing import TopicFilter
+from icua.perception import Topic
+from icua.journal import JournalProcess, load
+from icua.simulator import ICUSimulator
+
+CONFIG = os.path.join(os.path.dirname(__file__), '..', 'config', 'med-config.json')
+
+def event(src, label):
+    return SimpleNamespace(timestamp=0., name='', src=src, dst='Global', data=SimpleNamespace(label=label))
+
+def test_accept_all_until_subscribed():
+    buffer = FilteredBuffer(multiprocessing.Queue())
+    assert buffer.accept(event('Scale:0', 'change')) and buffer.accept(event('Target:0', 'move'))
+
+def test_large_filter():
+    buffer = FilteredBuffer(multiprocessing.Queue())
+    topics = [Topic('Scale', src='Scale:{0}'.format(i), label='change') for i in range(5000)] # larger than any fixed size buffer would allow
+    buffer.set_filter(TopicFilter(topics))
+    deadline = time.time() + 5
+    while buffer.filter is None and time.time() < deadline:
+        buffer.accept(event('Scale:0', 'change')) # takes the filter once it has arrived
+    assert buffer.filter_generation == 1
+    assert buffer.accept(event('Scale:0', 'change')) and not buffer.accept(event('Target:0', 'move'))
+
+def _icu(sink, ready):
+    # plays the part of ICU, puts events into the sink buffer until the filter arrives, then one event of each kind
+    buffer = sink.buffer
+    ready.wait()
+    deadline = time.time() + 5
+    while buffer.filter_generation != 1 and time.time() < deadline:
+        buffer.put(event('Scale:0', 'change'))
+        time.sleep(0.001)
+    buffer.put(event('Target:0', 'move'))
+    buffer.put(event('Scale:1', 'change'))
+    buffer.put(event('Overlay:0', 'gaze'))
+
+def test_filtered_in_icu_process():
+    sink, ready = ICUEventSink(), multiprocessing.Event()
+    process = multiprocessing.Process(target=_icu, args=(sink, ready))
+    process.start()
+    sink.subscribe(TopicFilter([Topic('Scale', label='change'), Topic('Overlay', label='gaze')]))
+    ready.set()
+    events = []
+    while len(events) == 0 or events[-1].src != 'Overlay:0':
+        assert sink.wait(timeout=5)
+        events.extend(sink.get_many())
+    process.join()
+    sink.close()
+    assert [e.src for e in events[-2:]] == ['Scale:1', 'Overlay:0'] # the move event is dropped in the other process
+    assert all(e.src != 'Target:0' for e in events)
+
+def run(process):
+    process()
+    while process.is_alive():
+        process.clock.sleep(0.05)
+        process()
+    process.join()
+
+def test_journal_complete(tmp_path):
+    topics = [Topic('Scale', label='change')]
+    for complete in (True, False):
+        path = str(tmp_path / '{0}.jsonl'.format(complete))
+        config = ICUSimulator(CONFIG).config
+        config['shutdown'] = 10000
+        process = JournalProcess(ICUSimulator(config, seed=0), path, complete=complete)
+        process.subscribe(topics)
+        run(process)
+        journal = load(path)
+        assert journal.header['complete'] == complete
+        groups = {e.src.split(':')[0] for e in journal.events}
+        if complete:
+            assert {'Scale', 'WarningLight', 'Target', 'FuelTank'} <= groups # every event is recorded
+        else:
+            assert groups == {'Scale'}
+
+def quiet_environment(max_rate=1000, idle_timeout=0.1):
+    process = HeadlessProcess(clock=VirtualClock(start=0.)) # no timers, nothing ever happens unless scheduled
+    return ICUEnvironment(process=process, max_rate=max_rate, idle_timeout=idle_timeout), process
+
+def test_wait_idle():
+    environment, process = quiet_environment()
+    environment.wait() # nothing to do, cycle anyway after the idle timeout (from the end of the minimum cycle period)
+    assert process.clock.time() == pytest.approx(environment.min_cycle_period + 0.1)
+
+def test_wait_for_events():
+    environment, process = quiet_environment()
+    process.timer(0.03, lambda t: process.emit(t, 'Scale:0', 'Global', label='change', value=1))
+    environment.wait()
+    assert process.clock.time() == 0.03
+
+def test_wait_for_deadline():
+    environment, process = quiet_environment()
+    environment.scheduler.schedule(environment, 0.05, lambda: None)
+    environment.wait()
+    assert process.clock.time() == 0.05
+    environment.cycle_start = process.clock.time()
+    environment.wait() # a deadline that is due does not wait
+    assert process.clock.time() == 0.05 + environment.min_cycle_period
+
+def test_wait_rate_cap():
+    environment, process = quiet_environment(max_rate=10)
+    process.timer(0.01, lambda t: process.emit(t, 'Scale:0', 'Global', label='change', value=1))
+    environment.wait() # events are waiting but a cycle started less than 1/max_rate ago
+    assert process.clock.time() == 0.1
+    environment.cycle_start = process.clock.time()
+    environment.wait()
+    assert process.clock.time() == 0.2
+
+def full_sink(n):
+    sink = ICUEventSink(buffer=queue.Queue()) # events are available as soon as they are put
+    for i in range(n):
+        sink.buffer.put(event('Scale:{0}'.format(i), 'change'))
+    return sink
+
+def test_get_many_budget():
+    sink = full_sink(10)
+    assert sink.wait(timeout=1) # the first event is taken while waiting
+    assert sink.backlog() == 10
+    events = sink.get_many(4)
+    assert [e.src for e in events] == ['Scale:{0}'.format(i) for i in range(4)] # oldest first, the waited event included
+    assert sink.backlog() == 6
+    assert len(sink.get_many()) == 6
+    assert sink.backlog() == 0 and sink.get_many() == []
+    assert not sink.wait(timeout=0.01)
+
+def test_get_many_time_slice():
+    sink = full_sink(100)
+    events = sink.get_many(time_slice=0) # the time slice is checked every 32 events
+    assert len(events) == 32
+    assert sink.backlog() == 68
+    assert len(sink.get_many(n=50, time_slice=10)) == 50
+    assert sink.backlog() == 18
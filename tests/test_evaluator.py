@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 10:40:12
+
+    The Evaluator keeps its scores (final and periodic snapshots) for the caller (see icua.agent.evaluator).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+import os
+
+from icua.environment import ICUEnvironment
+from icua.simulator import ICUSimulator
+from icua.headless import load_config
+from icua.agent import Evaluator
+from icua.evaluate import Score
+
+CONFIG = os.path.join(os.path.dirname(__file__), '..', 'config', 'med-config.json')
+
+def session(duration, snapshot=None):
+    config = load_config(CONFIG)
+    config['shutdown'] = duration * 1000
+    def evaluator(*args):
+        body = Evaluator(*args)
+        body.mind.snapshot_interval = snapshot
+        return body
+    env = ICUEnvironment(evaluator, process=ICUSimulator(config, seed=0))
+    env.simulate()
+    return [a.mind for a in env.ambient.agents.values()][0]
+
+def test_nothing_is_printed(capsys):
+    evaluator = session(5, snapshot=1)
+    assert capsys.readouterr().out == ''
+    assert isinstance(evaluator.final_scores, Score)
+    assert evaluator.result == str(evaluator.final_scores)
+
+def test_snapshots():
+    evaluator = session(5, snapshot=1)
+    times = [t for t, _ in evaluator.snapshots]
+    assert len(times) >= 4
+    assert all(b - a >= 1 for a, b in zip(times, times[1:]))
+    assert all(isinstance(s, Score) for _, s in evaluator.snapshots)
+
+def test_no_snapshots():
+    assert session(2).snapshots == []
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 15:31:20
+
+    Headless ICU processes run sessions in simulated time (see icua.headless and icua.clock).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+import os
+import time
+
+import pytest
+
+from icua.environment import ICUEnvironment
+from icua.simulator import ICUSimulator
+from icua.headless import HeadlessProcess, DEFAULT_CONFIG, load_config
+from icua.clock import WALL_CLOCK, VirtualClock, get_clock, using
+from icua.agent import SystemMonitor
+
+CONFIG = os.path.join(os.path.dirname(__file__), '..', 'config', 'med-config.json')
+
+def test_virtual_clock():
+    clock = VirtualClock(start=10.)
+    clock.sleep(2.)
+    clock.sleep(-1.)
+    assert clock.time() == 12.
+    clock.advance(11.) # the past
+    assert clock.time() == 12.
+    clock.advance(15.)
+    assert clock.time() == 15.
+
+def test_using():
+    clock = VirtualClock(start=0.)
+    with using(clock):
+        assert get_clock() is clock
+    assert get_clock() is WALL_CLOCK
+
+def test_load_config():
+    config = load_config(CONFIG)
+    assert set(DEFAULT_CONFIG) <= set(config)
+    assert load_config() == DEFAULT_CONFIG and load_config() is not DEFAULT_CONFIG
+
+def test_timers():
+    config = load_config()
+    config['shutdown'] = 1000
+    process = HeadlessProcess(config, clock=VirtualClock(start=0.))
+    process.timer(0.5, lambda t: process.emit(t, 'Scale:0', 'Global', label='change', value=1)) # no timers after this one
+    process.timer(0.2, lambda t: process.timer(t + 0.1, lambda t: process.emit(t, 'Scale:1', 'Global', label='change', value=1)))
+    events = []
+    while process.is_alive():
+        process.wait()
+        events.extend(process())
+    assert [e.src for e in events] == ['Scale:1', 'Scale:0']
+    assert [e.timestamp for e in events] == pytest.approx([0.3, 0.5])
+    assert process.clock.time() == 1. # shutdown
+    assert process.world['Scale:0', 'position'] == 1
+
+def test_simulated_time():
+    config = load_config(CONFIG)
+    config['shutdown'] = 600 * 1000
+    process = ICUSimulator(config, seed=0)
+    start, _time = process.clock.time(), time.time()
+    env = ICUEnvironment(SystemMonitor, process=process)
+    env.simulate()
+    assert time.time() - _time < 60 # ten minutes of simulated time
+    assert process.clock.time() - start >= 600
+    mind = [a.mind for a in env.ambient.agents.values()][0]
+    assert env.clock is process.clock and mind.clock is process.clock # agents use the environment clock
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 11:02:36
+
+    Sessions recorded in a journal (either format) are loaded as they were recorded and can be replayed (see icua.journal).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from types import SimpleNamespace
+import os
+
+import pytest
+
+from icua.journal import BinaryJournal, ReplayProcess, load
+from icua.runner import Grid, run_session
+from icua.environment import ICUEnvironment
+from icua.headless import load_config
+from icua.simulator import ICUSimulator
+from icua.agent import SystemMonitor, FuelMonitor, Evaluator
+
+CONFIG = os.path.join(os.path.dirname(__file__), '..', 'config', 'med-config.json')
+
+def event(t, src, **data):
+    return SimpleNamespace(timestamp=t, name='', src=src, dst='Global', data=SimpleNamespace(**data))
+
+def test_binary_types(tmp_path):
+    journal = BinaryJournal(str(tmp_path / 'session'), seed=3)
+    journal.events([event(1., 'WarningLight:0', label='change', value=True), event(2., 'Scale:1', label='change', value=4),
+                    event(3., 'Target:0', label='move', dx=1, dy=-1, x=10, y=2.5), event(4., 'EyeTracker:0', label='gaze', x=0.5, y=1)])
+    journal.action(5., 'agent', 'Highlight:Scale:0', dict(label='highlight', value=False))
+    journal.close(6.)
+    session = load(str(tmp_path / 'session'))
+    assert session.header['seed'] == 3 and session.end == 6.
+    data = [e.data.__dict__ for e in session.events]
+    assert data == [dict(label='change', value=True), dict(label='change', value=4), dict(label='move', dx=1, dy=-1, x=10, y=2.5), dict(label='gaze', x=0.5, y=1)]
+    assert [type(d['value']) for d in data[:2]] == [bool, int]
+    assert [type(data[2]['x']), type(data[2]['y']), type(data[3]['y'])] == [int, float, int]
+    assert session.actions[0].data == dict(label='highlight', value=False) and type(session.actions[0].data['value']) is bool
+
+def test_grid_journal_format(tmp_path):
+    assert Grid(['SystemMonitor'], journal=str(tmp_path)).sessions()[0].journal.endswith('experiment-000000.jsonl')
+    assert Grid(['SystemMonitor'], journal=str(tmp_path), journal_format='binary').sessions()[0].journal.endswith('experiment-000000')
+
+def test_formats_agree(tmp_path):
+    journals = []
+    for journal_format in ('jsonl', 'binary'):
+        grid = Grid(['SystemMonitor', 'FuelMonitor'], user='FixatedUser', user_params=dict(delay=[0.5]), configs=[CONFIG], seed=0,
+                    journal=str(tmp_path / journal_format), journal_format=journal_format)
+        session = grid.sessions()[0]
+        run_session(session)
+        journals.append(load(session.journal))
+    jsonl, binary = journals
+    assert len(jsonl.events) > 0 and len(jsonl.actions) > 0
+    events = lambda j: [(round(e.timestamp - j.header['start'], 6), e.src, e.dst, e.data.__dict__) for e in j.events] # sessions start at the wall clock time
+    actions = lambda j: [(round(a.timestamp - j.header['start'], 6), a.dst, a.data) for a in j.actions] # agent ids differ
+    assert events(jsonl) == events(binary)
+    assert actions(jsonl) == actions(binary)
+
+def evaluator(env):
+    return [a.mind for a in env.ambient.agents.values() if hasattr(a.mind, "final_scores")][0]
+
+def record(path, seed, agents=(SystemMonitor, FuelMonitor, Evaluator), duration=30):
+    config = load_config(CONFIG)
+    config['shutdown'] = duration * 1000
+    env = ICUEnvironment(*agents, process=ICUSimulator(config, seed=seed), journal=path)
+    env.simulate()
+    return load(path), evaluator(env).final_scores.columns()
+
+def relative(journal):
+    return [(round(e.timestamp - journal.header['start'], 6), e.src, e.data.__dict__) for e in journal.events]
+
+def test_seeded_sessions(tmp_path):
+    a, b, c = [record(str(tmp_path / '{0}.jsonl'.format(i)), seed)[0] for i, seed in enumerate((0, 0, 1))]
+    assert a.header['seed'] == 0 and c.header['seed'] == 1
+    assert a.end is not None # the session ended cleanly
+    assert relative(a) == relative(b) # the same seed gives the same session
+    assert relative(a) != relative(c)
+
+def replay(journal, *agents):
+    process = ReplayProcess(journal)
+    env = ICUEnvironment(*agents, process=process)
+    env.simulate()
+    return env, process
+
+def test_replay(tmp_path):
+    journal, scores = record(str(tmp_path / 'session.jsonl'), 0)
+    env, process = replay(journal, Evaluator)
+    assert process.seed == 0 and process.clock.time() == pytest.approx(journal.end)
+    assert evaluator(env).final_scores.columns() == pytest.approx(scores) # the same stimuli give the same scores
+
+def test_replay_actions(tmp_path):
+    journal, _ = record(str(tmp_path / 'session.jsonl'), 0, agents=(Evaluator,)) # no highlights were recorded
+    actions = lambda process: [(a.timestamp, a.dst, a.data) for a in process.actions] # agent ids differ
+    a, b = [actions(replay(journal, SystemMonitor)[1]) for _ in range(2)]
+    assert len(a) > 0 and a == b # actions are collected (they have no effect), a replay is deterministic
+    assert {dst for _, dst, _ in a} == {'Highlight:SystemMonitor'}
+    assert all(t >= journal.header['start'] and t <= journal.end for t, _, _ in a)
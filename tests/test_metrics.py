@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 17:40:13
+
+    Timings and counts of the environment cycle are recorded in fixed bucket histograms (see icua.metrics).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+import json
+import math
+import os
+
+import pytest
+
+from icua.metrics import Histogram, Metrics, COUNT_BUCKETS
+from icua.environment import ICUEnvironment
+from icua.headless import load_config
+from icua.simulator import ICUSimulator
+from icua.agent import SystemMonitor
+
+CONFIG = os.path.join(os.path.dirname(__file__), '..', 'config', 'med-config.json')
+
+def test_empty():
+    histogram = Histogram()
+    assert histogram.snapshot() == dict(count=0, total=0)
+    assert math.isnan(histogram.mean) and math.isnan(histogram.quantile(0.5))
+
+def test_buckets():
+    histogram = Histogram(buckets=(1, 2, 4))
+    for x in (0.5, 1, 1.5, 3, 100): # the upper bound is inclusive, the last bucket is unbounded
+        histogram.observe(x)
+    assert histogram.counts == [2, 1, 1, 1]
+    assert histogram.count == 5 and histogram.total == 106
+    assert (histogram.min, histogram.max) == (0.5, 100)
+
+def test_quantile():
+    histogram = Histogram(buckets=(1, 2, 4))
+    for x in [0.5] * 50 + [3] * 49 + [100]:
+        histogram.observe(x)
+    assert histogram.quantile(0.5) == 1 # upper bound of the bucket
+    assert histogram.quantile(0.9) == 4
+    assert histogram.quantile(1) == 100 # unbounded bucket, the observed maximum
+    snapshot = histogram.snapshot()
+    assert snapshot['mean'] == pytest.approx((25 + 147 + 100) / 100)
+    assert (snapshot['p50'], snapshot['p90'], snapshot['p99']) == (1, 4, 4)
+
+def test_quantile_clipped():
+    histogram = Histogram(buckets=(1, 2, 4))
+    for x in (1.2, 1.5):
+        histogram.observe(x)
+    assert histogram.quantile(0.5) == 1.5 # clipped to the observed range
+
+def test_metrics(tmp_path):
+    metrics = Metrics()
+    metrics.time('cycle', 0.001)
+    metrics.count('actions', 3)
+    metrics.count('actions', 0)
+    assert metrics.histogram('actions').buckets == COUNT_BUCKETS # created by count
+    assert list(metrics.snapshot().keys()) == ['actions', 'cycle']
+    path = str(tmp_path / 'metrics.json')
+    metrics.dump(path)
+    with open(path) as f:
+        assert json.load(f)['actions']['count'] == 2
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+def test_environment_metrics():
+    config = load_config(CONFIG)
+    config['shutdown'] = 10 * 1000
+    metrics = Metrics()
+    env = ICUEnvironment(SystemMonitor, process=ICUSimulator(config, seed=0), metrics=metrics)
+    env.simulate()
+    snapshot = metrics.snapshot()
+    cycles = snapshot['cycle']['count']
+    assert cycles > 0
+    for name in ('cycle.drain', 'cycle.route', 'cycle.actions', 'events.process.0', 'actions', 'backlog'):
+        assert snapshot[name]['count'] == cycles # recorded once per cycle
+    assert snapshot['events.process.0']['total'] > 0
+    assert any(name.startswith('cycle.agent.') for name in snapshot)
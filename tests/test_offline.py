@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 18:52:44
+
+    Recorded sessions are scored offline as the Evaluator scored them online (see icua.offline).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+import os
+
+import numpy as np
+import pytest
+
+from icua.offline import score_journal, score_journals, _time_in_state
+from icua.environment import ICUEnvironment
+from icua.headless import load_config
+from icua.simulator import ICUSimulator
+from icua.agent import SystemMonitor, FuelMonitor, TrackMonitor, Evaluator
+
+CONFIG = os.path.join(os.path.dirname(__file__), '..', 'config', 'med-config.json')
+
+def record(path, seed, duration=60):
+    config = load_config(CONFIG)
+    config['shutdown'] = duration * 1000
+    env = ICUEnvironment(SystemMonitor, FuelMonitor, TrackMonitor, Evaluator, process=ICUSimulator(config, seed=seed), journal=path)
+    env.simulate()
+    evaluator = [a.mind for a in env.ambient.agents.values() if hasattr(a.mind, "final_scores")][0]
+    return evaluator.final_scores.columns()
+
+def test_time_in_state():
+    t = np.array([1., 2., 3., 5., 6.])
+    assert _time_in_state(t, [True, True, False, True, False], 10.) == 3. # timing starts on the first True of a run
+    assert _time_in_state(t, [False, True, False, False, True], 10.) == 5. # still running at the end
+    assert _time_in_state(np.zeros(0), [], 10.) == 0.
+
+@pytest.mark.parametrize('name', ['session.jsonl', 'session'])
+def test_score_journal(tmp_path, name):
+    path = str(tmp_path / name)
+    online = record(path, 0)
+    assert score_journal(path).columns() == pytest.approx(online) # the same scores as the online Evaluator
+
+def test_score_journals(tmp_path):
+    paths = [str(tmp_path / '{0}.jsonl'.format(seed)) for seed in range(3)]
+    online = [record(path, seed, duration=20) for seed, path in enumerate(paths)]
+    scores = score_journals(paths, processes=2)
+    assert [s.columns() for s in scores] == [pytest.approx(s) for s in online] # in the order of the paths
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 16:30:44
+
+    Perceptions are built directly from event fields, their type is given by the group of the event (see icua.perception).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from types import SimpleNamespace
+
+import pytest
+
+from icu.event import Event
+
+from icua.perception import ICUPerception, ScalePerception, HighlightPerception, EyeTrackerPerception, PumpPerception, ICU_COMPONENTS, \
+                            new_perception, perception, perception_type, _PERCEPTION_TYPES
+
+def test_new_perception():
+    data = SimpleNamespace(label='change', value=3)
+    percept = new_perception(1., '000000000001', 'Scale:0', 'Global', data)
+    assert type(percept) is ScalePerception and percept.group == 'Scale'
+    assert (percept.timestamp, percept.name, percept.src, percept.dst, percept.data) == (1., '000000000001', 'Scale:0', 'Global', data)
+
+def test_slots():
+    percept = new_perception(1., '0', 'Scale:0', 'Global', SimpleNamespace(label='change'))
+    assert getattr(percept, '__dict__', {}) == {} # the fields are kept in slots
+    assert set(ICUPerception.__slots__) == {'timestamp', 'name', 'src', 'dst', 'data'}
+
+def test_type_of_destination():
+    assert type(new_perception(0., '0', 'ScaleEventGenerator', 'Scale:0', SimpleNamespace(label='slide'))) is ScalePerception
+    assert type(new_perception(0., '0', 'Highlight:Scale:0', 'Global', SimpleNamespace(label='highlight'))) is HighlightPerception
+
+def test_no_group():
+    with pytest.raises(ValueError):
+        new_perception(0., '0', 'KeyHandler', 'Global', SimpleNamespace(label='key'))
+
+def test_from_event():
+    event = Event('Overlay:0', 'Global', label='gaze', x=1, y=2)
+    percept = perception(event)
+    assert type(percept) is EyeTrackerPerception
+    assert (percept.timestamp, percept.name, percept.src, percept.dst, percept.data) == (event.timestamp, event.name, event.src, event.dst, event.data)
+    assert isinstance(percept, ICUPerception)
+
+def test_perception_type():
+    assert all(c in _PERCEPTION_TYPES for c in ICU_COMPONENTS) # resolved when the module is loaded
+    assert perception_type('Pump:AB') is PumpPerception
+    assert perception_type('Highlight:Pump:AB') is HighlightPerception
+    assert perception_type('PumpEventGenerator') is None
+    assert 'PumpEventGenerator' in _PERCEPTION_TYPES # cached, also when there is no group
+    assert perception_type('Scale:9') is ScalePerception and _PERCEPTION_TYPES['Scale:9'] is ScalePerception # ids that are not known in advance
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 10:21:47
+
+    Result records written to a ResultStore are loaded as columns (see icua.results).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+import numpy as np
+
+from icua.results import ResultStore, load
+
+def test_round_trip(tmp_path):
+    records = [dict(index=i, config='med', fuel=i / 10, result='report') for i in range(5)]
+    with ResultStore(str(tmp_path), batch_size=2) as store:
+        store.extend(records)
+    results = load(str(tmp_path))
+    assert sorted(results.keys()) == ['config', 'fuel', 'index'] # the report is not stored
+    assert results['index'].tolist() == [0, 1, 2, 3, 4]
+    assert results['fuel'].tolist() == [r['fuel'] for r in records]
+    assert results['config'].tolist() == ['med'] * 5
+
+def test_missing_columns(tmp_path):
+    with ResultStore(str(tmp_path), batch_size=1) as store:
+        store.extend([dict(index=0, delay=0.5), dict(index=1, fix='fuel')])
+    results = load(str(tmp_path))
+    assert np.isnan(results['delay'][1]) and results['delay'][0] == 0.5
+    assert results['fix'].tolist() == ['', 'fuel']
+
+def test_mixed_column(tmp_path):
+    with ResultStore(str(tmp_path)) as store:
+        store.extend([dict(index=0, fix='fuel'), dict(index=1, fix=2), dict(index=2, fix=None)])
+    assert load(str(tmp_path))['fix'].tolist() == ['fuel', '2', '']
+
+def test_mixed_column_across_parts(tmp_path):
+    with ResultStore(str(tmp_path), batch_size=2) as store:
+        store.extend([dict(index=0, fix=None), dict(index=1, fix=0.5), dict(index=2, fix='fuel')])
+    results = load(str(tmp_path))
+    assert results['fix'].tolist() == ['', '0.5', 'fuel']
+    assert results['index'].tolist() == [0, 1, 2]
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 16:12:09
+
+    Events are routed by topic to the sensors that subscribe to them, and filtered where they are produced (see icua.routing).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from types import SimpleNamespace
+import pickle
+
+import pytest
+
+from icua.perception import Topic, ScalePerception, new_perception
+from icua.routing import ICURouter, TopicFilter, topics
+
+TOPICS = [Topic('Scale', label='change'), Topic('WarningLight', src='WarningLight:1'), Topic('Highlight')]
+
+@pytest.mark.parametrize('src, dst, label, accept', [
+    ('Scale:0', 'Global', 'change', True),
+    ('Scale:3', 'Global', 'change', True),
+    ('Scale:0', 'Global', 'slide', False), # wrong label
+    ('WarningLight:1', 'Global', 'change', True),
+    ('WarningLight:1', 'Global', 'switch', True), # any label
+    ('WarningLight:0', 'Global', 'change', False), # wrong source
+    ('Highlight:Scale:0', 'Global', 'highlight', True),
+    ('Target:0', 'Global', 'move', False), # wrong group
+    ('ScaleEventGenerator', 'Scale:0', 'slide', False), # the group of the destination
+    ('KeyHandler', 'Global', 'key', True), # no group, rejected when converted to a perception
+])
+def test_filter(src, dst, label, accept):
+    topic_filter = TopicFilter(TOPICS)
+    assert topic_filter.accept(src, dst, label) == accept
+    assert topic_filter.accept(src, dst, label) == accept # cached
+    assert pickle.loads(pickle.dumps(topic_filter)).accept(src, dst, label) == accept # filters are sent to the ICU process
+
+def test_empty_filter():
+    assert not TopicFilter([]).accept('Scale:0', 'Global', 'change')
+
+class Sensor:
+
+    def __init__(self, *topics):
+        self.topics = topics
+        self.percepts = []
+
+    def notify(self, percept):
+        self.percepts.append(percept)
+
+def test_route():
+    scales, lights, everything = Sensor(Topic('Scale', label='change')), Sensor(Topic('WarningLight')), Sensor(Topic())
+    router = ICURouter([SimpleNamespace(sensors=dict(a=scales, b=lights)), SimpleNamespace(sensors=dict(c=everything))])
+    assert router.topics() == {Topic('Scale', label='change'), Topic('WarningLight'), Topic()}
+    events = [('Scale:0', 'change'), ('Scale:0', 'slide'), ('WarningLight:0', 'change'), ('Target:0', 'move'), ('Scale:1', 'change')]
+    percepts = [new_perception(float(i), str(i), src, 'Global', SimpleNamespace(label=label)) for i, (src, label) in enumerate(events)]
+    notified = {}
+    router.route(percepts, notified=notified)
+    assert [p.name for p in scales.percepts] == ['0', '4']
+    assert [p.name for p in lights.percepts] == ['2']
+    assert [p.name for p in everything.percepts] == ['0', '1', '2', '3', '4']
+    assert notified == {scales:2, lights:1, everything:5}
+    assert router.subscribers('Scale', 'Scale:2', 'change') == (scales, everything)
+
+def test_topics_of_sensor_without_topics():
+    sensor = SimpleNamespace(subscribe=[ScalePerception])
+    assert topics(sensor) == (Topic('Scale'),)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 09:48:05
+
+    Experiment grids run in parallel give the same results as each session run on its own (see icua.runner).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+import os
+
+from icua.runner import Grid, run, run_session, workers
+from icua.agent.evaluator import Evaluator
+
+CONFIG = os.path.join(os.path.dirname(__file__), '..', 'config', 'med-config.json')
+
+def test_sessions():
+    grid = Grid(['SystemMonitor'], user='FixatedUser', user_params=dict(delay=[0, 1.]), configs=dict(a=CONFIG, b=CONFIG), repetitions=2, seed=10)
+    sessions = grid.sessions()
+    assert len(sessions) == len(grid) == 8
+    assert [s.index for s in sessions] == list(range(8))
+    assert [s.seed for s in sessions] == list(range(10, 18))
+    assert [(s.config_name, s.user_params['delay'], s.run) for s in sessions[:4]] == [('a', 0, 0), ('a', 0, 1), ('a', 1., 0), ('a', 1., 1)]
+
+def test_workers():
+    grid = Grid(['SystemMonitor'], repetitions=4)
+    assert workers(grid) == min(os.cpu_count(), 4)
+    assert workers(grid, processes=16) == 4
+    grid = Grid(['SystemMonitor'], repetitions=4, backend='icu')
+    assert workers(grid) == 1 # one ICU GUI at a time
+    assert workers(grid, processes=2) == 2
+
+def test_run():
+    grid = Grid(['FuelMonitor', 'SystemMonitor', 'TrackMonitor'], user='FixatedUser', user_params=dict(delay=[0.5]), configs=[CONFIG], repetitions=2, seed=0)
+    results = run(grid, processes=2)
+    assert [r['index'] for r in results] == [0, 1]
+    assert results == [run_session(session) for session in grid.sessions()] # sessions are seeded, results do not depend on the worker
+
+def test_final_scores(monkeypatch):
+    minds = []
+    terminate = Evaluator.terminate
+    def _terminate(self):
+        terminate(self)
+        minds.append(self)
+        self.clock.sleep(60.) # time passes after the session has ended (e.g. with the wall clock)
+    monkeypatch.setattr(Evaluator, 'terminate', _terminate)
+    session = Grid(['SystemMonitor'], configs=[CONFIG], seed=0).sessions()[0]
+    result = run_session(session)
+    final = minds[0].final_scores.columns()
+    assert {k:result[k] for k in final} == final
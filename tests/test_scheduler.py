@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 12:05:19
+
+    Deadlines are called back once they are reached, and a mind woken at its deadline acts on it (see icua.scheduler).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from icua.scheduler import Scheduler
+
+def test_deadline_fires_at_t():
+    scheduler, called = Scheduler(), []
+    scheduler.schedule('a', 2., lambda: called.append('a'))
+    assert scheduler.next() == 2.
+    assert scheduler.run(1.999) == 0 and called == []
+    assert scheduler.run(2.) == 1 and called == ['a'] # a deadline at exactly t fires at t
+    assert scheduler.next() is None and len(scheduler) == 0
+
+def test_order():
+    scheduler, called = Scheduler(), []
+    for key, t in [('c', 3.), ('a', 1.), ('b', 2.), ('d', 1.)]:
+        scheduler.schedule(key, t, lambda key=key: called.append(key))
+    assert scheduler.run(2.) == 3
+    assert called == ['a', 'd', 'b'] # same deadline in the order scheduled
+
+def test_replace_and_cancel():
+    scheduler, called = Scheduler(), []
+    scheduler.schedule('a', 1., lambda: called.append(1))
+    scheduler.schedule('a', 3., lambda: called.append(3)) # replaces the first deadline
+    scheduler.schedule('b', 2., lambda: called.append(2))
+    scheduler.cancel('b')
+    scheduler.schedule('c', None, lambda: called.append(None)) # nothing to schedule
+    assert len(scheduler) == 1 and scheduler.next() == 3.
+    assert scheduler.run(10.) == 1 and called == [3]
+
+def test_callbacks_may_schedule():
+    scheduler, called = Scheduler(), []
+    def callback():
+        called.append(len(called))
+        scheduler.schedule('a', 2., callback)
+    scheduler.schedule('a', 1., callback)
+    assert scheduler.run(1.) == 1 and scheduler.next() == 2.
+    assert scheduler.run(2.) == 1 and called == [0, 1]
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 09:12:31
+
+    The events of the ICU simulator have the same shape as those of ICU (see icua.simulator).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+import os
+
+from icua.simulator import ICUSimulator, GLOBAL, INFINITE_TANKS, PUMP_STATES
+from icua.clock import VirtualClock
+from icua.headless import load_config
+
+CONFIG = os.path.join(os.path.dirname(__file__), '..', 'config', 'med-config.json')
+
+def run(simulator, duration, step=0.05):
+    events = simulator()
+    end = simulator.clock.time() + duration
+    while simulator.clock.time() < end:
+        simulator.clock.sleep(step)
+        events.extend(simulator())
+    return events
+
+def test_no_fuel_event_before_first_update():
+    simulator = ICUSimulator(CONFIG, seed=0, clock=VirtualClock(start=0.))
+    events = simulator()
+    assert [e for e in events if e.data.label == 'fuel'] == []
+
+def test_fuel_events():
+    simulator = ICUSimulator(CONFIG, seed=0, clock=VirtualClock(start=0.))
+    events = [e for e in run(simulator, 1.) if e.data.label == 'fuel']
+    assert sorted(e.src for e in events) == ['FuelTank:A', 'FuelTank:B'] # the state of each main tank at the first update
+    for e in events:
+        assert e.dst == GLOBAL
+        assert set(vars(e.data)) == {'label', 'acceptable'}
+
+def test_fuel_events_on_transitions():
+    simulator = ICUSimulator(CONFIG, seed=0, clock=VirtualClock(start=0.))
+    events = [e for e in run(simulator, 300.) if e.data.label == 'fuel' and e.src == 'FuelTank:A']
+    assert len(events) > 1 # the tank burns out of the acceptable region
+    states = [e.data.acceptable for e in events]
+    assert all(a != b for a, b in zip(states, states[1:]))
+
+def test_burn_is_a_change_in_fuel():
+    simulator = ICUSimulator(CONFIG, seed=0, clock=VirtualClock(start=0.))
+    events = [e for e in run(simulator, 1.) if e.data.label == 'burn']
+    assert len(events) > 0
+    assert all(e.dst == GLOBAL and e.data.value < 0 for e in events)
+
+def test_target_move():
+    simulator = ICUSimulator(CONFIG, seed=0, clock=VirtualClock(start=0.))
+    events = [e for e in run(simulator, 10.) if e.data.label == 'move' and e.src == 'Target:0']
+    assert len(events) > 0
+    for e in events:
+        assert e.dst == GLOBAL
+        assert set(vars(e.data)) == {'label', 'dx', 'dy', 'x', 'y'}
+
+def test_highlight():
+    simulator = ICUSimulator(CONFIG, seed=0, clock=VirtualClock(start=0.))
+    simulator()
+    simulator.sink('agent', 'Highlight:Scale:0', dict(label='highlight', value=1))
+    simulator.sink('agent', 'Highlight:Scale:0', dict(label='highlight')) # flips
+    events = [e for e in simulator() if e.data.label == 'highlight']
+    assert [(e.src, e.dst, e.data.value) for e in events] == [('Highlight:Scale:0', GLOBAL, True), ('Highlight:Scale:0', GLOBAL, False)]
+
+def test_infinite_tanks():
+    config = load_config(CONFIG)
+    for pump in ('Pump:EA', 'Pump:EC', 'Pump:FB', 'Pump:FD'):
+        config[pump].update(state=PUMP_STATES.on, schedule=[]) # on and never fail
+    simulator = ICUSimulator(config, seed=0, clock=VirtualClock(start=0.))
+    events = run(simulator, 60.)
+    assert not any(e.src in INFINITE_TANKS and e.data.label == 'change' for e in events)
+    assert all(simulator.tanks[tank].fuel == config[tank]['fuel'] for tank in INFINITE_TANKS)
+    transfers = [e.data.value for e in events if e.src in ('Pump:EA', 'Pump:EC') and e.data.label == 'transfer']
+    assert sum(transfers) > config['FuelTank:E']['fuel'] # E never runs dry
+
+def test_warning_light_switches_to_failed():
+    simulator = ICUSimulator(CONFIG, seed=0, clock=VirtualClock(start=0.))
+    simulator()
+    for light in ('WarningLight:0', 'WarningLight:1'):
+        for _ in range(2):
+            simulator.switch_warning_light(10., light)
+            assert simulator.warning_lights[light] == int(light.endswith('1')) # 0 should be on, 1 should be off
+
+def test_warning_light_grace():
+    simulator = ICUSimulator(CONFIG, seed=0, clock=VirtualClock(start=0.))
+    simulator()
+    grace = simulator.config['WarningLight:0']['grace']
+    simulator.switch_warning_light(10., 'WarningLight:0')
+    simulator.on_action(11., 'agent', 'WarningLight:0', dict(label='click'))
+    assert simulator.warning_lights['WarningLight:0'] == 1
+    simulator.switch_warning_light(11. + grace / 2, 'WarningLight:0') # the user has just fixed it
+    assert simulator.warning_lights['WarningLight:0'] == 1
+    simulator.switch_warning_light(11.01 + grace, 'WarningLight:0')
+    assert simulator.warning_lights['WarningLight:0'] == 0
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 12:31:44
+
+    The spatial index agrees with the bounding boxes of the tasks and widgets in window_properties (see icua.spatial).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+import numpy as np
+
+from icua.spatial import SpatialIndex, spatial_index
+from icua.headless import WINDOW_PROPERTIES
+
+def test_task_boxes():
+    index = SpatialIndex(WINDOW_PROPERTIES)
+    for task in ('fuel', 'system', 'track'):
+        (x, y), (w, h) = WINDOW_PROPERTIES[task]['position'], WINDOW_PROPERTIES[task]['size']
+        assert index.boxes[task] == (x, y, x + w, y + h)
+        assert index.contains(task, x, y) and index.contains(task, x + w, y + h) # edges included
+        assert not index.contains(task, x - 1, y) and not index.contains(task, x, y + h + 1)
+        assert task in index.query(*index.center(task))
+
+def test_query_matches_batch():
+    index = SpatialIndex(WINDOW_PROPERTIES)
+    rng = np.random.default_rng(0)
+    x1, y1, x2, y2 = index.boxes['window']
+    xs, ys = rng.uniform(x1 - 50, x2 + 50, 500), rng.uniform(y1 - 50, y2 + 50, 500)
+    hits = index.batch(xs, ys)
+    for i, (x, y) in enumerate(zip(xs, ys)):
+        assert sorted(index.query(x, y)) == [name for name, hit in zip(index.names, hits[i]) if hit]
+        assert all(index.contains(name, x, y) == hit for name, hit in zip(index.names, hits[i]))
+
+def test_shared():
+    assert spatial_index(WINDOW_PROPERTIES) is spatial_index(WINDOW_PROPERTIES)
+    assert spatial_index(dict(WINDOW_PROPERTIES)) is not spatial_index(WINDOW_PROPERTIES)
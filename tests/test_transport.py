@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 15:02:44
+
+    Events sent through a RingQueue by another process arrive in order and unchanged (see icua.transport).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from types import SimpleNamespace
+import multiprocessing
+import queue
+
+import pytest
+
+from icua.ringbuffer import RingBuffer
+from icua.transport import RingQueue
+
+class Event: # the fields of an ICU event
+
+    def __init__(self, timestamp, name, src, dst, **data):
+        self.timestamp, self.name, self.src, self.dst, self.data = timestamp, name, src, dst, SimpleNamespace(**data)
+
+def event(i):
+    return Event(float(i), "{0:012d}".format(i), 'Scale:{0}'.format(i % 4), 'Global', label='change', value=i, 
+                 ok=i % 2 == 0, note=None if i % 3 else 'x' * (i % 300), extra=[i, i])
+
+def fields(e):
+    return (e.timestamp, e.name, e.src, e.dst, vars(e.data))
+
+def produce(ring_queue, n, dropped):
+    for i in range(n):
+        ring_queue.put(event(i))
+    dropped.value = ring_queue.dropped
+
+def start(ring_queue, n):
+    dropped = multiprocessing.Value('L', 0)
+    producer = multiprocessing.Process(target=produce, args=(ring_queue, n, dropped), daemon=True) # a failed test does not wait for it
+    producer.start()
+    return producer, dropped
+
+def stop(producer, ring_queue):
+    producer.terminate() # has no effect if it has finished
+    producer.join()
+    ring_queue.close()
+
+def consume(ring_queue, n, timeout=5):
+    events = []
+    try:
+        while len(events) < n:
+            events.append(ring_queue.get(timeout=timeout))
+    except queue.Empty:
+        pass
+    return events
+
+def test_round_trip():
+    ring_queue = RingQueue(RingBuffer(1 << 16), Event)
+    try:
+        for i in range(50):
+            ring_queue.put(event(i))
+        assert [fields(e) for e in consume(ring_queue, 50)] == [fields(event(i)) for i in range(50)]
+        with pytest.raises(queue.Empty):
+            ring_queue.get_nowait()
+    finally:
+        ring_queue.close()
+
+def test_wraparound():
+    ring_queue = RingQueue(RingBuffer(1 << 10), Event) # much smaller than the events sent, the ring wraps around many times
+    n = 2000
+    producer, dropped = start(ring_queue, n)
+    try:
+        events = consume(ring_queue, n)
+        producer.join()
+        assert dropped.value == 0 # the consumer kept up
+        assert [fields(e) for e in events] == [fields(event(i)) for i in range(n)]
+    finally:
+        stop(producer, ring_queue)
+
+def test_full():
+    ring_queue = RingQueue(RingBuffer(1 << 10), Event, put_timeout=0.01)
+    n = 200
+    producer, dropped = start(ring_queue, n)
+    try:
+        producer.join() # nothing is consumed until it exits
+        events = consume(ring_queue, n, timeout=0.1)
+        assert dropped.value > 0 and len(events) == n - dropped.value # events are dropped rather than blocking the producer
+        assert [fields(e) for e in events] == [fields(event(i)) for i in range(len(events))] # the oldest events are kept
+    finally:
+        stop(producer, ring_queue)
+
+def test_full_then_drained():
+    ring_queue = RingQueue(RingBuffer(1 << 10), Event, put_timeout=0.)
+    try:
+        i = 0
+        while ring_queue.dropped == 0:
+            ring_queue.put(event(i))
+            i += 1
+        events = consume(ring_queue, i, timeout=0.1) # the last event was dropped (along with the strings it introduced)
+        ring_queue.put(event(i))
+        events.extend(consume(ring_queue, 1))
+        assert [fields(e) for e in events] == [fields(event(j)) for j in list(range(i - 1)) + [i]]
+    finally:
+        ring_queue.close()
+
+def test_producer_exits():
+    ring_queue = RingQueue(RingBuffer(1 << 16), Event)
+    n = 100
+    producer, _ = start(ring_queue, n)
+    try:
+        producer.join() # the ring outlives the producer
+        assert [fields(e) for e in consume(ring_queue, n)] == [fields(event(i)) for i in range(n)]
+        with pytest.raises(queue.Empty):
+            ring_queue.get(timeout=0.05)
+    finally:
+        stop(producer, ring_queue)
+
+def test_ring_buffer():
+    ring = RingBuffer(16)
+    try:
+        assert ring.get() is None
+        assert ring.put(b'abcdef') and ring.put(b'gh') and not ring.put(b'i') # 10 + 6 bytes, full
+        assert ring.free() == 0
+        assert ring.get() == b'abcdef' and ring.put(b'jklmno') # wraps around the end
+        assert [ring.get(), ring.get(), ring.get()] == [b'gh', b'jklmno', None]
+        assert ring.empty() and ring.counters.tolist() == [26, 26] # head, tail
+        with pytest.raises(ValueError):
+            ring.put(b'x' * 13)
+    finally:
+        ring.close()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 14:31:09
+
+    User models read component states from the environment's world state, or keep their own (see icua.agent.users.user_base).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from types import SimpleNamespace
+import os
+
+import pytest
+
+from icua.agent.users import User, PerfectUser, DelayedUser, FixatedUser, FixedUser
+from icua.agent.users.user_base import ICUUserSensor, ICUUserHighlightSensor
+from icua.perception import new_perception
+from icua.simulator import ICUSimulator
+from icua.world import WorldState, sharing
+
+CONFIG = os.path.join(os.path.dirname(__file__), '..', 'config', 'med-config.json')
+
+USERS = [User, PerfectUser, DelayedUser, FixatedUser, lambda *args: FixedUser(*args, fix='fuel')]
+
+def memory():
+    return ICUSimulator(CONFIG, seed=0).shared_memory()
+
+def percept(src, **data):
+    return new_perception(0., '0', src, 'Global', SimpleNamespace(**data))
+
+@pytest.mark.parametrize('user', USERS)
+def test_shared_world(user):
+    m = memory()
+    world = WorldState(m.config)
+    with sharing(world):
+        body = user(m.config, m.window_properties)
+    mind = body.mind
+    assert mind.world is world and not mind.own_world
+    assert [type(s) for s in body.sensors.values()] == [ICUUserHighlightSensor]
+    world.update([percept('Scale:0', label='change', value=2), percept('Target:0', label='move', dx=1, dy=1, x=3, y=-4)])
+    assert mind.scale_status['Scale:0'] == 2
+    assert mind.target_position.tolist() == [3, -4]
+    mind.revise(percept('Scale:0', label='change', value=7))
+    assert mind.scale_status['Scale:0'] == 2 # the environment updates a shared world state
+
+@pytest.mark.parametrize('user', USERS)
+def test_own_world(user):
+    m = memory()
+    body = user(m.config, m.window_properties)
+    mind = body.mind
+    assert mind.own_world
+    assert [type(s) for s in body.sensors.values()] == [ICUUserSensor]
+    mind.revise(percept('Scale:0', label='change', value=7), percept('Target:0', label='move', dx=1, dy=1, x=1, y=2))
+    assert mind.scale_status['Scale:0'] == 7
+    assert mind.target_position.tolist() == [1, 2]
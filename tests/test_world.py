@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Created on 22-10-2026 19:48:31
+
+    A shared world state is written by one process and read from others without copying (see icua.world).
+"""
+__author__ = "Benedict Wilkins"
+__email__ = "benrjw@gmail.com"
+__status__ = "Development"
+
+from multiprocessing import shared_memory
+import multiprocessing
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from icua.world import WorldState
+from icua.headless import load_config
+
+CONFIG = os.path.join(os.path.dirname(__file__), '..', 'config', 'med-config.json')
+
+def read(world, snapshots, updated):
+    try:
+        snapshots.put((world.snapshot(), world['Scale:0', 'position']))
+        updated.wait(10)
+        snapshots.put((world.snapshot(), dict(world.view('Pump', 'state'))))
+    finally:
+        world.close() # a reader does not remove the block
+
+def test_snapshot_in_other_process():
+    world = WorldState(load_config(CONFIG), shared=True)
+    try:
+        world.apply(1., 'Scale:0', dict(label='change', value=7))
+        context = multiprocessing.get_context('spawn') # the world state is pickled, the reader attaches to the same block
+        snapshots, updated = context.Queue(), context.Event()
+        reader = context.Process(target=read, args=(world, snapshots, updated), daemon=True)
+        reader.start()
+        snapshot, position = snapshots.get(timeout=30)
+        assert np.array_equal(snapshot, world.snapshot(), equal_nan=True) and position == 7
+
+        world.apply(2., 'Pump:AB', dict(label='change', value=0))
+        updated.set()
+        snapshot, pumps = snapshots.get(timeout=30)
+        assert np.array_equal(snapshot, world.snapshot(), equal_nan=True) # updates are seen without sending anything
+        assert pumps['Pump:AB'] == 0 and pumps == dict(world.view('Pump', 'state'))
+        reader.join(10)
+        assert reader.exitcode == 0
+        assert world['Scale:0', 'position'] == 7 # the block outlives the reader
+    finally:
+        world.close()
+
+def test_pickle_attaches():
+    world = WorldState(load_config(CONFIG), shared=True)
+    reader, name = pickle.loads(pickle.dumps(world)), world.name
+    try:
+        assert reader.name == world.name and reader.owner is None
+        world.apply(1., 'WarningLight:0', dict(label='change', value=0))
+        assert reader['WarningLight:0', 'state'] == 0
+        assert int(reader.generation[0]) == 2 # even once the update is complete
+        assert reader.versions[reader.slots[('WarningLight:0', 'state')]] == 1
+    finally:
+        reader.close()
+        world.close()
+    assert world['WarningLight:0', 'state'] == 0 # the last state is kept after closing
+    with pytest.raises(FileNotFoundError): # removed by the process that created it
+        shared_memory.SharedMemory(name=name)
+
+def test_not_shared():
+    with pytest.raises(TypeError):
+        pickle.dumps(WorldState(load_config(CONFIG)))